@@ -17,6 +17,9 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
         private static readonly Dictionary<string, Guid> _configCache = new();
         private static readonly object _cacheLock = new();
 
+        // SEQUENCE por organización ya verificadas/creadas
+        private static readonly HashSet<string> _knownSequences = new();
+
         public GlobalSaveHandler(ILogger<GlobalSaveHandler> logger)
         {
             _logger = logger;
@@ -93,28 +96,11 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
             var entityType = entity.GetType();
             var autoFields = new List<PropertyInfo>();
 
-            // Buscar MetadataType si existe
-            var metadataTypeAttribute = entityType.GetCustomAttribute<MetadataTypeAttribute>();
-            Type? metadataType = metadataTypeAttribute?.MetadataClassType;
-
             var properties = entityType.GetProperties();
             
             foreach (var property in properties)
             {
-                // Verificar atributo en la clase principal
-                var autoAttribute = property.GetCustomAttribute<AutoIncrementalAttribute>();
-                
-                // Si no está en la clase principal, verificar en MetadataType
-                if (autoAttribute == null && metadataType != null)
-                {
-                    var metadataField = metadataType.GetField(property.Name);
-                    var metadataProperty = metadataType.GetProperty(property.Name);
-                    
-                    autoAttribute = metadataField?.GetCustomAttribute<AutoIncrementalAttribute>() 
-                                  ?? metadataProperty?.GetCustomAttribute<AutoIncrementalAttribute>();
-                }
-
-                if (autoAttribute != null)
+                if (GetAutoIncrementalAttribute(entityType, property) != null)
                 {
                     autoFields.Add(property);
                 }
@@ -123,6 +109,23 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
             return autoFields.ToArray();
         }
 
+        private AutoIncrementalAttribute? GetAutoIncrementalAttribute(Type entityType, PropertyInfo property)
+        {
+            // Verificar atributo en la clase principal
+            var autoAttribute = property.GetCustomAttribute<AutoIncrementalAttribute>();
+            if (autoAttribute != null) return autoAttribute;
+
+            // Si no está en la clase principal, verificar en MetadataType
+            var metadataType = entityType.GetCustomAttribute<MetadataTypeAttribute>()?.MetadataClassType;
+            if (metadataType == null) return null;
+
+            var metadataField = metadataType.GetField(property.Name);
+            var metadataProperty = metadataType.GetProperty(property.Name);
+            
+            return metadataField?.GetCustomAttribute<AutoIncrementalAttribute>() 
+                ?? metadataProperty?.GetCustomAttribute<AutoIncrementalAttribute>();
+        }
+
         private Guid GetOrganizationId(object entity)
         {
             var orgProperty = entity.GetType().GetProperty("OrganizationId");
@@ -158,14 +161,23 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
             var suffixKey = $"{tableName}.{fieldName}.suffix";
             var numberKey = $"{tableName}.{fieldName}.number";
 
+            var autoAttribute = GetAutoIncrementalAttribute(entityGroup.First().entry.Entity.GetType(), field);
+            var useSequence = !string.IsNullOrEmpty(autoAttribute?.Sequence);
+
             // Obtener configuraciones (con cache)
-            var (suffixConfigId, numberConfigId) = await GetFieldConfiguration(context, suffixKey, numberKey);
+            var (suffixConfigId, numberConfigId) = await GetFieldConfiguration(context, suffixKey, numberKey, !useSequence);
+            if (!useSequence && numberConfigId == Guid.Empty)
+            {
+                throw new InvalidOperationException($"No se encontró configuración para campo autoincremental: {numberKey}");
+            }
 
             // Obtener prefijo si existe
             var prefix = await GetFieldPrefix(context, suffixConfigId, orgId);
 
-            // Incrementar contador atómicamente y obtener el nuevo valor
-            var startNumber = await IncrementCounter(context, numberConfigId, orgId, entityGroup.Count);
+            // Reservar el rango: SEQUENCE (sin bloquear filas) o contador de system_config_values
+            var startNumber = useSequence
+                ? await GetSequenceRange(context, autoAttribute!, orgId, entityGroup.Count)
+                : await IncrementCounter(context, numberConfigId, orgId, entityGroup.Count);
 
             // Generar códigos secuenciales
             for (int i = 0; i < entityGroup.Count; i++)
@@ -180,7 +192,7 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
             }
         }
 
-        private async Task<(Guid suffixConfigId, Guid numberConfigId)> GetFieldConfiguration(DbContext context, string suffixKey, string numberKey)
+        private async Task<(Guid suffixConfigId, Guid numberConfigId)> GetFieldConfiguration(DbContext context, string suffixKey, string numberKey, bool requireNumber = true)
         {
             Guid suffixConfigId = Guid.Empty;
             Guid numberConfigId = Guid.Empty;
@@ -191,7 +203,8 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
                 _configCache.TryGetValue(suffixKey, out suffixConfigId);
                 _configCache.TryGetValue(numberKey, out numberConfigId);
                 
-                needsDbQuery = suffixConfigId == Guid.Empty || numberConfigId == Guid.Empty;
+                // Con SEQUENCE no existe la fila .number: basta el sufijo cacheado
+                needsDbQuery = suffixConfigId == Guid.Empty || (requireNumber && numberConfigId == Guid.Empty);
             }
 
             // Si no están en cache, consultar base de datos
@@ -233,11 +246,6 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
                 }
             }
 
-            if (numberConfigId == Guid.Empty)
-            {
-                throw new InvalidOperationException($"No se encontró configuración para campo autoincremental: {numberKey}");
-            }
-
             return (suffixConfigId, numberConfigId);
         }
 
@@ -309,7 +317,74 @@ namespace Backend.Utils.EFInterceptors.Handlers.SaveHandlers
             return 1; // Primer número del rango cuando se crea por primera vez
         }
 
-        private string GenerateCode(string? prefix, int number)
+        private async Task<long> GetSequenceRange(DbContext context, AutoIncrementalAttribute autoAttribute, Guid orgId, int rangeSize)
+        {
+            var sequenceName = autoAttribute.PerOrganization
+                ? $"{autoAttribute.Sequence}_{orgId:N}"
+                : autoAttribute.Sequence!;
+
+            var connectionString = context.Database.GetConnectionString();
+            using var connection = new SqlConnection(connectionString);
+            await connection.OpenAsync();
+
+            if (autoAttribute.PerOrganization)
+            {
+                await EnsureOrganizationSequence(connection, sequenceName, autoAttribute.Cache);
+            }
+
+            // Un solo round-trip reserva todo el rango del lote
+            using var command = new SqlCommand("sys.sp_sequence_get_range", connection)
+            {
+                CommandType = CommandType.StoredProcedure
+            };
+            command.Parameters.AddWithValue("@sequence_name", sequenceName);
+            command.Parameters.AddWithValue("@range_size", (long)rangeSize);
+            var firstValue = new SqlParameter("@range_first_value", SqlDbType.Variant)
+            {
+                Direction = ParameterDirection.Output
+            };
+            command.Parameters.Add(firstValue);
+
+            await command.ExecuteNonQueryAsync();
+
+            var startNumber = Convert.ToInt64(firstValue.Value);
+            _logger.LogDebug($"[GlobalSaveHandler] Rango {startNumber}..{startNumber + rangeSize - 1} reservado en {sequenceName}");
+            return startNumber;
+        }
+
+        private async Task EnsureOrganizationSequence(SqlConnection connection, string sequenceName, int cache)
+        {
+            lock (_cacheLock)
+            {
+                if (_knownSequences.Contains(sequenceName)) return;
+            }
+
+            var cacheOption = cache > 0 ? $"CACHE {cache}" : "NO CACHE";
+            var query = $@"
+                IF NOT EXISTS (SELECT 1 FROM sys.sequences WHERE name = @name)
+                BEGIN
+                    DECLARE @sql NVARCHAR(MAX) = N'CREATE SEQUENCE ' + QUOTENAME(@name) + N' AS BIGINT START WITH 1 INCREMENT BY 1 {cacheOption}';
+                    EXEC sp_executesql @sql;
+                END";
+
+            using var command = new SqlCommand(query, connection);
+            command.Parameters.AddWithValue("@name", sequenceName);
+            try
+            {
+                await command.ExecuteNonQueryAsync();
+            }
+            catch (SqlException ex) when (ex.Number == 2714)
+            {
+                // Otra petición la creó en paralelo
+            }
+
+            lock (_cacheLock)
+            {
+                _knownSequences.Add(sequenceName);
+            }
+        }
+
+        private string GenerateCode(string? prefix, long number)
         {
             if (string.IsNullOrEmpty(prefix))
             {
@@ -17,6 +17,9 @@ namespace Backend.Utils.Services
         protected readonly ILogger<BaseQueryService<T>> _logger;
         protected readonly DbSet<T> _dbSet;
 
+        // Base de los Id secuenciales (ver NewSequentialGuid)
+        private static long _sequentialGuidCounter = DateTime.UtcNow.Ticks;
+
         public BaseQueryService(DbContext context, ILogger<BaseQueryService<T>> logger)
         {
             _context = context;
@@ -947,7 +950,13 @@ namespace Backend.Utils.Services
                 if (property == null) continue;
 
                 // Determinar el tipo de búsqueda según el tipo de propiedad
-                if (property.PropertyType == typeof(string))
+                if (property.PropertyType == typeof(string) && IsNormalizedSearchProperty(property, properties))
+                {
+                    // Columna de búsqueda normalizada (COLLATE CI_AI): prefijo sin ToLower para que
+                    // se traduzca a LIKE 'term%' y pueda buscar con seek sobre su índice
+                    conditions.Add($"({property.Name} != null && {property.Name}.StartsWith(@0))");
+                }
+                else if (property.PropertyType == typeof(string))
                 {
                     // Para strings: contains case-insensitive con null check - usando @0 parameter
                     conditions.Add($"({property.Name} != null && {property.Name}.ToLower().Contains(@0))");
@@ -970,6 +979,17 @@ namespace Backend.Utils.Services
             return conditions.Any() ? $"({string.Join(" || ", conditions)})" : string.Empty;
         }
 
+        private static bool IsNormalizedSearchProperty(PropertyInfo property, PropertyInfo[] properties)
+        {
+            // {Campo}Busqueda generada por table.py (searchable_normalized) junto a su {Campo} original
+            const string suffix = "Busqueda";
+            if (!property.Name.EndsWith(suffix) || property.Name.Length == suffix.Length)
+                return false;
+
+            var baseName = property.Name.Substring(0, property.Name.Length - suffix.Length);
+            return properties.Any(p => p.Name == baseName && p.PropertyType == typeof(string));
+        }
+
         private string[] GetDefaultSearchFields(PropertyInfo[] properties)
         {
             // Buscar campos por defecto: strings y campos que contengan "nombre", "descripcion", "codigo", etc.
@@ -1059,7 +1079,7 @@ namespace Backend.Utils.Services
 
             var entityType = typeof(T);
             
-            SetPropertyIfExists(entityType, entity, "Id", Guid.NewGuid());
+            SetPropertyIfExists(entityType, entity, "Id", NewSequentialGuid());
             SetPropertyIfExists(entityType, entity, "OrganizationId", organizationId);
             SetPropertyIfExists(entityType, entity, "CreadorId", userId);
             SetPropertyIfExists(entityType, entity, "ModificadorId", userId);
@@ -1071,6 +1091,30 @@ namespace Backend.Utils.Services
                 typeof(T).Name, userId, organizationId);
         }
 
+        /// <summary>
+        /// GUID creciente en el orden de SQL Server (como NEWSEQUENTIALID): el contador va en los
+        /// últimos 6 bytes, que SQL Server compara primero, así los INSERT caen al final del PK clustered
+        /// </summary>
+        private static Guid NewSequentialGuid()
+        {
+            var guidBytes = Guid.NewGuid().ToByteArray();
+            var counterBytes = BitConverter.GetBytes(Interlocked.Increment(ref _sequentialGuidCounter));
+            if (!BitConverter.IsLittleEndian)
+            {
+                Array.Reverse(counterBytes);
+            }
+
+            guidBytes[8] = counterBytes[1];
+            guidBytes[9] = counterBytes[0];
+            guidBytes[10] = counterBytes[7];
+            guidBytes[11] = counterBytes[6];
+            guidBytes[12] = counterBytes[5];
+            guidBytes[13] = counterBytes[4];
+            guidBytes[14] = counterBytes[3];
+            guidBytes[15] = counterBytes[2];
+            return new Guid(guidBytes);
+        }
+
         /// <summary>
         /// Inyecta automáticamente campos de modificación
         /// </summary>
@@ -0,0 +1,146 @@
+using Microsoft.AspNetCore.Mvc;
+using Microsoft.EntityFrameworkCore;
+using Backend.Utils.Data;
+using Shared.Models.Entities.SystemEntities;
+
+namespace CustomFields.API.Controllers;
+
+/// <summary>
+/// Registro en caliente de entidades (tools/forms/register_entity.py --api)
+/// Hace upsert en system_form_entities, de donde EntityRegistrationService del Frontend
+/// carga las entidades (al iniciar o con RefreshEntitiesFromDatabaseAsync) y las pasa a RegisterEntity.
+/// DisplayProperty/SearchFields se auto-detectan en el Frontend: aquí solo se guardan módulo y backend.
+/// Contrato: tools/forms/registration_client.py
+/// </summary>
+[ApiController]
+[Route("api/entity-registration")]
+public class EntityRegistrationController : ControllerBase
+{
+    private readonly AppDbContext _context;
+    private readonly IWebHostEnvironment _environment;
+    private readonly ILogger<EntityRegistrationController> _logger;
+
+    public EntityRegistrationController(AppDbContext context, IWebHostEnvironment environment, ILogger<EntityRegistrationController> logger)
+    {
+        _context = context;
+        _environment = environment;
+        _logger = logger;
+    }
+
+    /// <summary>
+    /// Registrar una entidad
+    /// </summary>
+    [HttpPost]
+    public Task<ActionResult<EntityRegistrationResponse>> Register([FromBody] EntityRegistrationPayload payload)
+    {
+        return RegisterBatch(new EntityRegistrationBatchRequest { Entities = new List<EntityRegistrationPayload> { payload } });
+    }
+
+    /// <summary>
+    /// Registrar un lote de entidades en una sola transacción
+    /// </summary>
+    [HttpPost("batch")]
+    public async Task<ActionResult<EntityRegistrationResponse>> RegisterBatch([FromBody] EntityRegistrationBatchRequest request)
+    {
+        // Herramienta de desarrollo sin autenticación: no se expone fuera de Development
+        if (!_environment.IsDevelopment())
+        {
+            return NotFound();
+        }
+
+        var response = new EntityRegistrationResponse();
+        try
+        {
+            // Entidades del sistema (OrganizationId = null), indexadas por nombre
+            var existing = await _context.SystemFormEntities
+                .Where(e => e.OrganizationId == null)
+                .ToDictionaryAsync(e => e.EntityName, StringComparer.OrdinalIgnoreCase);
+
+            var now = DateTime.UtcNow;
+            foreach (var payload in request.Entities)
+            {
+                if (string.IsNullOrWhiteSpace(payload.EntityName))
+                {
+                    response.Failed.Add(new EntityRegistrationFailure { EntityName = payload.EntityName, Error = "entityName requerido" });
+                    continue;
+                }
+
+                // La tabla sale del modelo EF: si la entidad no está en AppDbContext no se puede registrar
+                var entityType = _context.Model.GetEntityTypes()
+                    .FirstOrDefault(t => t.ClrType.Name.Equals(payload.EntityName, StringComparison.OrdinalIgnoreCase));
+                var tableName = entityType?.GetTableName();
+                if (tableName == null)
+                {
+                    response.Failed.Add(new EntityRegistrationFailure { EntityName = payload.EntityName, Error = "entidad no encontrada en AppDbContext" });
+                    continue;
+                }
+
+                if (existing.TryGetValue(payload.EntityName, out var formEntity))
+                {
+                    formEntity.Active = true;
+                    formEntity.Module = payload.ModulePath ?? formEntity.Module;
+                    formEntity.BackendApi = payload.BackendApi ?? formEntity.BackendApi;
+                    formEntity.FechaModificacion = now;
+                }
+                else
+                {
+                    formEntity = new SystemFormEntities
+                    {
+                        Id = Guid.NewGuid(),
+                        OrganizationId = null,
+                        FechaCreacion = now,
+                        FechaModificacion = now,
+                        Active = true,
+                        EntityName = entityType!.ClrType.Name,
+                        DisplayName = entityType.ClrType.Name,
+                        TableName = tableName,
+                        AllowCustomFields = true,
+                        SortOrder = 999,
+                        BackendApi = payload.BackendApi,
+                        Module = payload.ModulePath
+                    };
+                    _context.SystemFormEntities.Add(formEntity);
+                    existing[formEntity.EntityName] = formEntity;
+                }
+
+                response.Registered++;
+            }
+
+            await _context.SaveChangesAsync();
+            _logger.LogInformation("Registradas {Count} entidades ({Failed} con error)", response.Registered, response.Failed.Count);
+            return Ok(response);
+        }
+        catch (Exception ex)
+        {
+            _logger.LogError(ex, "Error registrando entidades");
+            return StatusCode(500, new { error = ex.Message });
+        }
+    }
+}
+
+public class EntityRegistrationPayload
+{
+    public string EntityName { get; set; } = "";
+    public string? ModulePath { get; set; }
+    public string? DisplayProperty { get; set; }
+    public List<string>? SearchFields { get; set; }
+    public string? BackendApi { get; set; }
+    public List<string>? FullTextFields { get; set; }
+}
+
+public class EntityRegistrationBatchRequest
+{
+    public List<EntityRegistrationPayload> Entities { get; set; } = new();
+}
+
+public class EntityRegistrationResponse
+{
+    public int Registered { get; set; }
+    public List<EntityRegistrationFailure> Failed { get; set; } = new();
+}
+
+public class EntityRegistrationFailure
+{
+    public string? EntityName { get; set; }
+    public string Error { get; set; } = "";
+}
\ No newline at end of file
@@ -8,7 +8,7 @@ namespace Frontend.Services;
 /// Servicio para registro dinámico de entidades disponibles para campos de referencia
 /// Se integra con tools/forms para detectar automáticamente nuevas entidades
 /// </summary>
-public class EntityRegistrationService
+public partial class EntityRegistrationService
 {
     private static readonly ConcurrentDictionary<string, EntityConfiguration> _registeredEntities = new();
     private readonly IServiceProvider _serviceProvider;
@@ -39,6 +39,10 @@ public class EntityRegistrationService
         public string DisplayProperty { get; set; } = "Name";
         public string ValueProperty { get; set; } = "Id";
         public string[]? SearchFields { get; set; }
+        /// <summary>
+        /// Campos con índice full-text en la tabla: se pueden buscar con CONTAINS en lugar de LIKE
+        /// </summary>
+        public string[]? FullTextFields { get; set; }
         public bool EnableCache { get; set; } = true;
     }
 
@@ -50,9 +54,8 @@ public class EntityRegistrationService
         try
         {
             // ===== ENTIDADES DE DOMINIO =====
-            // Aquí se registran automáticamente las entidades de dominio creadas con entity-generator.py
-
-
+            // Generadas en RegisteredEntities.g.cs desde registered-entities.json (tools/forms/register_entity.py)
+            RegisterGeneratedEntities();
 
             // ===== ENTIDADES DEL SISTEMA =====
 
@@ -92,6 +95,11 @@ public class EntityRegistrationService
         }
     }
 
+    /// <summary>
+    /// Implementado en RegisteredEntities.g.cs
+    /// </summary>
+    partial void RegisterGeneratedEntities();
+
     /// <summary>
     /// Registrar una nueva entidad manualmente
     /// </summary>
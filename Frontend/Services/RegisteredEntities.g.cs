@@ -0,0 +1,16 @@
+// <auto-generated>
+// Generado por tools/forms/register_entity.py desde registered-entities.json. No editar a mano.
+// </auto-generated>
+
+namespace Frontend.Services;
+
+public partial class EntityRegistrationService
+{
+    /// <summary>
+    /// Entidades de dominio registradas con tools/forms/register_entity.py
+    /// </summary>
+    partial void RegisterGeneratedEntities()
+    {
+        // Sin entidades registradas
+    }
+}
@@ -6,5 +6,21 @@ namespace Shared.Models.Attributes
     public class AutoIncrementalAttribute : Attribute
     {
         public AutoIncrementalAttribute() { }
+
+        /// <summary>
+        /// SEQUENCE que entrega la numeración (table.py --autoincremental sequence).
+        /// Sin valor se usa el contador de system_config_values.
+        /// </summary>
+        public string? Sequence { get; set; }
+
+        /// <summary>
+        /// Una SEQUENCE por organización: {Sequence}_{OrganizationId:N}
+        /// </summary>
+        public bool PerOrganization { get; set; }
+
+        /// <summary>
+        /// CACHE de las SEQUENCE por organización creadas en el primer uso
+        /// </summary>
+        public int Cache { get; set; } = 50;
     }
-}
\ No newline at end of file
+}
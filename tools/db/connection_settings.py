@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔌 Connection Settings
+Resolución única de la conexión SQL del proyecto para todas las herramientas
+
+Lee Backend/Properties/launchSettings.json una sola vez por proceso (se vuelve
+a leer solo si el archivo cambia) y expone la misma conexión en los formatos
+que usan las herramientas:
+    - EF Core (scaffold de dbsync)      -> settings.ef()
+    - ODBC (pyodbc)                      -> settings.odbc()
+    - sqlcmd (subprocess)                -> settings.sqlcmd_args()
+
+No hay credenciales por defecto: si launchSettings.json no define la variable
+SQL en ningún profile, la conexión no se resuelve y cada herramienta lo informa.
+
+Usage:
+    sys.path.append(str(tools_path / "db"))
+    from connection_settings import load_connection_settings
+
+    settings = load_connection_settings("Backend")
+    if settings:
+        subprocess.run(['sqlcmd', *settings.sqlcmd_args(), '-Q', query])
+"""
+
+import json
+from pathlib import Path
+
+ODBC_DRIVER = "ODBC Driver 17 for SQL Server"
+
+# (ruta resuelta, mtime_ns) -> ConnectionSettings | None
+_cache = {}
+
+# Sinónimos aceptados por SqlClient para cada componente
+_KEY_ALIASES = {
+    'server': ('server', 'data source', 'address', 'addr', 'network address'),
+    'database': ('database', 'initial catalog'),
+    'user_id': ('user id', 'uid', 'user'),
+    'password': ('password', 'pwd'),
+}
+
+_TRUE_VALUES = ('true', 'yes', 'sspi')
+
+
+def parse_connection_string(connection_string):
+    """Separar 'Clave=Valor;...' en un dict con claves en minúsculas"""
+    parts = {}
+    for part in connection_string.split(';'):
+        if '=' in part and part.strip():
+            key, value = part.split('=', 1)
+            parts[key.strip().lower()] = value.strip()
+    return parts
+
+
+class ConnectionSettings:
+    """Conexión SQL resuelta desde launchSettings.json"""
+
+    def __init__(self, connection_string, profile=None, source=None):
+        self.connection_string = connection_string
+        self.profile = profile
+        self.source = source
+        self.parts = parse_connection_string(connection_string)
+
+    def _get(self, component):
+        for key in _KEY_ALIASES[component]:
+            if self.parts.get(key):
+                return self.parts[key]
+        return None
+
+    @property
+    def server(self):
+        return self._get('server')
+
+    @property
+    def database(self):
+        return self._get('database')
+
+    @property
+    def user_id(self):
+        return self._get('user_id')
+
+    @property
+    def password(self):
+        return self._get('password')
+
+    @property
+    def trusted_connection(self):
+        value = self.parts.get('trusted_connection') or self.parts.get('integrated security') or ''
+        return value.lower() in _TRUE_VALUES
+
+    @property
+    def trust_server_certificate(self):
+        return self.parts.get('trustservercertificate', 'true').lower() in _TRUE_VALUES
+
+    def ef(self):
+        """Connection string tal como la usa EF Core / SqlClient"""
+        return self.connection_string
+
+    def odbc(self, driver=ODBC_DRIVER):
+        """Connection string en formato ODBC para pyodbc"""
+        odbc_parts = [f"Driver={{{driver}}}", f"Server={self.server}"]
+        if self.database:
+            odbc_parts.append(f"Database={self.database}")
+        if self.trusted_connection or not self.user_id:
+            odbc_parts.append("Trusted_Connection=yes")
+        else:
+            odbc_parts.append(f"UID={self.user_id}")
+            odbc_parts.append(f"PWD={self.password or ''}")
+        if self.trust_server_certificate:
+            odbc_parts.append("TrustServerCertificate=yes")
+        return ';'.join(odbc_parts) + ';'
+
+    def sqlcmd_args(self, database=None):
+        """Argumentos de conexión para sqlcmd (-S/-U/-P o -E, -d, -C)"""
+        args = ['-S', self.server]
+        if self.trusted_connection or not self.user_id:
+            args.append('-E')
+        else:
+            args.extend(['-U', self.user_id, '-P', self.password or ''])
+        database = database or self.database
+        if database:
+            args.extend(['-d', database])
+        if self.trust_server_certificate:
+            args.append('-C')
+        return args
+
+    def describe(self):
+        """Resumen sin contraseña para mostrar en consola"""
+        user = 'Windows (Trusted_Connection)' if self.trusted_connection or not self.user_id else self.user_id
+        return f"{self.server} / {self.database} ({user})"
+
+
+def launch_settings_path(project_path="Backend"):
+    """Ruta de launchSettings.json para un proyecto (relativo al directorio actual)"""
+    return (Path(project_path) / "Properties" / "launchSettings.json").resolve()
+
+
+def _read_settings(settings_path):
+    """Leer launchSettings.json y devolver el primer profile con variable SQL"""
+    if not settings_path.exists():
+        print(f"❌ ERROR: No se encontró launchSettings.json en {settings_path}")
+        return None
+
+    try:
+        with open(settings_path, 'r', encoding='utf-8-sig') as f:
+            settings = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"❌ ERROR: El archivo launchSettings.json no es válido: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ ERROR leyendo launchSettings.json: {e}")
+        return None
+
+    # Buscar en los profiles la variable SQL
+    for profile_name, profile_data in settings.get("profiles", {}).items():
+        env_vars = profile_data.get("environmentVariables", {}) or {}
+        sql_connection = env_vars.get("SQL")
+        if sql_connection:
+            connection = ConnectionSettings(sql_connection, profile_name, settings_path)
+            if not connection.server:
+                print(f"❌ ERROR: La variable 'SQL' del profile '{profile_name}' no define Server")
+                return None
+            print(f"✅ Connection string encontrado en profile: {profile_name}")
+            return connection
+
+    print(f"❌ ERROR: No se encontró variable 'SQL' en environmentVariables")
+    print(f"   📄 Archivo: {settings_path}")
+    return None
+
+
+def load_connection_settings(project_path="Backend"):
+    """Conexión del proyecto (cacheada por proceso mientras launchSettings.json no cambie)"""
+    settings_path = launch_settings_path(project_path)
+    try:
+        mtime = settings_path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    key = (settings_path, mtime)
+    if key not in _cache:
+        _cache[key] = _read_settings(settings_path)
+    return _cache[key]
+
+
+def read_connection_string(project_path="Backend"):
+    """Connection string EF del proyecto, o None"""
+    settings = load_connection_settings(project_path)
+    return settings.ef() if settings else None
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Key Strategy Benchmark
+Mide la tasa de inserción de cada estrategia de clave de table.py en la BD local
+
+Para cada estrategia crea una tabla temporal bench_key_<estrategia> con el mismo
+SQL que genera table.py, inserta N filas de a una (autocommit, como el backend)
+y reporta filas/s, páginas y fragmentación del índice clustered. Las tablas se
+eliminan al terminar salvo con --keep.
+
+Sin --client-ids el Id sale del default de la tabla; BaseQueryService asigna
+GUIDs secuenciales en el mismo orden que NEWSEQUENTIALID(), así que esa corrida
+es la que representa al backend. --client-ids inserta un NEWID() explícito, como
+los servicios que asignan Guid.NewGuid() por su cuenta: así se ve cuánto del
+beneficio de 'sequential' se pierde con Ids aleatorios.
+
+Usage:
+    python tools/db/key-benchmark.py
+    python tools/db/key-benchmark.py --rows 50000 --strategies sequential newid
+    python tools/db/key-benchmark.py --client-ids --preview
+"""
+
+import sys
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from connection_settings import load_connection_settings
+from table import DatabaseTableGenerator, KEY_STRATEGIES
+
+DEFAULT_ROWS = 20000
+RESULT_MARKER = "BENCH_RESULT"
+
+
+def bench_table_name(strategy):
+    return f"bench_key_{strategy.replace('-', '_')}"
+
+
+def generate_benchmark_sql(strategy, rows, client_ids=False):
+    """SQL completo de una corrida: crear tabla, insertar filas, medir y reportar"""
+    table_name = bench_table_name(strategy)
+    generator = DatabaseTableGenerator(key_strategy=strategy)
+    fields = [generator.parse_field("nombre:string:100"), generator.parse_field("monto:decimal:18,2")]
+    create_sql = generator.generate_sql(table_name, fields)
+
+    id_column = "Id, " if client_ids else ""
+    id_value = "NEWID(), " if client_ids else ""
+
+    return f"""IF OBJECT_ID('{table_name}', 'U') IS NOT NULL DROP TABLE {table_name};
+GO
+
+{create_sql}
+
+SET NOCOUNT ON;
+DECLARE @org UNIQUEIDENTIFIER = (SELECT TOP 1 Id FROM system_organization);
+DECLARE @i INT = 0, @start DATETIME2 = SYSDATETIME();
+WHILE @i < {rows}
+BEGIN
+    INSERT INTO {table_name} ({id_column}OrganizationId, nombre, monto)
+    VALUES ({id_value}@org, CONCAT('fila ', @i), @i % 1000);
+    SET @i += 1;
+END
+DECLARE @ms INT = DATEDIFF(MILLISECOND, @start, SYSDATETIME());
+
+SELECT '{RESULT_MARKER}', @ms, ps.page_count, CAST(ps.avg_fragmentation_in_percent AS DECIMAL(5,2))
+FROM sys.dm_db_index_physical_stats(DB_ID(), OBJECT_ID('{table_name}'), NULL, NULL, 'LIMITED') ps
+JOIN sys.indexes i ON i.object_id = ps.object_id AND i.index_id = ps.index_id
+WHERE i.type = 1 AND ps.index_level = 0;
+GO
+"""
+
+
+def parse_result(output):
+    """Línea 'BENCH_RESULT,ms,páginas,fragmentación' -> (ms, páginas, fragmentación); None si no está"""
+    for line in output.splitlines():
+        parts = [part.strip() for part in line.split(',')]
+        if parts and parts[0] == RESULT_MARKER and len(parts) >= 4:
+            try:
+                return int(parts[1]), int(parts[2]), float(parts[3])
+            except ValueError:
+                return None
+    return None
+
+
+def run_sql(settings, sql):
+    """Ejecutar un script (con separadores GO) vía sqlcmd -i; retorna (ok, salida)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.sql', encoding='utf-8', delete=False) as temp_file:
+        temp_file.write(sql)
+    try:
+        result = subprocess.run(
+            ['sqlcmd', *settings.sqlcmd_args(), '-h', '-1', '-W', '-s', ',', '-b', '-i', temp_file.name],
+            capture_output=True, text=True, encoding='utf-8', errors='replace'
+        )
+    finally:
+        Path(temp_file.name).unlink(missing_ok=True)
+    return result.returncode == 0, result.stdout + result.stderr
+
+
+def run_benchmark(settings, strategies, rows, client_ids=False, keep=False):
+    """Ejecutar cada estrategia; retorna {estrategia: (ms, páginas, fragmentación) | None}"""
+    results = {}
+    for strategy in strategies:
+        print(f"⏱️ {strategy}: insertando {rows} filas...")
+        started = time.perf_counter()
+        ok, output = run_sql(settings, generate_benchmark_sql(strategy, rows, client_ids))
+        results[strategy] = parse_result(output) if ok else None
+        if results[strategy] is None:
+            print(f"   ❌ Error ejecutando la corrida:\n{output.strip()}")
+        else:
+            print(f"   ✅ {time.perf_counter() - started:.1f}s")
+
+        if not keep:
+            run_sql(settings, f"IF OBJECT_ID('{bench_table_name(strategy)}', 'U') IS NOT NULL DROP TABLE {bench_table_name(strategy)};")
+    return results
+
+
+def print_report(results, rows):
+    print()
+    print(f"{'Estrategia':<15} {'Filas/s':>10} {'ms':>8} {'Páginas':>8} {'Frag. %':>8}")
+    print("-" * 53)
+    for strategy, result in results.items():
+        if result is None:
+            print(f"{strategy:<15} {'error':>10}")
+            continue
+        ms, pages, fragmentation = result
+        rate = rows / (ms / 1000) if ms else float('inf')
+        print(f"{strategy:<15} {rate:>10.0f} {ms:>8} {pages:>8} {fragmentation:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='⏱️ Benchmark de estrategias de clave (table.py --key-strategy)')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS,
+                        help=f'Filas a insertar por estrategia (default: {DEFAULT_ROWS})')
+    parser.add_argument('--strategies', nargs='*', choices=list(KEY_STRATEGIES.keys()),
+                        default=list(KEY_STRATEGIES.keys()), help='Estrategias a medir (default: todas)')
+    parser.add_argument('--client-ids', action='store_true',
+                        help='Asignar el Id en el INSERT (NEWID()) como los servicios que usan Guid.NewGuid()')
+    parser.add_argument('--keep', action='store_true', help='No eliminar las tablas bench_key_*')
+    parser.add_argument('--preview', action='store_true', help='Solo mostrar el SQL de cada corrida')
+    parser.add_argument('--project', default='Backend',
+                        help='Ruta al proyecto Backend (default: Backend)')
+    args = parser.parse_args()
+
+    if args.preview:
+        for strategy in args.strategies:
+            print(f"-- ===== {strategy} =====")
+            print(generate_benchmark_sql(strategy, args.rows, args.client_ids))
+        sys.exit(0)
+
+    settings = load_connection_settings(args.project)
+    if not settings:
+        sys.exit(1)
+    print(f"🔗 {settings.describe()}")
+
+    try:
+        results = run_benchmark(settings, args.strategies, args.rows, args.client_ids, args.keep)
+    except FileNotFoundError:
+        print("❌ ERROR: sqlcmd no encontrado. Instala SQL Server command line tools.")
+        sys.exit(1)
+
+    print_report(results, args.rows)
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ Partition Generator
+Particiona por fecha tablas de solo inserción (system_auditoria, logs, series de tiempo)
+
+Genera dos scripts:
+    - Layout: función y esquema de partición RANGE RIGHT sobre FechaCreacion (mensual o
+      diaria) y conversión de las tablas existentes: PK clustered (FechaCreacion, Id) e
+      índices alineados en el esquema. Las FKs que apuntan a las tablas se eliminan porque
+      TRUNCATE por partición no admite tablas referenciadas.
+    - Ventana deslizante: vacía con TRUNCATE ... WITH (PARTITIONS) las particiones más
+      antiguas que la retención, une sus límites (MERGE) y crea los períodos futuros (SPLIT).
+      Todo es metadata: purgar un mes de auditoría no genera un DELETE masivo ni log por fila.
+
+La ventana es idempotente: programarla (SQL Agent / cron) al menos una vez por período
+para que el SPLIT siempre caiga sobre la partición derecha vacía.
+
+Usage:
+    python tools/db/partition.py --table system_auditoria system_auditoria_detalle --preview
+    python tools/db/partition.py --table system_auditoria system_auditoria_detalle --retention 12 --execute --autosync
+    python tools/db/partition.py --table eventos --granularity day --retention 90 --maintenance --output ventana_eventos.sql
+"""
+
+import sys
+import re
+import argparse
+import subprocess
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from connection_settings import load_connection_settings
+from table import DatabaseTableGenerator, COMPRESSION_MODES
+
+# granularidad -> (datepart de T-SQL, inicio del período actual en T-SQL, descripción)
+GRANULARITIES = {
+    'month': ('MONTH', "DATEFROMPARTS(YEAR(GETUTCDATE()), MONTH(GETUTCDATE()), 1)", 'mensual'),
+    'day': ('DAY', "CAST(CAST(GETUTCDATE() AS DATE) AS DATETIME2)", 'diaria'),
+}
+DEFAULT_GRANULARITY = 'month'
+DEFAULT_RETENTION = 12          # períodos que se conservan
+DEFAULT_FUTURE = 3              # períodos vacíos creados por delante
+DEFAULT_COLUMN = 'FechaCreacion'
+DEFAULT_FILEGROUP = 'PRIMARY'
+BOUNDARIES_PER_LINE = 4
+
+
+def validate_identifier(name):
+    """Nombres de tabla/columna/filegroup: mismo criterio que table.py (letras, números, _)"""
+    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
+        raise ValueError(f"Nombre inválido: {name}")
+    return name
+
+
+def object_names(name):
+    """Función y esquema de partición compartidos por todas las tablas del layout"""
+    return f"pf_{name}", f"ps_{name}"
+
+
+def period_start(day, granularity):
+    return date(day.year, day.month, 1) if granularity == 'month' else day
+
+
+def add_periods(day, periods, granularity):
+    if granularity == 'day':
+        return date.fromordinal(day.toordinal() + periods)
+    month = day.year * 12 + day.month - 1 + periods
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def boundaries(granularity, retention, future, today=None):
+    """Límites iniciales: desde el corte de retención hasta future períodos por delante"""
+    current = period_start(today or date.today(), granularity)
+    return [add_periods(current, offset, granularity) for offset in range(-retention, future + 1)]
+
+
+def partitioned_on(table_name, scheme=None):
+    """Condición T-SQL: el heap/índice clustered de la tabla está particionado (en scheme si se indica)"""
+    return f"""EXISTS (SELECT 1 FROM sys.indexes i JOIN sys.partition_schemes s ON s.data_space_id = i.data_space_id
+               WHERE i.object_id = OBJECT_ID('{table_name}') AND i.index_id IN (0, 1){f" AND s.name = '{scheme}'" if scheme else ''})"""
+
+
+def generate_table_conversion_sql(table_name, scheme, column=DEFAULT_COLUMN, compression=None):
+    """
+    Convertir una tabla existente al esquema en una sola transacción: FKs entrantes fuera,
+    PK clustered ({column}, Id) e índices no agrupados recreados alineados (la tabla se
+    reconstruye una vez). Índices únicos no agrupados: se omite la tabla, porque alinearlos
+    exige agregar {column} a la clave y eso cambia lo que garantizan.
+    """
+    row_compression = f" WITH (DATA_COMPRESSION = {compression.upper()})" if compression else ""
+    key_columns = """(SELECT STRING_AGG(QUOTENAME(c.name) + CASE WHEN ic.is_descending_key = 1 THEN N' DESC' ELSE N'' END, N', ')
+                    WITHIN GROUP (ORDER BY ic.key_ordinal, ic.index_column_id)
+                  FROM sys.index_columns ic JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                  WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id AND (ic.is_included_column = 0 OR i.type = 6))"""
+    include_columns = """(SELECT STRING_AGG(QUOTENAME(c.name), N', ') WITHIN GROUP (ORDER BY ic.index_column_id)
+                  FROM sys.index_columns ic JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                  WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.is_included_column = 1 AND i.type = 2)"""
+
+    return f"""
+-- 📋 {table_name} → {scheme}({column})
+IF OBJECT_ID('{table_name}', 'U') IS NULL
+    PRINT '⚠️ Tabla {table_name} no existe: se omite';
+ELSE IF {partitioned_on(table_name)}
+    PRINT '📄 {table_name} ya está particionada';
+ELSE IF NOT EXISTS (SELECT 1 FROM sys.columns WHERE object_id = OBJECT_ID('{table_name}') AND name = '{column}'
+                    AND TYPE_NAME(system_type_id) = 'datetime2' AND is_nullable = 0)
+    PRINT '❌ {table_name}.{column} debe ser DATETIME2 NOT NULL: se omite';
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_name}') AND type = 2 AND is_unique = 1 AND is_primary_key = 0)
+    PRINT '❌ {table_name} tiene índices únicos no agrupados: deben incluir {column} para alinearse, revíselos antes de particionar';
+ELSE
+BEGIN
+    DECLARE @drop NVARCHAR(MAX) = N'', @create NVARCHAR(MAX) = N'', @fks NVARCHAR(MAX);
+
+    -- FKs entrantes: TRUNCATE por partición no admite tablas referenciadas (la relación queda lógica)
+    SELECT @fks = ISNULL(@fks + N', ', N'') + OBJECT_NAME(fk.parent_object_id) + N'.' + fk.name,
+           @drop += N'ALTER TABLE ' + QUOTENAME(OBJECT_SCHEMA_NAME(fk.parent_object_id)) + N'.' + QUOTENAME(OBJECT_NAME(fk.parent_object_id))
+               + N' DROP CONSTRAINT ' + QUOTENAME(fk.name) + N';' + NCHAR(10)
+    FROM sys.foreign_keys fk
+    WHERE fk.referenced_object_id = OBJECT_ID('{table_name}') AND fk.parent_object_id <> fk.referenced_object_id;
+
+    -- Índices no agrupados (y columnstore): se recrean alineados después del clustered
+    SELECT @drop += N'DROP INDEX ' + QUOTENAME(i.name) + N' ON {table_name};' + NCHAR(10),
+           @create += N'CREATE ' + CASE WHEN i.type = 6 THEN N'NONCLUSTERED COLUMNSTORE' ELSE N'NONCLUSTERED' END
+               + N' INDEX ' + QUOTENAME(i.name) + N' ON {table_name} (' + {key_columns} + N')'
+               + ISNULL(N' INCLUDE (' + {include_columns} + N')', N'')
+               + ISNULL(N' WHERE ' + i.filter_definition, N'')
+               + CASE WHEN i.type = 2 THEN N'{row_compression}' ELSE N'' END
+               + N' ON {scheme}({column});' + NCHAR(10)
+    FROM sys.indexes i
+    WHERE i.object_id = OBJECT_ID('{table_name}') AND i.type IN (2, 6) AND i.is_primary_key = 0;
+
+    -- PK actual (nombre generado en Base.sql) e índice clustered propio (org-clustered / identity)
+    SELECT @drop += CASE WHEN i.is_primary_key = 1 OR i.is_unique_constraint = 1
+                         THEN N'ALTER TABLE {table_name} DROP CONSTRAINT ' + QUOTENAME(i.name)
+                         ELSE N'DROP INDEX ' + QUOTENAME(i.name) + N' ON {table_name}' END + N';' + NCHAR(10)
+    FROM sys.indexes i
+    WHERE i.object_id = OBJECT_ID('{table_name}') AND (i.is_primary_key = 1 OR i.type = 1);
+
+    DECLARE @sql NVARCHAR(MAX) = @drop
+        + N'ALTER TABLE {table_name} ADD CONSTRAINT PK_{table_name} PRIMARY KEY CLUSTERED ({column}, Id){row_compression} ON {scheme}({column});' + NCHAR(10)
+        + @create;
+
+    SET XACT_ABORT ON;
+    BEGIN TRANSACTION;
+    EXEC sp_executesql @sql;
+    COMMIT TRANSACTION;
+
+    IF @fks IS NOT NULL
+        PRINT '⚠️ FKs eliminadas (impiden TRUNCATE por partición): ' + @fks;
+    PRINT '✅ {table_name} particionada en {scheme}({column}), PK ({column}, Id)';
+END
+GO"""
+
+
+def generate_layout_sql(tables, name, granularity=DEFAULT_GRANULARITY, retention=DEFAULT_RETENTION, future=DEFAULT_FUTURE,
+                        column=DEFAULT_COLUMN, filegroup=DEFAULT_FILEGROUP, compression=None, today=None):
+    """Función + esquema de partición y conversión de cada tabla"""
+    function, scheme = object_names(name)
+    values = [f"'{boundary.isoformat()}'" for boundary in boundaries(granularity, retention, future, today)]
+    lines = [", ".join(values[start:start + BOUNDARIES_PER_LINE]) for start in range(0, len(values), BOUNDARIES_PER_LINE)]
+    values_sql = ",\n        ".join(lines)
+
+    sql = f"""-- ========================================
+-- 🗂️ PARTICIONAMIENTO POR FECHA: {function} / {scheme}
+-- {column}, partición {GRANULARITIES[granularity][2]}: {retention} períodos de retención + {future} por delante
+-- Tablas: {', '.join(tables)}
+-- ========================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = '{function}')
+BEGIN
+    CREATE PARTITION FUNCTION {function} (DATETIME2)
+    AS RANGE RIGHT FOR VALUES (
+        {values_sql}
+    );
+    PRINT '✅ Función de partición {function} creada ({len(values)} límites)';
+END
+ELSE
+    PRINT '📄 Función de partición {function} ya existe';
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = '{scheme}')
+BEGIN
+    CREATE PARTITION SCHEME {scheme} AS PARTITION {function} ALL TO ([{filegroup}]);
+    PRINT '✅ Esquema de partición {scheme} creado';
+END
+ELSE
+    PRINT '📄 Esquema de partición {scheme} ya existe';
+GO
+"""
+    for table_name in tables:
+        sql += generate_table_conversion_sql(table_name, scheme, column, compression) + "\n"
+    return sql
+
+
+def generate_maintenance_sql(tables, name, granularity=DEFAULT_GRANULARITY, retention=DEFAULT_RETENTION, future=DEFAULT_FUTURE,
+                             filegroup=DEFAULT_FILEGROUP):
+    """
+    Ventana deslizante (RANGE RIGHT: la partición n contiene los valores menores al límite n):
+    1. TRUNCATE de las particiones que terminan antes del corte de retención
+    2. MERGE de sus límites: ambas particiones vacías, sin mover datos; se conserva el último
+       límite vencido para que la partición 1 quede vacía como tope izquierdo
+    3. SPLIT de la partición derecha (vacía) hasta cubrir future períodos por delante
+    """
+    function, scheme = object_names(name)
+    datepart, current_sql, description = GRANULARITIES[granularity]
+    boundary_values = f"""sys.partition_range_values v
+        JOIN sys.partition_functions f ON f.function_id = v.function_id
+        WHERE f.name = '{function}'"""
+
+    truncates = []
+    for table_name in tables:
+        truncates.append(f"""
+    IF {partitioned_on(table_name, scheme)}
+    BEGIN
+        SELECT @rows = ISNULL(SUM(p.rows), 0) FROM sys.partitions p
+        WHERE p.object_id = OBJECT_ID('{table_name}') AND p.index_id IN (0, 1) AND p.partition_number <= @expired;
+        SET @sql = N'TRUNCATE TABLE {table_name} WITH (PARTITIONS (' + @range + N'))';
+        EXEC sp_executesql @sql;
+        RAISERROR('   🧹 {table_name}: %I64d filas purgadas', 0, 1, @rows) WITH NOWAIT;
+    END
+    ELSE
+        RAISERROR('   ⚠️ {table_name} no está en {scheme}: se omite', 0, 1) WITH NOWAIT;""")
+    truncates_sql = "\n".join(truncates)
+
+    return f"""-- ========================================
+-- 🔄 VENTANA DESLIZANTE: {function} ({description}, retención {retention}, {future} por delante)
+-- Idempotente: programar al menos una vez por período
+-- ========================================
+
+SET NOCOUNT ON;
+IF NOT EXISTS (SELECT 1 FROM sys.partition_functions WHERE name = '{function}')
+BEGIN
+    RAISERROR('❌ La función {function} no existe: ejecute primero el layout (tools/db/partition.py)', 16, 1);
+    RETURN;
+END
+
+DECLARE @current DATETIME2 = {current_sql};
+DECLARE @cutoff DATETIME2 = DATEADD({datepart}, -{retention}, @current);
+DECLARE @horizon DATETIME2 = DATEADD({datepart}, {future}, @current);
+DECLARE @expired INT, @rows BIGINT, @boundary DATETIME2, @range NVARCHAR(20), @sql NVARCHAR(MAX);
+
+-- 1. Particiones completamente anteriores al corte: TRUNCATE por partición (metadata)
+SELECT @expired = COUNT(*) FROM {boundary_values} AND CAST(v.value AS DATETIME2) <= @cutoff;
+IF @expired > 0
+BEGIN
+    SET @range = CASE WHEN @expired = 1 THEN N'1' ELSE N'1 TO ' + CAST(@expired AS NVARCHAR(10)) END;
+{truncates_sql}
+END
+
+-- 2. MERGE de los límites vencidos (particiones vacías a ambos lados)
+WHILE (SELECT COUNT(*) FROM {boundary_values} AND CAST(v.value AS DATETIME2) <= @cutoff) > 1
+BEGIN
+    SELECT TOP 1 @boundary = CAST(v.value AS DATETIME2) FROM {boundary_values}
+    ORDER BY v.boundary_id;
+    ALTER PARTITION FUNCTION {function}() MERGE RANGE (@boundary);
+END
+
+-- 3. SPLIT de la partición derecha vacía hasta el horizonte
+WHILE (SELECT MAX(CAST(v.value AS DATETIME2)) FROM {boundary_values}) < @horizon
+BEGIN
+    SELECT @boundary = DATEADD({datepart}, 1, MAX(CAST(v.value AS DATETIME2))) FROM {boundary_values};
+    ALTER PARTITION SCHEME {scheme} NEXT USED [{filegroup}];
+    ALTER PARTITION FUNCTION {function}() SPLIT RANGE (@boundary);
+END
+
+PRINT '✅ Ventana de {function} al día';
+GO
+"""
+
+
+def run_sql(settings, sql):
+    """Ejecutar un script (con separadores GO) vía sqlcmd -i; retorna (ok, salida)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.sql', encoding='utf-8', delete=False) as temp_file:
+        temp_file.write(sql)
+    try:
+        result = subprocess.run(
+            ['sqlcmd', *settings.sqlcmd_args(), '-b', '-i', temp_file.name],
+            capture_output=True, text=True, encoding='utf-8', errors='replace'
+        )
+    finally:
+        Path(temp_file.name).unlink(missing_ok=True)
+    return result.returncode == 0, result.stdout + result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description='🗂️ Particionamiento por fecha y ventana de retención (auditoría / solo inserción)')
+    parser.add_argument('--table', nargs='+', required=True,
+                        help='Tablas a particionar con la misma función (ej: system_auditoria system_auditoria_detalle)')
+    parser.add_argument('--name',
+                        help='Sufijo de pf_/ps_ (default: la primera tabla)')
+    parser.add_argument('--granularity', choices=list(GRANULARITIES.keys()), default=DEFAULT_GRANULARITY,
+                        help=f'Período de cada partición (default: {DEFAULT_GRANULARITY})')
+    parser.add_argument('--retention', type=int, default=DEFAULT_RETENTION,
+                        help=f'Períodos que se conservan (default: {DEFAULT_RETENTION})')
+    parser.add_argument('--future', type=int, default=DEFAULT_FUTURE,
+                        help=f'Períodos vacíos por delante (default: {DEFAULT_FUTURE})')
+    parser.add_argument('--column', default=DEFAULT_COLUMN,
+                        help=f'Columna DATETIME2 NOT NULL de partición (default: {DEFAULT_COLUMN})')
+    parser.add_argument('--filegroup', default=DEFAULT_FILEGROUP,
+                        help=f'Filegroup de las particiones (default: {DEFAULT_FILEGROUP})')
+    parser.add_argument('--compression', choices=list(COMPRESSION_MODES.keys()),
+                        help='DATA_COMPRESSION de la PK e índices alineados')
+    parser.add_argument('--maintenance', action='store_true',
+                        help='Solo la ventana deslizante (para el job programado)')
+    parser.add_argument('--preview', action='store_true', help='Solo mostrar el SQL')
+    parser.add_argument('--output', help='Guardar el SQL en este archivo (ej: para un job de SQL Agent)')
+    parser.add_argument('--execute', action='store_true', help='Ejecutar en la base de datos')
+    parser.add_argument('--autosync', action='store_true',
+                        help='Con --execute: regenerar los modelos (la clave pasa a ser (FechaCreacion, Id))')
+    parser.add_argument('--project', default='Backend',
+                        help='Ruta al proyecto Backend (default: Backend)')
+    args = parser.parse_args()
+
+    if not (args.preview or args.output or args.execute):
+        parser.error("Indique --preview, --output o --execute")
+    if args.retention < 1 or args.future < 1:
+        parser.error("--retention y --future deben ser >= 1")
+    if args.autosync and (not args.execute or args.maintenance):
+        parser.error("--autosync requiere --execute del layout")
+
+    try:
+        tables = [validate_identifier(table.lower()) for table in args.table]
+        name = validate_identifier((args.name or tables[0]).lower())
+        column = validate_identifier(args.column)
+        filegroup = validate_identifier(args.filegroup)
+    except ValueError as e:
+        parser.error(str(e))
+
+    maintenance_sql = generate_maintenance_sql(tables, name, args.granularity, args.retention, args.future, filegroup)
+    sql = maintenance_sql
+    if not args.maintenance:
+        layout_sql = generate_layout_sql(tables, name, args.granularity, args.retention, args.future, column, filegroup, args.compression)
+        sql = layout_sql + "\n" + maintenance_sql
+
+    if args.preview:
+        print("📋 SQL GENERADO:")
+        print("=" * 70)
+        print(sql)
+        print("=" * 70)
+
+    if args.output:
+        Path(args.output).write_text(sql, encoding='utf-8')
+        print(f"💾 SQL guardado en {args.output}")
+
+    if not args.execute:
+        sys.exit(0)
+
+    settings = load_connection_settings(args.project)
+    if not settings:
+        sys.exit(1)
+    print(f"🔗 {settings.describe()}")
+
+    try:
+        ok, output = run_sql(settings, sql)
+    except FileNotFoundError:
+        print("❌ ERROR: sqlcmd no encontrado. Instala SQL Server command line tools.")
+        sys.exit(1)
+
+    print(output.strip())
+    if not ok:
+        print("❌ ERROR ejecutando el particionamiento")
+        sys.exit(1)
+    print(f"✅ {'Ventana deslizante aplicada' if args.maintenance else 'Particionamiento aplicado'}: {', '.join(tables)}")
+
+    if args.autosync and not DatabaseTableGenerator(args.project).regenerate_models():
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
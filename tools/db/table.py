@@ -6,16 +6,19 @@ Creates database tables automatically with BaseEntity fields
 Usage:
     python tools/db/table.py --name "products" --fields "nombre:string:255" "precio:decimal:18,2"
     python tools/db/table.py --name "orders" --fk "customer_id:customers" --execute
+    python tools/db/table.py --name "movimientos" --key-strategy org-clustered
+    python tools/db/table.py --addfield "orders" --rekey --key-strategy sequential
 """
 
 import os
 import sys
-import json
 import subprocess
 import argparse
 from pathlib import Path
 import re
 
+from connection_settings import ConnectionSettings, load_connection_settings, read_connection_string
+
 # Configurar encoding UTF-8 para Windows
 if sys.platform == "win32":
     try:
@@ -28,10 +31,96 @@ if sys.platform == "win32":
         # Fallback silencioso si no se puede configurar encoding
         pass
 
+def index_covers(index, other):
+    """
+    True si index hace innecesario a other: misma tabla, las columnas clave de other
+    son prefijo de las de index y sus INCLUDE quedan cubiertos por index.
+    """
+    if index['table'].lower() != other['table'].lower():
+        return False
+    keys = [column.lower() for column in index['columns']]
+    other_keys = [column.lower() for column in other['columns']]
+    if keys[:len(other_keys)] != other_keys:
+        return False
+    covered = set(keys) | {column.lower() for column in index.get('include', [])}
+    return all(column.lower() in covered for column in other.get('include', []))
+
+# Catálogo full-text compartido por todas las tablas; 3082 = Español (alfabetización moderna)
+FULLTEXT_CATALOG = "ftCatalog"
+FULLTEXT_LANGUAGE = 3082
+
+# Columna calculada para búsquedas sin distinguir acentos ni mayúsculas (campo:string:N:searchable_normalized)
+SEARCHABLE_NORMALIZED = "searchable_normalized"
+NORMALIZED_SEARCH_SUFFIX = "_busqueda"
+NORMALIZED_SEARCH_COLLATION = "Modern_Spanish_CI_AI"
+MAX_NORMALIZED_SEARCH_SIZE = 450
+
+# Estrategias de clave primaria / índice clustered
+KEY_STRATEGIES = {
+    'sequential': 'Id DEFAULT NEWSEQUENTIALID(), PK clustered en Id',
+    'org-clustered': 'Id DEFAULT NEWID(), PK nonclustered + índice clustered (OrganizationId, FechaCreacion)',
+    'identity': 'Id DEFAULT NEWID(), PK nonclustered + ClusterKey BIGINT IDENTITY clustered',
+    'newid': 'Id DEFAULT NEWID(), PK clustered en Id (comportamiento anterior)',
+}
+DEFAULT_KEY_STRATEGY = 'sequential'
+
+# Numeración de campos autoincrementales
+AUTOINCREMENTAL_MODES = {
+    'config': 'contador en system_config_values (una fila por organización)',
+    'sequence': 'SEQUENCE dedicada por campo (sp_sequence_get_range, sin bloqueos de fila)',
+}
+DEFAULT_AUTOINCREMENTAL_MODE = 'config'
+DEFAULT_SEQUENCE_CACHE = 50
+
+# Modo online de --addfield: relleno por lotes en orden de Id
+DEFAULT_BACKFILL_BATCH = 4000       # < 5000 locks: evita el escalamiento a bloqueo de tabla
+DEFAULT_BACKFILL_DELAY_MS = 100
+BACKFILL_PROGRESS_EVERY = 25        # lotes entre mensajes de progreso
+# Valor para filas existentes (y DEFAULT para las nuevas); guid queda NULL: no hay un valor neutro
+BACKFILL_DEFAULTS = {
+    'string': "N''",
+    'text': "N''",
+    'autoincremental': "N''",
+    'int': "0",
+    'decimal': "0",
+    'bool': "0",
+    'datetime': "GETUTCDATE()",
+}
+# Ediciones con operaciones de índice online: Enterprise/Developer, Azure SQL Database, Managed Instance
+ONLINE_ENGINE_EDITIONS = (3, 5, 8)
+
+# Almacenamiento de tablas de alto volumen (auditoría, transaccionales)
+COMPRESSION_MODES = {
+    'row': 'formato de fila variable: poco CPU, ideal para tablas con muchas escrituras',
+    'page': 'fila + prefijo/diccionario por página: más ahorro, para tablas que se leen más de lo que se escriben',
+}
+# CREATE NONCLUSTERED COLUMNSTORE INDEX ... WITH (ONLINE = ON) existe desde SQL Server 2019
+COLUMNSTORE_ONLINE_MIN_VERSION = 15
+
+# Layout de tablas NN (muchos-a-muchos)
+NN_LAYOUTS = {
+    'entity': 'BaseEntity completa (Id GUID, auditoría, CustomFields) + FKs',
+    'compact': 'clave clustered compuesta (source_id, target_id) + índice inverso, sin Id',
+}
+DEFAULT_NN_LAYOUT = 'entity'
+
 class DatabaseTableGenerator:
-    def __init__(self, project_path="Backend"):
+    def __init__(self, project_path="Backend", key_strategy=DEFAULT_KEY_STRATEGY,
+                 autoincremental_mode=DEFAULT_AUTOINCREMENTAL_MODE, sequence_cache=DEFAULT_SEQUENCE_CACHE,
+                 sequence_per_org=False):
+        if key_strategy not in KEY_STRATEGIES:
+            raise ValueError(f"Estrategia de clave inválida: {key_strategy}. Opciones: {list(KEY_STRATEGIES.keys())}")
+        if autoincremental_mode not in AUTOINCREMENTAL_MODES:
+            raise ValueError(f"Modo autoincremental inválido: {autoincremental_mode}. Opciones: {list(AUTOINCREMENTAL_MODES.keys())}")
+        if sequence_cache < 0:
+            raise ValueError(f"Cache de SEQUENCE inválido: {sequence_cache}")
+        
         self.project_path = Path(project_path)
         self.root_path = Path.cwd()
+        self.key_strategy = key_strategy
+        self.autoincremental_mode = autoincremental_mode
+        self.sequence_cache = sequence_cache
+        self.sequence_per_org = sequence_per_org
         
         # Mapeo de tipos de datos
         self.type_mapping = {
@@ -55,38 +144,18 @@ class DatabaseTableGenerator:
         print()
     
     def read_connection_string(self):
-        """Lee la connection string desde launchSettings.json"""
-        launch_settings_path = self.project_path / "Properties" / "launchSettings.json"
-        
-        if not launch_settings_path.exists():
-            print(f"❌ ERROR: No se encontró launchSettings.json en {launch_settings_path}")
-            return None
-            
-        try:
-            with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                
-            # Buscar en los profiles la variable SQL
-            for profile_name, profile_data in settings.get("profiles", {}).items():
-                env_vars = profile_data.get("environmentVariables", {})
-                sql_connection = env_vars.get("SQL")
-                
-                if sql_connection:
-                    print(f"✅ Connection string encontrado en profile: {profile_name}")
-                    return sql_connection
-                    
-            print(f"❌ ERROR: No se encontró variable 'SQL' en environmentVariables")
-            return None
-            
-        except Exception as e:
-            print(f"❌ ERROR leyendo launchSettings.json: {e}")
-            return None
+        """Connection string EF desde launchSettings.json (resuelta una vez por proceso)"""
+        return read_connection_string(self.project_path)
+    
+    def connection_settings(self):
+        """Conexión del proyecto en formatos EF/ODBC/sqlcmd"""
+        return load_connection_settings(self.project_path)
     
     def table_exists(self, table_name):
         """Verifica si una tabla existe en la base de datos"""
         try:
-            connection_string = self.read_connection_string()
-            if not connection_string:
+            settings = self.connection_settings()
+            if not settings:
                 return False
             
             # Query para verificar existencia de tabla
@@ -97,7 +166,7 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
 """
             
             result = subprocess.run([
-                'sqlcmd', '-S', 'localhost', '-U', 'sa', '-P', 'Soporte.2019', '-C',
+                'sqlcmd', *settings.sqlcmd_args(),
                 '-Q', check_query
             ], capture_output=True, text=True, encoding='utf-8', errors='replace')
             
@@ -140,11 +209,14 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
         return name.lower()
     
     def parse_field(self, field_str):
-        """Parsea un campo: 'nombre:tipo:tamaño' """
+        """Parsea un campo: 'nombre:tipo:tamaño' (opcional ':searchable_normalized' al final)"""
         parts = field_str.split(':')
         if len(parts) < 2:
             raise ValueError(f"Formato de campo inválido: {field_str}. Use 'nombre:tipo' o 'nombre:tipo:tamaño'")
         
+        searchable_normalized = SEARCHABLE_NORMALIZED in [part.lower() for part in parts[2:]]
+        parts = parts[:2] + [part for part in parts[2:] if part.lower() != SEARCHABLE_NORMALIZED]
+        
         field_name = parts[0].lower()
         field_type = parts[1].lower()
         field_size = parts[2] if len(parts) > 2 else None
@@ -152,6 +224,11 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
         if field_type not in self.type_mapping:
             raise ValueError(f"Tipo de dato no soportado: {field_type}. Tipos válidos: {list(self.type_mapping.keys())}")
         
+        if searchable_normalized:
+            size = int(field_size) if field_size and field_size.isdigit() else 255
+            if field_type != 'string' or size > MAX_NORMALIZED_SEARCH_SIZE:
+                raise ValueError(f"{SEARCHABLE_NORMALIZED} solo aplica a campos string de hasta {MAX_NORMALIZED_SEARCH_SIZE} caracteres: {field_str}")
+        
         # Marcar campos autoincrementales para post-procesamiento
         if field_type == 'autoincremental':
             self.autoincremental_fields.append(field_name)
@@ -163,7 +240,8 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
             'type': field_type,
             'size': field_size,
             'sql_type': sql_type,
-            'nullable': field_type not in ['bool']  # bool siempre NOT NULL por defecto
+            'nullable': field_type not in ['bool'],  # bool siempre NOT NULL por defecto
+            'searchable_normalized': searchable_normalized
         }
     
     def parse_foreign_key(self, fk_str):
@@ -181,9 +259,161 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
             'sql_type': 'UNIQUEIDENTIFIER'
         }
     
-    def generate_base_fields(self):
+    def generate_key_fields(self, table_name):
+        """Columna Id (y ClusterKey en la estrategia identity) según key_strategy"""
+        default = "NEWSEQUENTIALID()" if self.key_strategy == 'sequential' else "NEWID()"
+        key_fields = f"    Id UNIQUEIDENTIFIER NOT NULL CONSTRAINT DF_{table_name}_Id DEFAULT {default},"
+        if self.key_strategy == 'identity':
+            key_fields += "\n    ClusterKey BIGINT IDENTITY(1,1) NOT NULL,"
+        return key_fields
+    
+    def generate_key_constraints(self, table_name):
+        """PK (clustered o no según key_strategy) y, en identity, el UNIQUE CLUSTERED de ClusterKey"""
+        if self.key_strategy in ('sequential', 'newid'):
+            return f"    CONSTRAINT PK_{table_name} PRIMARY KEY CLUSTERED (Id),"
+        
+        constraints = f"    CONSTRAINT PK_{table_name} PRIMARY KEY NONCLUSTERED (Id),"
+        if self.key_strategy == 'identity':
+            constraints += f"\n    CONSTRAINT UQ_{table_name}_ClusterKey UNIQUE CLUSTERED (ClusterKey),"
+        return constraints
+    
+    def generate_clustered_index(self, table_name):
+        """Índice clustered creado después de la tabla (solo org-clustered)"""
+        if self.key_strategy != 'org-clustered':
+            return ""
+        return f"""
+    
+    -- Índice clustered por tenant y fecha de creación (inserciones al final de cada organización)
+    CREATE CLUSTERED INDEX CIX_{table_name}_OrganizationId_FechaCreacion
+        ON {table_name}(OrganizationId, FechaCreacion);"""
+    
+    def support_indexes(self, table_name, foreign_keys=None, unique_fields=None, skip_indexes=None, fields=None):
+        """
+        Índices de soporte creados con la tabla: uno por cada columna FK (cascadas y joins
+        hacen seek), (OrganizationId, Active) para el filtro de tenant de ViewManager y
+        BaseQueryService, y uno por columna de búsqueda normalizada. skip_indexes: columnas
+        sin índice automático.
+        """
+        skip = {column.lower() for column in (skip_indexes or [])}
+        unique = {field.lower() for field in (unique_fields or [])}
+        indexes = []
+        
+        # El compuesto también cubre la FK de OrganizationId (columna inicial)
+        if 'organizationid' not in skip:
+            indexes.append({
+                'table': table_name,
+                'name': f"IX_{table_name}_OrganizationId_Active",
+                'columns': ['OrganizationId', 'Active'],
+                'include': ['FechaCreacion', 'FechaModificacion'],
+            })
+        
+        fk_columns = ['CreadorId', 'ModificadorId'] + [fk['field'] for fk in (foreign_keys or [])]
+        for column in fk_columns:
+            if column.lower() in skip or column.lower() in unique:
+                continue
+            indexes.append({'table': table_name, 'name': f"IX_{table_name}_{column}", 'columns': [column], 'include': []})
+        
+        for field in fields or []:
+            if field.get('searchable_normalized') and field['name'].lower() not in skip:
+                indexes.append(self.normalized_search_index(table_name, field))
+        
+        return indexes
+    
+    def render_index(self, index, indent="    "):
+        """CREATE NONCLUSTERED INDEX para un índice {'table', 'name', 'columns', 'include'}"""
+        sql = f"{indent}CREATE NONCLUSTERED INDEX {index['name']} ON {index['table']}({', '.join(index['columns'])})"
+        if index.get('include'):
+            sql += f"\n{indent}    INCLUDE ({', '.join(index['include'])})"
+        return sql + ";"
+    
+    def generate_support_indexes(self, table_name, foreign_keys=None, unique_fields=None, skip_indexes=None, extra_indexes=None, fields=None):
+        """SQL de los índices de soporte más los sugeridos para la tabla (sin los que otro índice ya cubre)"""
+        extra = [index for index in (extra_indexes or []) if index['table'].lower() == table_name.lower()]
+        support = [
+            index for index in self.support_indexes(table_name, foreign_keys, unique_fields, skip_indexes, fields)
+            if not any(index_covers(other, index) for other in extra)
+        ]
+        
+        sections = []
+        if support:
+            sections.append("    -- Índices de FK y filtro de tenant\n" + "\n".join(self.render_index(index) for index in support))
+        for index in extra:
+            comment = f"    -- {index['reason']}\n" if index.get('reason') else ""
+            sections.append(comment + self.render_index(index))
+        
+        if not sections:
+            return ""
+        return "\n    \n" + "\n    \n".join(sections)
+    
+    def generate_external_indexes(self, table_name, extra_indexes=None):
+        """Índices sugeridos sobre otras tablas (ej: destino de lookups), idempotentes y solo si la columna es indexable"""
+        statements = []
+        for index in extra_indexes or []:
+            if index['table'].lower() == table_name.lower():
+                continue
+            # max_length -1 = (N)VARCHAR(MAX): no puede ser clave de índice
+            key_columns = ", ".join(f"'{column}'" for column in index['columns'])
+            statements.append(f"""
+-- {index.get('reason') or index['name']}
+IF OBJECT_ID('{index['table']}', 'U') IS NOT NULL
+    AND (SELECT COUNT(*) FROM sys.columns WHERE object_id = OBJECT_ID('{index['table']}')
+         AND name IN ({key_columns}) AND max_length BETWEEN 1 AND 900) = {len(index['columns'])}
+    AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{index['table']}') AND name = '{index['name']}')
+BEGIN
+{self.render_index(index)}
+    PRINT '✅ Índice {index['name']} creado';
+END
+GO""")
+        return "\n".join(statements)
+    
+    def generate_fulltext_sql(self, table_name, columns):
+        """
+        Catálogo e índice full-text (CHANGE_TRACKING AUTO) sobre las columnas de búsqueda,
+        para que el backend use CONTAINS en lugar de LIKE '%term%'. Si el índice ya existe
+        solo agrega las columnas que falten. La clave es la PK (única, no nula, una columna).
+        """
+        if not columns:
+            return ""
+        
+        column_list = ", ".join(f"{column} LANGUAGE {FULLTEXT_LANGUAGE}" for column in columns)
+        add_columns = "\n".join(f"""        IF NOT EXISTS (SELECT 1 FROM sys.fulltext_index_columns
+                       WHERE object_id = OBJECT_ID('{table_name}') AND COL_NAME(object_id, column_id) = '{column}')
+            ALTER FULLTEXT INDEX ON {table_name} ADD ({column} LANGUAGE {FULLTEXT_LANGUAGE});""" for column in columns)
+        
+        return f"""
+-- ========================================
+-- 🔎 FULL-TEXT: {table_name} ({', '.join(columns)})
+-- ========================================
+
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{FULLTEXT_CATALOG}')
+        CREATE FULLTEXT CATALOG {FULLTEXT_CATALOG};
+    
+    IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{table_name}'))
+    BEGIN
+        DECLARE @key_index SYSNAME = (SELECT name FROM sys.indexes
+                                      WHERE object_id = OBJECT_ID('{table_name}') AND is_primary_key = 1);
+        DECLARE @sql NVARCHAR(MAX) = N'CREATE FULLTEXT INDEX ON {table_name} ({column_list})
+            KEY INDEX ' + QUOTENAME(@key_index) + N' ON {FULLTEXT_CATALOG} WITH CHANGE_TRACKING AUTO';
+        EXEC sp_executesql @sql;
+        PRINT '✅ Índice full-text creado en {table_name}';
+    END
+    ELSE
+    BEGIN
+{add_columns}
+        PRINT '✅ Índice full-text de {table_name} actualizado';
+    END
+END
+ELSE
+BEGIN
+    PRINT '⚠️ Full-Text Search no está instalado: las búsquedas de {table_name} seguirán usando LIKE';
+END
+GO"""
+    
+    def generate_base_fields(self, table_name):
         """Genera los campos base de BaseEntity"""
-        return """    Id UNIQUEIDENTIFIER DEFAULT NEWID() PRIMARY KEY,
+        return self.generate_key_fields(table_name) + """
     OrganizationId UNIQUEIDENTIFIER NULL,
     FechaCreacion DATETIME2 DEFAULT GETUTCDATE() NOT NULL,
     FechaModificacion DATETIME2 DEFAULT GETUTCDATE() NOT NULL,
@@ -201,9 +431,28 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
         for field in fields:
             nullable = "NULL" if field['nullable'] else "NOT NULL"
             field_lines.append(f"    {field['name']} {field['sql_type']} {nullable}")
+            if field.get('searchable_normalized'):
+                field_lines.append(f"    {self.normalized_search_column(field)}")
         
         return ",\n" + ",\n".join(field_lines) if field_lines else ""
     
+    def normalized_search_column(self, field):
+        """
+        Columna calculada persistida con intercalación sin acentos ni mayúsculas:
+        'categoria%' encuentra 'Categoría' con un seek sobre su índice (sin LOWER() ni COLLATE en la consulta)
+        """
+        return (f"{field['name']}{NORMALIZED_SEARCH_SUFFIX} AS "
+                f"({field['name']} COLLATE {NORMALIZED_SEARCH_COLLATION}) PERSISTED")
+    
+    def normalized_search_index(self, table_name, field):
+        column = f"{field['name']}{NORMALIZED_SEARCH_SUFFIX}"
+        return {
+            'table': table_name,
+            'name': f"IX_{table_name}_{column}",
+            'columns': ['OrganizationId', 'Active', column],
+            'include': [field['name']],
+        }
+    
     def generate_fk_fields(self, foreign_keys):
         """Genera campos de Foreign Keys"""
         if not foreign_keys:
@@ -218,6 +467,8 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
     def generate_base_constraints(self, table_name):
         """Genera constraints base de BaseEntity"""
         return f"""    
+    -- Clave primaria ({self.key_strategy})
+{self.generate_key_constraints(table_name)}
     -- BaseEntity Foreign Keys
     CONSTRAINT FK_{table_name}_OrganizationId 
         FOREIGN KEY (OrganizationId) REFERENCES system_organization(Id),
@@ -243,8 +494,9 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
         
         return ",\n" + ",\n".join(constraints) if constraints else ""
     
-    def generate_sql(self, table_name, fields=None, foreign_keys=None, unique_fields=None, module=None):
-        """Genera el SQL completo para crear la tabla"""
+    def generate_sql(self, table_name, fields=None, foreign_keys=None, unique_fields=None, module=None, skip_indexes=None, extra_indexes=None, fulltext_fields=None,
+                     compression=None, columnstore=None):
+        """Genera el SQL completo para crear la tabla (extra_indexes: índices sugeridos, ver index_advisor)"""
         fields = fields or []
         foreign_keys = foreign_keys or []
         unique_fields = unique_fields or []
@@ -270,9 +522,9 @@ WHERE TABLE_NAME = '{table_name}' AND TABLE_TYPE = 'BASE TABLE'
 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='{table_name}' AND xtype='U')
 BEGIN
     CREATE TABLE {table_name} (
-{self.generate_base_fields()}{self.generate_custom_fields(fields)}{self.generate_fk_fields(foreign_keys)},
+{self.generate_base_fields(table_name)}{self.generate_custom_fields(fields)}{self.generate_fk_fields(foreign_keys)},
 {self.generate_base_constraints(table_name)}{self.generate_custom_constraints(table_name, foreign_keys, unique_fields)}
-    );{module_comment}
+    );{self.generate_clustered_index(table_name)}{self.generate_support_indexes(table_name, foreign_keys, unique_fields, skip_indexes, extra_indexes, fields)}{module_comment}
     
     PRINT '✅ Tabla {table_name} creada exitosamente';
 END
@@ -283,18 +535,418 @@ END
 
 GO"""
         
+        for extra_sql in (self.generate_external_indexes(table_name, extra_indexes),
+                          self.generate_fulltext_sql(table_name, fulltext_fields),
+                          self.generate_sequence_sql(table_name, fields),
+                          self.generate_storage_sql(table_name, compression, columnstore)):
+            if extra_sql:
+                sql += "\n" + extra_sql
+        
+        return sql
+    
+    def nn_key_columns(self, source_table, target_table):
+        """Columnas de la clave NN; en relaciones de una tabla consigo misma la segunda es {tabla}_destino_id"""
+        source_column = f"{source_table}_id"
+        target_column = f"{target_table}_destino_id" if source_table == target_table else f"{target_table}_id"
+        return source_column, target_column
+    
+    def generate_nn_sql(self, table_name, source_table, target_table, fields=None, foreign_keys=None, audit=False, module=None, skip_indexes=None):
+        """
+        Tabla NN compacta: sin Id ni CustomFields, clave clustered (source_id, target_id)
+        y un índice inverso (target_id, source_id). Leer los productos de una venta (o las
+        ventas de un producto) es un seek de rango sobre un solo índice.
+        OrganizationId se mantiene para el filtro de tenant de BaseQueryService; audit agrega
+        FechaCreacion y CreadorId.
+        """
+        fields = fields or []
+        source_column, target_column = self.nn_key_columns(source_table, target_table)
+        # Las FK de las columnas clave ya se generan; el resto se agrega como columnas normales
+        foreign_keys = [fk for fk in (foreign_keys or []) if fk['field'] not in (source_column, target_column)]
+        
+        columns = [
+            f"    {source_column} UNIQUEIDENTIFIER NOT NULL",
+            f"    {target_column} UNIQUEIDENTIFIER NOT NULL",
+            "    OrganizationId UNIQUEIDENTIFIER NULL",
+        ]
+        if audit:
+            columns += [
+                "    FechaCreacion DATETIME2 DEFAULT GETUTCDATE() NOT NULL",
+                "    CreadorId UNIQUEIDENTIFIER NULL",
+            ]
+        
+        columns_sql = ",\n".join(columns)
+        
+        constraints = [
+            f"    CONSTRAINT PK_{table_name} PRIMARY KEY CLUSTERED ({source_column}, {target_column})",
+            f"""    CONSTRAINT FK_{table_name}_{source_column} 
+        FOREIGN KEY ({source_column}) REFERENCES {source_table}(Id)""",
+            f"""    CONSTRAINT FK_{table_name}_{target_column} 
+        FOREIGN KEY ({target_column}) REFERENCES {target_table}(Id)""",
+            f"""    CONSTRAINT FK_{table_name}_OrganizationId 
+        FOREIGN KEY (OrganizationId) REFERENCES system_organization(Id)""",
+        ]
+        if audit:
+            constraints.append(f"""    CONSTRAINT FK_{table_name}_CreadorId 
+        FOREIGN KEY (CreadorId) REFERENCES system_users(Id)""")
+        
+        constraints_sql = ",\n".join(constraints) + self.generate_custom_constraints(table_name, foreign_keys, [])
+        
+        # Índice inverso: seek de rango por target (la clave clustered completa la cobertura)
+        indexes = [{
+            'table': table_name,
+            'name': f"IX_{table_name}_{target_column}",
+            'columns': [target_column, source_column],
+            'include': [],
+        }]
+        indexes += [
+            {'table': table_name, 'name': f"IX_{table_name}_{fk['field']}", 'columns': [fk['field']], 'include': []}
+            for fk in foreign_keys
+            if fk['field'].lower() not in {column.lower() for column in (skip_indexes or [])}
+        ]
+        indexes_sql = "\n".join(self.render_index(index) for index in indexes)
+        
+        module_comment = ""
+        if module:
+            module_comment = f"""
+    
+    EXEC sp_addextendedproperty 
+        @name = N'MS_Description', 
+        @value = N'{module}', 
+        @level0type = N'SCHEMA', @level0name = N'dbo', 
+        @level1type = N'TABLE', @level1name = N'{table_name}';"""
+        
+        return f"""-- ========================================
+-- 🔗 TABLA NN: {table_name} ({source_table} ↔ {target_table}, layout compact)
+-- ========================================
+
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='{table_name}' AND xtype='U')
+BEGIN
+    CREATE TABLE {table_name} (
+{columns_sql}{self.generate_custom_fields(fields)}{self.generate_fk_fields(foreign_keys)},
+    
+    -- Clave compuesta: seek de rango por {source_column}
+{constraints_sql}
+    );
+    
+    -- Índice inverso por {target_column} (y por las FK adicionales)
+{indexes_sql}{module_comment}
+    
+    PRINT '✅ Tabla NN {table_name} creada exitosamente';
+END
+ELSE
+BEGIN
+    PRINT '📄 Tabla {table_name} ya existe';
+END
+
+GO"""
+    
+    def sequence_name(self, table_name, field_name):
+        """SEQUENCE de un campo autoincremental (con sequence_per_org se agrega _{OrganizationId sin guiones})"""
+        return f"seq_{table_name}_{field_name}"
+    
+    def autoincremental_attribute(self, table_name, field_name):
+        """Atributo [AutoIncremental] del campo según el modo de numeración"""
+        if self.autoincremental_mode != 'sequence':
+            return "AutoIncremental"
+        arguments = [f'Sequence = "{self.sequence_name(table_name, field_name)}"']
+        if self.sequence_per_org:
+            arguments += ["PerOrganization = true", f"Cache = {self.sequence_cache}"]
+        return f"AutoIncremental({', '.join(arguments)})"
+    
+    def generate_sequence_sql(self, table_name, fields=None):
+        """
+        CREATE SEQUENCE para los campos autoincrementales en modo 'sequence' (idempotente).
+        Con sequence_per_org crea una por organización existente; el backend crea las de
+        organizaciones nuevas en el primer INSERT.
+        """
+        if self.autoincremental_mode != 'sequence':
+            return ""
+        autoincremental = [field['name'] for field in (fields or []) if field.get('type') == 'autoincremental']
+        if not autoincremental:
+            return ""
+        
+        options = f"AS BIGINT START WITH 1 INCREMENT BY 1 {f'CACHE {self.sequence_cache}' if self.sequence_cache else 'NO CACHE'}"
+        statements = []
+        if self.sequence_per_org:
+            statements.append("DECLARE @seq_sql NVARCHAR(MAX);")
+        
+        for field_name in autoincremental:
+            sequence = self.sequence_name(table_name, field_name)
+            if self.sequence_per_org:
+                org_sequence = f"N'{sequence}_' + LOWER(REPLACE(CONVERT(NVARCHAR(36), o.Id), '-', ''))"
+                statements.append(f"""
+-- SEQUENCE por organización para {table_name}.{field_name}
+SET @seq_sql = N'';
+SELECT @seq_sql += N'CREATE SEQUENCE ' + QUOTENAME({org_sequence}) + N' {options};'
+FROM system_organization o
+WHERE NOT EXISTS (SELECT 1 FROM sys.sequences s WHERE s.name = {org_sequence});
+EXEC sp_executesql @seq_sql;
+PRINT '✅ SEQUENCE {sequence}_* creadas por organización';""")
+            else:
+                statements.append(f"""
+-- SEQUENCE para {table_name}.{field_name}
+IF NOT EXISTS (SELECT 1 FROM sys.sequences WHERE name = '{sequence}')
+BEGIN
+    CREATE SEQUENCE {sequence} {options};
+    PRINT '✅ SEQUENCE {sequence} creada';
+END""")
+        
+        return f"""-- ========================================
+-- 🔢 NUMERACIÓN AUTOINCREMENTAL: {table_name}
+-- ========================================
+{chr(10).join(statements)}
+GO
+"""
+    
+    def generate_rekey_sql(self, table_name):
+        """
+        Migrar la clave de una tabla existente a key_strategy (idempotente).
+        Cambia el default de Id; en org-clustered/identity además reconstruye la PK
+        como nonclustered y crea el índice clustered, salvo que otras tablas
+        referencien la PK (se informa y se deja como está).
+        """
+        default = "NEWSEQUENTIALID()" if self.key_strategy == 'sequential' else "NEWID()"
+        
+        sql = f"""-- ========================================
+-- 🔑 CLAVE PRIMARIA: {table_name} ({self.key_strategy})
+-- ========================================
+
+DECLARE @df NVARCHAR(256), @sql NVARCHAR(MAX);
+SELECT @df = dc.name
+FROM sys.default_constraints dc
+JOIN sys.columns c ON c.object_id = dc.parent_object_id AND c.column_id = dc.parent_column_id
+WHERE dc.parent_object_id = OBJECT_ID('{table_name}') AND c.name = 'Id';
+
+IF @df IS NOT NULL
+BEGIN
+    SET @sql = N'ALTER TABLE {table_name} DROP CONSTRAINT ' + QUOTENAME(@df);
+    EXEC sp_executesql @sql;
+END
+ALTER TABLE {table_name} ADD CONSTRAINT DF_{table_name}_Id DEFAULT {default} FOR Id;
+PRINT '✅ Default de {table_name}.Id: {default}';
+GO
+"""
+        
+        if self.key_strategy in ('sequential', 'newid'):
+            return sql
+        
+        if self.key_strategy == 'identity':
+            sql += f"""
+IF COL_LENGTH('{table_name}', 'ClusterKey') IS NULL
+    ALTER TABLE {table_name} ADD ClusterKey BIGINT IDENTITY(1,1) NOT NULL;
+GO
+"""
+            clustered_sql = f"ALTER TABLE {table_name} ADD CONSTRAINT UQ_{table_name}_ClusterKey UNIQUE CLUSTERED (ClusterKey);"
+        else:
+            clustered_sql = f"CREATE CLUSTERED INDEX CIX_{table_name}_OrganizationId_FechaCreacion ON {table_name}(OrganizationId, FechaCreacion);"
+        
+        sql += f"""
+DECLARE @pk NVARCHAR(256), @pk_clustered BIT, @sql NVARCHAR(MAX);
+SELECT @pk = kc.name, @pk_clustered = CASE WHEN i.type = 1 THEN 1 ELSE 0 END
+FROM sys.key_constraints kc
+JOIN sys.indexes i ON i.object_id = kc.parent_object_id AND i.index_id = kc.unique_index_id
+WHERE kc.parent_object_id = OBJECT_ID('{table_name}') AND kc.type = 'PK';
+
+IF @pk_clustered = 1 AND EXISTS (SELECT 1 FROM sys.foreign_keys WHERE referenced_object_id = OBJECT_ID('{table_name}'))
+BEGIN
+    PRINT '⚠️ La PK clustered de {table_name} es referenciada por otras FK; no se reconstruye';
+END
+ELSE
+BEGIN
+    IF @pk_clustered = 1
+    BEGIN
+        SET @sql = N'ALTER TABLE {table_name} DROP CONSTRAINT ' + QUOTENAME(@pk);
+        EXEC sp_executesql @sql;
+        ALTER TABLE {table_name} ADD CONSTRAINT PK_{table_name} PRIMARY KEY NONCLUSTERED (Id);
+    END
+    
+    IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_name}') AND type = 1)
+    BEGIN
+        {clustered_sql}
+        PRINT '✅ Índice clustered de {table_name} reconstruido ({self.key_strategy})';
+    END
+END
+GO
+"""
+        return sql
+    
+    def generate_online_add_columns(self, table_name, fields, batch_size=DEFAULT_BACKFILL_BATCH, delay_ms=DEFAULT_BACKFILL_DELAY_MS):
+        """
+        Agregar columnas NOT NULL a una tabla con datos sin bloquearla:
+        1. ADD NULL + DEFAULT con nombre (solo metadata; las filas nuevas ya traen valor)
+        2. Relleno de las filas existentes por lotes de batch_size en orden de Id, cada lote
+           en su propia transacción y con WAITFOR entre lotes para no acaparar el log ni los locks
+        3. ALTER COLUMN NOT NULL, online donde la edición lo soporta
+        Los tipos sin valor de relleno (guid) quedan NULL: ni DEFAULT ni NOT NULL.
+        """
+        backfill = [field for field in fields if field['type'] in BACKFILL_DEFAULTS]
+        nullable = [field['name'] for field in fields if field not in backfill]
+        if nullable:
+            print(f"⚠️ Sin valor de relleno para {', '.join(nullable)}: quedan NULL (no se pasan a NOT NULL)")
+        delay = f"00:00:{delay_ms // 1000:02d}.{delay_ms % 1000:03d}"
+        
+        add_columns = []
+        for field in fields:
+            column = f"ADD {field['name']} {field['sql_type']} NULL"
+            if field in backfill:
+                column += f" CONSTRAINT DF_{table_name}_{field['name']} DEFAULT {BACKFILL_DEFAULTS[field['type']]}"
+            add_columns.append(column)
+        
+        sql = f"""-- ========================================
+-- ➕ AGREGAR CAMPOS A TABLA: {table_name} (online, lotes de {batch_size})
+-- ========================================
+
+ALTER TABLE {table_name}
+{', '.join(add_columns)};
+GO
+"""
+        if nullable:
+            sql += f"-- ⚠️ Sin valor de relleno, quedan NULL: {', '.join(nullable)}\n"
+        if not backfill:
+            return sql
+        
+        assignments = ",\n        ".join(
+            f"{field['name']} = ISNULL({field['name']}, {BACKFILL_DEFAULTS[field['type']]})" for field in backfill
+        )
+        pending = " OR ".join(f"t.{field['name']} IS NULL" for field in backfill)
+        
+        sql += f"""
+-- Relleno por lotes (keyset sobre Id desde el GUID cero): cada UPDATE es una transacción corta
+SET NOCOUNT ON;
+DECLARE @batch INT = {batch_size}, @last UNIQUEIDENTIFIER = '00000000-0000-0000-0000-000000000000', @rows INT, @batches INT = 0, @total BIGINT = 0;
+DECLARE @ids TABLE (Id UNIQUEIDENTIFIER PRIMARY KEY);
+
+WHILE 1 = 1
+BEGIN
+    DELETE FROM @ids;
+    INSERT INTO @ids (Id)
+    SELECT TOP (@batch) Id FROM {table_name}
+    WHERE Id > @last
+    ORDER BY Id;
+    IF @@ROWCOUNT = 0 BREAK;
+    SELECT TOP 1 @last = Id FROM @ids ORDER BY Id DESC;
+    
+    UPDATE t SET
+        {assignments}
+    FROM {table_name} t
+    JOIN @ids i ON i.Id = t.Id
+    WHERE {pending};
+    SET @rows = @@ROWCOUNT;
+    
+    SET @total += @rows;
+    SET @batches += 1;
+    IF @batches % {BACKFILL_PROGRESS_EVERY} = 0
+        RAISERROR('   ⏳ {table_name}: %I64d filas rellenadas (%d lotes)', 0, 1, @total, @batches) WITH NOWAIT;
+    WAITFOR DELAY '{delay}';
+END
+RAISERROR('   ✅ {table_name}: %I64d filas rellenadas', 0, 1, @total) WITH NOWAIT;
+GO
+"""
+        
+        online = self.online_clause(" WITH (ONLINE = ON)")
+        for field in backfill:
+            sql += f"""
+-- NOT NULL para {field['name']} (online si la edición lo soporta)
+IF NOT EXISTS (SELECT 1 FROM {table_name} WHERE {field['name']} IS NULL)
+BEGIN
+    DECLARE @sql_{field['name']} NVARCHAR(MAX) = N'ALTER TABLE {table_name} ALTER COLUMN {field['name']} {field['sql_type']} NOT NULL' + {online};
+    EXEC sp_executesql @sql_{field['name']};
+END
+ELSE
+    PRINT '⚠️ {table_name}.{field['name']} aún tiene NULL: se deja NULL (vuelva a ejecutar el relleno)';
+GO
+"""
         return sql
     
-    def generate_alter_sql(self, table_name, fields=None, foreign_keys=None, unique_fields=None):
-        """Genera SQL para agregar campos a tabla existente"""
+    def online_clause(self, clause, min_version=None):
+        """Expresión T-SQL que vale clause donde la edición soporta operaciones online y N'' en el resto"""
+        condition = f"SERVERPROPERTY('EngineEdition') IN ({', '.join(map(str, ONLINE_ENGINE_EDITIONS))})"
+        if min_version:
+            # Azure (5, 8) siempre tiene la última versión del motor
+            condition = f"({condition} AND (SERVERPROPERTY('EngineEdition') <> 3 OR CAST(SERVERPROPERTY('ProductMajorVersion') AS INT) >= {min_version}))"
+        return f"CASE WHEN {condition} THEN N'{clause}' ELSE N'' END"
+    
+    def render_online_index(self, index):
+        """CREATE INDEX con ONLINE = ON donde la edición lo soporta (dynamic SQL: la opción no existe en todas)"""
+        statement = self.render_index(index, indent="").rstrip(";").replace("\n", " ").replace("'", "''")
+        return f"""
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index['name']}' AND object_id = OBJECT_ID('{index['table']}'))
+BEGIN
+    DECLARE @sql_{index['name']} NVARCHAR(MAX) = N'{statement}'
+        + {self.online_clause(" WITH (ONLINE = ON)")};
+    EXEC sp_executesql @sql_{index['name']};
+END"""
+    
+    def generate_storage_sql(self, table_name, compression=None, columnstore=None):
+        """
+        Compresión y columnstore para tablas de alto volumen, en lotes propios después de crear o
+        alterar la tabla. Idempotente: solo reconstruye los índices rowstore (y el heap) con otra
+        compresión y crea el columnstore si la tabla no tiene uno; en tablas con datos las
+        reconstrucciones son ONLINE donde la edición lo soporta.
+        """
+        sections = []
+        if compression:
+            level = compression.upper()
+            sections.append(f"""
+-- Compresión {level}: menos páginas por consulta (I/O y buffer pool)
+DECLARE @compression NVARCHAR(MAX) = N'';
+SELECT @compression += CASE WHEN i.type = 0 THEN N'ALTER TABLE {table_name} REBUILD'
+                            ELSE N'ALTER INDEX ' + QUOTENAME(i.name) + N' ON {table_name} REBUILD' END
+    + N' WITH (DATA_COMPRESSION = {level}' + {self.online_clause(", ONLINE = ON")} + N');' + NCHAR(10)
+FROM sys.indexes i
+JOIN sys.partitions p ON p.object_id = i.object_id AND p.index_id = i.index_id AND p.partition_number = 1
+WHERE i.object_id = OBJECT_ID('{table_name}') AND i.type IN (0, 1, 2) AND p.data_compression_desc <> '{level}';
+IF @compression <> N''
+BEGIN
+    EXEC sp_executesql @compression;
+    PRINT '🗜️ Compresión {level} aplicada a {table_name}';
+END
+GO""")
+        
+        if columnstore:
+            columns = ", ".join(columnstore)
+            column_names = ", ".join(f"'{column}'" for column in columnstore)
+            sections.append(f"""
+-- Columnstore no agrupado para reportes: escaneos y agregaciones sin leer el rowstore
+-- max_length -1 = (N)VARCHAR(MAX): no admitido en un columnstore no agrupado
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_name}') AND type = 6)
+BEGIN
+    IF (SELECT COUNT(*) FROM sys.columns WHERE object_id = OBJECT_ID('{table_name}')
+        AND name IN ({column_names}) AND max_length <> -1) = {len(columnstore)}
+    BEGIN
+        DECLARE @columnstore NVARCHAR(MAX) = N'CREATE NONCLUSTERED COLUMNSTORE INDEX NCCI_{table_name} ON {table_name}({columns})'
+            + {self.online_clause(" WITH (ONLINE = ON)", COLUMNSTORE_ONLINE_MIN_VERSION)};
+        EXEC sp_executesql @columnstore;
+        PRINT '📊 Columnstore NCCI_{table_name} creado';
+    END
+    ELSE
+        PRINT '⚠️ Columnstore omitido en {table_name}: columnas inexistentes o NVARCHAR(MAX) ({columns})';
+END
+GO""")
+        
+        return "\n".join(sections)
+    
+    def generate_alter_sql(self, table_name, fields=None, foreign_keys=None, unique_fields=None, rekey=False, skip_indexes=None, fulltext_fields=None,
+                           online=False, batch_size=DEFAULT_BACKFILL_BATCH, delay_ms=DEFAULT_BACKFILL_DELAY_MS,
+                           compression=None, columnstore=None):
+        """
+        Genera SQL para agregar campos a tabla existente (y migrar la clave si rekey).
+        online: columnas NULL + relleno por lotes + NOT NULL, e índices ONLINE (ver generate_online_add_columns)
+        compression/columnstore: se aplican a la tabla existente y sus índices (ver generate_storage_sql)
+        """
         fields = fields or []
         foreign_keys = foreign_keys or []
         unique_fields = unique_fields or []
+        skip = {column.lower() for column in (skip_indexes or [])}
         
         alter_statements = []
+        if rekey:
+            alter_statements.append(self.generate_rekey_sql(table_name))
         
         # ALTER TABLE para agregar campos personalizados
-        if fields:
+        if fields and online:
+            alter_statements.append(self.generate_online_add_columns(table_name, fields, batch_size, delay_ms))
+        elif fields:
             add_columns = []
             for field in fields:
                 add_columns.append(f"ADD {field['name']} {field['sql_type']} NOT NULL")
@@ -333,14 +985,18 @@ ADD CONSTRAINT FK_{table_name}_{fk['field']}
             
             alter_statements.extend(fk_constraints)
         
-        # ALTER TABLE para agregar constraints UNIQUE
+        # ALTER TABLE para agregar constraints UNIQUE (solo si los datos existentes ya no tienen duplicados)
         if unique_fields:
             unique_constraints = []
             for unique_field in unique_fields:
-                constraint_sql = f"""
+                # Lote propio: el SELECT de duplicados debe compilarse ya con las columnas agregadas
+                constraint_sql = f"""GO
 -- Unique constraint para {unique_field}
-ALTER TABLE {table_name}
-ADD CONSTRAINT UK_{table_name}_{unique_field} UNIQUE ({unique_field});"""
+IF NOT EXISTS (SELECT 1 FROM {table_name} GROUP BY {unique_field} HAVING COUNT(*) > 1)
+    ALTER TABLE {table_name}
+    ADD CONSTRAINT UK_{table_name}_{unique_field} UNIQUE ({unique_field});
+ELSE
+    PRINT '⚠️ {table_name}.{unique_field} tiene valores duplicados: UK_{table_name}_{unique_field} no se creó';"""
                 unique_constraints.append(constraint_sql)
             
             alter_statements.extend(unique_constraints)
@@ -351,6 +1007,12 @@ ADD CONSTRAINT UK_{table_name}_{unique_field} UNIQUE ({unique_field});"""
         
         for field in all_new_fields:
             field_name = field['name'] if 'name' in field else field['field']
+            if field_name.lower() in skip:
+                continue
+            if online:
+                index = {'table': table_name, 'name': f"IX_{table_name}_{field_name}", 'columns': [field_name], 'include': []}
+                index_statements.append(f"\n-- Índice para {field_name}{self.render_online_index(index)}")
+                continue
             index_sql = f"""
 -- Índice para {field_name}
 CREATE NONCLUSTERED INDEX IX_{table_name}_{field_name} ON {table_name}({field_name});"""
@@ -358,15 +1020,46 @@ CREATE NONCLUSTERED INDEX IX_{table_name}_{field_name} ON {table_name}({field_na
         
         # Combinar todo
         final_sql = "\n".join(alter_statements + index_statements)
+        normalized = [field for field in fields if field.get('searchable_normalized')]
+        if normalized:
+            # La columna calculada referencia las recién agregadas: va en su propio lote
+            final_sql += "\nGO\n" + self.generate_normalized_search_alter(table_name, normalized, skip)
+        if fulltext_fields:
+            # CREATE FULLTEXT INDEX necesita ver las columnas recién agregadas: va en su propio lote
+            final_sql += "\nGO\n" + self.generate_fulltext_sql(table_name, fulltext_fields)
+        sequence_sql = self.generate_sequence_sql(table_name, fields)
+        if sequence_sql:
+            final_sql += "\nGO\n" + sequence_sql
+        storage_sql = self.generate_storage_sql(table_name, compression, columnstore)
+        if storage_sql:
+            # Después de los índices nuevos: también se comprimen y el columnstore ve las columnas agregadas
+            final_sql += "\nGO\n" + storage_sql
         
         # Agregar mensaje de éxito
-        final_sql += f"""
+        if fields or foreign_keys or unique_fields:
+            final_sql += f"""
 
 PRINT '✅ Campos agregados exitosamente a tabla {table_name}';
 """
         
         return final_sql
     
+    def generate_normalized_search_alter(self, table_name, fields, skip=None):
+        """Columnas de búsqueda normalizada (y su índice) para campos agregados con ALTER"""
+        skip = skip or set()
+        statements = []
+        for field in fields:
+            column = f"{field['name']}{NORMALIZED_SEARCH_SUFFIX}"
+            statements.append(f"""
+-- Búsqueda normalizada para {field['name']}
+IF COL_LENGTH('{table_name}', '{column}') IS NULL
+    ALTER TABLE {table_name} ADD {self.normalized_search_column(field)};""")
+            if field['name'].lower() not in skip:
+                index = self.normalized_search_index(table_name, field)
+                statements.append(f"""IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = '{index['name']}' AND object_id = OBJECT_ID('{table_name}'))
+    {self.render_index(index, '    ').strip()}""")
+        return "\n".join(statements) + "\n"
+    
     def execute_sql(self, sql, connection_string):
         """Ejecuta el SQL en la base de datos"""
         print("\n🔧 EJECUTANDO SQL EN BASE DE DATOS")
@@ -377,32 +1070,19 @@ PRINT '✅ Campos agregados exitosamente a tabla {table_name}';
             temp_file = Path("temp_table.sql")
             temp_file.write_text(sql, encoding='utf-8')
             
-            # Parsear connection string para obtener server, database, user, password
-            conn_parts = {}
-            for part in connection_string.split(';'):
-                if '=' in part:
-                    key, value = part.split('=', 1)
-                    conn_parts[key.strip().lower()] = value.strip()
-            
-            server = conn_parts.get('server', 'localhost')
-            database = conn_parts.get('database', 'master')
-            user_id = conn_parts.get('user id', 'sa')
-            password = conn_parts.get('password', '')
+            # Mismos parámetros de conexión que el resto de herramientas
+            settings = ConnectionSettings(connection_string)
             
             # Ejecutar con sqlcmd
             cmd = [
-                "sqlcmd", 
-                "-S", server,
-                "-d", database,
-                "-U", user_id,
-                "-P", password,
-                "-i", str(temp_file),
-                "-C"  # Trust server certificate
+                "sqlcmd",
+                *settings.sqlcmd_args(),
+                "-i", str(temp_file)
             ]
             
-            print(f"   🔗 Servidor: {server}")
-            print(f"   📄 Base de datos: {database}")
-            print(f"   👤 Usuario: {user_id}")
+            print(f"   🔗 Servidor: {settings.server}")
+            print(f"   📄 Base de datos: {settings.database}")
+            print(f"   👤 Usuario: {settings.user_id or 'Windows (Trusted_Connection)'}")
             print()
             
             result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
@@ -463,8 +1143,8 @@ PRINT '✅ Campos agregados exitosamente a tabla {table_name}';
     def insert_system_config_records(self, table_name, field_name):
         """Inserta registros en system_config para campos autoincrementales"""
         try:
-            connection_string = self.read_connection_string()
-            if not connection_string:
+            settings = self.connection_settings()
+            if not settings:
                 return False
             
             print(f"   🔧 Insertando configuración autoincremental para {table_name}.{field_name}")
@@ -473,17 +1153,21 @@ PRINT '✅ Campos agregados exitosamente a tabla {table_name}';
             suffix_field = f"{table_name}.{field_name}.suffix"
             number_field = f"{table_name}.{field_name}.number"
             
+            # En modo sequence el número sale de la SEQUENCE: solo se registra el sufijo (prefijo por organización)
+            values = [f"('{suffix_field}', 'varchar', NULL, NULL, NULL, 1)"]
+            if self.autoincremental_mode != 'sequence':
+                values.append(f"('{number_field}', 'int', NULL, NULL, NULL, 1)")
+            
             sql_commands = f"""
 -- Insertar configuración para campo autoincremental {table_name}.{field_name}
 INSERT INTO system_config (Field, TypeField, OrganizationId, CreadorId, ModificadorId, Active)
 VALUES 
-('{suffix_field}', 'varchar', NULL, NULL, NULL, 1),
-('{number_field}', 'int', NULL, NULL, NULL, 1);
+{(','+chr(10)).join(values)};
 """
             
             # Ejecutar con sqlcmd
             result = subprocess.run([
-                'sqlcmd', '-S', 'localhost', '-U', 'sa', '-P', 'Soporte.2019', '-C',
+                'sqlcmd', *settings.sqlcmd_args(),
                 '-Q', sql_commands
             ], capture_output=True, text=True, encoding='utf-8', errors='replace')
             
@@ -540,10 +1224,11 @@ VALUES
             
             # Crear instancia y agregar metadata
             manager = EntityMetadataManager()
-            success = manager.add_attribute(table_name, field_name, "AutoIncremental")
+            attribute = self.autoincremental_attribute(table_name, field_name)
+            success = manager.add_attribute(table_name, field_name, attribute)
             
             if success:
-                print(f"      ✅ Metadata [AutoIncremental] agregada a {field_name}")
+                print(f"      ✅ Metadata [{attribute}] agregada a {field_name}")
                 return True
             else:
                 print(f"      ❌ Error agregando metadata AutoIncremental")
@@ -553,8 +1238,9 @@ VALUES
             print(f"   ❌ ERROR agregando metadata: {e}")
             return False
     
-    def run(self, table_name, fields=None, foreign_keys=None, unique_fields=None, execute=False, preview=False, autosync=False, add_fields_mode=False, module=None):
-        """Ejecuta el proceso completo"""
+    def run(self, table_name, fields=None, foreign_keys=None, unique_fields=None, execute=False, preview=False, autosync=False, add_fields_mode=False, module=None, rekey=False, skip_indexes=None, extra_indexes=None, fulltext_fields=None, nn=None, nn_audit=False,
+            online=False, batch_size=DEFAULT_BACKFILL_BATCH, delay_ms=DEFAULT_BACKFILL_DELAY_MS, compression=None, columnstore=None):
+        """Ejecuta el proceso completo (nn=(source, target): tabla NN con layout compact)"""
         self.print_header()
         
         try:
@@ -576,6 +1262,20 @@ VALUES
             else:
                 print(f"📊 CREAR NUEVA TABLA: {table_name}")
             
+            if nn:
+                if add_fields_mode or rekey:
+                    raise ValueError("El layout NN compact solo aplica al crear la tabla (--name)")
+                if fulltext_fields:
+                    raise ValueError("Full-text requiere una clave de una sola columna: no aplica a tablas NN compact")
+                nn = tuple(table.lower() for table in nn)
+                source_column, target_column = self.nn_key_columns(*nn)
+                print(f"🔗 Tabla NN compact: {nn[0]} ↔ {nn[1]}")
+                print(f"🔑 Clave clustered: ({source_column}, {target_column}) + índice inverso ({target_column}, {source_column})")
+                if nn_audit:
+                    print("🕓 Auditoría reducida: FechaCreacion, CreadorId")
+            elif rekey or not add_fields_mode:
+                print(f"🔑 Estrategia de clave: {self.key_strategy} ({KEY_STRATEGIES[self.key_strategy]})")
+            
             # Parsear campos
             parsed_fields = []
             if fields:
@@ -583,7 +1283,11 @@ VALUES
                 for field_str in fields:
                     field = self.parse_field(field_str)
                     parsed_fields.append(field)
-                    print(f"   • {field['name']}: {field['sql_type']}")
+                    search_note = f" (+ {field['name']}{NORMALIZED_SEARCH_SUFFIX})" if field.get('searchable_normalized') else ""
+                    print(f"   • {field['name']}: {field['sql_type']}{search_note}")
+                
+                if self.autoincremental_fields:
+                    print(f"🔢 Autoincrementales: {self.autoincremental_mode} ({AUTOINCREMENTAL_MODES[self.autoincremental_mode]})")
             
             # Parsear Foreign Keys
             parsed_fks = []
@@ -597,14 +1301,51 @@ VALUES
             # Unique fields
             if unique_fields:
                 print(f"🔒 Campos únicos: {', '.join(unique_fields)}")
+                # El relleno online deja el mismo valor en todas las filas: el UNIQUE fallaría siempre
+                backfilled = {field['name'].lower() for field in parsed_fields}
+                duplicated = [field for field in unique_fields if field.lower() in backfilled]
+                if online and duplicated:
+                    raise ValueError(f"--online rellena las columnas nuevas con un valor constante: "
+                                     f"--unique no aplica a {', '.join(duplicated)}")
+            
+            if skip_indexes:
+                print(f"🚫 Sin índice automático: {', '.join(skip_indexes)}")
+            
+            if fulltext_fields:
+                fulltext_fields = [column.lower() for column in fulltext_fields]
+                field_types = {field['name']: field['type'] for field in parsed_fields}
+                for column in fulltext_fields:
+                    if field_types.get(column, 'string') not in ('string', 'text', 'autoincremental'):
+                        raise ValueError(f"Full-text solo aplica a campos string/text: {column} es {field_types[column]}")
+                print(f"🔎 Full-text: {', '.join(fulltext_fields)}")
+            
+            if compression:
+                if compression not in COMPRESSION_MODES:
+                    raise ValueError(f"Compresión inválida: {compression}. Opciones: {list(COMPRESSION_MODES.keys())}")
+                print(f"🗜️ Compresión: {compression} ({COMPRESSION_MODES[compression]})")
+            
+            if columnstore:
+                field_types = {field['name']: field['type'] for field in parsed_fields}
+                for column in columnstore:
+                    if field_types.get(column) == 'text':
+                        raise ValueError(f"Columnstore no admite NVARCHAR(MAX): {column} es text")
+                print(f"📊 Columnstore: {', '.join(columnstore)}")
             
             print()
             
             # Generar SQL según el modo
             if add_fields_mode:
-                sql = self.generate_alter_sql(table_name, parsed_fields, parsed_fks, unique_fields)
+                sql = self.generate_alter_sql(table_name, parsed_fields, parsed_fks, unique_fields, rekey, skip_indexes, fulltext_fields,
+                                              online, batch_size, delay_ms, compression, columnstore)
+            elif nn:
+                sql = self.generate_nn_sql(table_name, nn[0], nn[1], parsed_fields, parsed_fks, nn_audit, module, skip_indexes)
+                for extra_sql in (self.generate_sequence_sql(table_name, parsed_fields),
+                                  self.generate_storage_sql(table_name, compression, columnstore)):
+                    if extra_sql:
+                        sql += "\n" + extra_sql
             else:
-                sql = self.generate_sql(table_name, parsed_fields, parsed_fks, unique_fields, module)
+                sql = self.generate_sql(table_name, parsed_fields, parsed_fks, unique_fields, module, skip_indexes, extra_indexes, fulltext_fields,
+                                        compression, columnstore)
             
             if preview:
                 print("📋 SQL GENERADO:")
@@ -639,7 +1380,7 @@ VALUES
                     
                     if self.autoincremental_fields:
                         print(f"✅ Campos autoincrementales configurados: {', '.join(self.autoincremental_fields)}")
-                        print(f"✅ Metadata [AutoIncremental] agregada automáticamente")
+                        print(f"✅ Metadata [AutoIncremental] agregada automáticamente ({self.autoincremental_mode})")
                     if autosync or not (execute or preview):
                         print(f"✅ Modelos .NET actualizados automáticamente")
                     else:
@@ -675,11 +1416,15 @@ def main():
                        help='Nombre de la tabla existente para AGREGAR campos')
     
     parser.add_argument('--fields', nargs='*', default=[],
-                       help='Campos adicionales: "nombre:tipo:tamaño"')
+                       help='Campos adicionales: "nombre:tipo:tamaño" (":searchable_normalized" agrega columna de búsqueda sin acentos)')
     parser.add_argument('--fk', nargs='*', default=[],
                        help='Foreign keys: "campo:tabla_referencia"')
     parser.add_argument('--unique', nargs='*', default=[],
                        help='Campos únicos')
+    parser.add_argument('--no-index', nargs='*', default=[],
+                       help='Columnas sin índice automático (FK, CreadorId, ModificadorId; OrganizationId omite el índice de tenant)')
+    parser.add_argument('--fulltext', nargs='*', default=[],
+                       help='Campos string/text con índice full-text (búsqueda con CONTAINS)')
     parser.add_argument('--execute', action='store_true',
                        help='Ejecutar en base de datos')
     parser.add_argument('--preview', action='store_true',
@@ -688,10 +1433,56 @@ def main():
                        help='Auto-ejecutar dbsync después de crear tabla')
     parser.add_argument('--project', default='Backend',
                        help='Ruta al proyecto Backend (default: Backend)')
+    parser.add_argument('--key-strategy', choices=list(KEY_STRATEGIES.keys()), default=DEFAULT_KEY_STRATEGY,
+                       help=f'Clave primaria / índice clustered (default: {DEFAULT_KEY_STRATEGY})')
+    parser.add_argument('--rekey', action='store_true',
+                       help='Con --addfield: migrar la clave de la tabla existente a --key-strategy')
+    parser.add_argument('--nn', nargs=2, metavar=('SOURCE', 'TARGET'),
+                       help='Con --name: tabla NN compacta con clave clustered (source_id, target_id)')
+    parser.add_argument('--nn-audit', action='store_true',
+                       help='Con --nn: agregar FechaCreacion y CreadorId')
+    parser.add_argument('--autoincremental', choices=list(AUTOINCREMENTAL_MODES.keys()), default=DEFAULT_AUTOINCREMENTAL_MODE,
+                       help=f'Numeración de campos autoincrementales (default: {DEFAULT_AUTOINCREMENTAL_MODE})')
+    parser.add_argument('--sequence-cache', type=int, default=DEFAULT_SEQUENCE_CACHE,
+                       help=f'CACHE de cada SEQUENCE; 0 = NO CACHE (default: {DEFAULT_SEQUENCE_CACHE})')
+    parser.add_argument('--sequence-per-org', action='store_true',
+                       help='Una SEQUENCE por organización (numeración independiente por tenant)')
+    parser.add_argument('--online', action='store_true',
+                       help='Con --addfield: columnas NULL + relleno por lotes + NOT NULL, índices ONLINE (tablas con datos)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BACKFILL_BATCH,
+                       help=f'Con --online: filas por lote del relleno (default: {DEFAULT_BACKFILL_BATCH})')
+    parser.add_argument('--batch-delay', type=int, default=DEFAULT_BACKFILL_DELAY_MS,
+                       help=f'Con --online: pausa en ms entre lotes (default: {DEFAULT_BACKFILL_DELAY_MS})')
+    parser.add_argument('--compression', choices=list(COMPRESSION_MODES.keys()),
+                       help='DATA_COMPRESSION de la tabla y sus índices rowstore (tablas de alto volumen)')
+    parser.add_argument('--columnstore', nargs='+', metavar='COLUMNA',
+                       help='Columnstore no agrupado sobre estas columnas (consultas de reportes)')
     
     args = parser.parse_args()
     
-    generator = DatabaseTableGenerator(args.project)
+    if args.rekey and not args.addfield:
+        parser.error("--rekey solo se usa con --addfield")
+    if args.nn and not args.name:
+        parser.error("--nn solo se usa con --name")
+    if args.nn_audit and not args.nn:
+        parser.error("--nn-audit requiere --nn")
+    if args.autoincremental != 'sequence' and (args.sequence_per_org or args.sequence_cache != DEFAULT_SEQUENCE_CACHE):
+        parser.error("--sequence-cache y --sequence-per-org requieren --autoincremental sequence")
+    if args.sequence_cache < 0:
+        parser.error("--sequence-cache debe ser >= 0")
+    if args.online and not args.addfield:
+        parser.error("--online solo se usa con --addfield")
+    if args.online and {field.split(':')[0].lower() for field in args.fields} & {field.lower() for field in args.unique}:
+        parser.error("--online rellena las columnas nuevas con un valor constante: no se combina con --unique sobre ellas")
+    if args.online and args.rekey:
+        parser.error("--online no se combina con --rekey (la migración de clave reconstruye la tabla)")
+    if not args.online and (args.batch_size != DEFAULT_BACKFILL_BATCH or args.batch_delay != DEFAULT_BACKFILL_DELAY_MS):
+        parser.error("--batch-size y --batch-delay requieren --online")
+    if args.batch_size <= 0 or args.batch_delay < 0 or args.batch_delay >= 60000:
+        parser.error("--batch-size debe ser > 0 y --batch-delay entre 0 y 59999 ms")
+    
+    generator = DatabaseTableGenerator(args.project, args.key_strategy, args.autoincremental,
+                                       args.sequence_cache, args.sequence_per_org)
     
     try:
         # Determinar el modo y nombre de tabla
@@ -706,7 +1497,17 @@ def main():
             execute=args.execute,
             preview=args.preview,
             autosync=args.autosync,
-            add_fields_mode=add_fields_mode
+            add_fields_mode=add_fields_mode,
+            rekey=args.rekey,
+            skip_indexes=args.no_index,
+            fulltext_fields=args.fulltext,
+            nn=args.nn,
+            nn_audit=args.nn_audit,
+            online=args.online,
+            batch_size=args.batch_size,
+            delay_ms=args.batch_delay,
+            compression=args.compression,
+            columnstore=args.columnstore
         )
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
@@ -11,13 +11,15 @@ Usage:
 
 import os
 import sys
-import json
 import shutil
 import subprocess
 import argparse
 from pathlib import Path
 import re
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / "db"))
+from connection_settings import load_connection_settings
+
 # Configurar encoding UTF-8 para Windows
 if sys.platform == "win32":
     import codecs
@@ -40,44 +42,20 @@ class DatabaseModelGenerator:
         print()
     
     def read_connection_string(self):
-        """Lee la connection string desde launchSettings.json"""
-        launch_settings_path = self.project_path / "Properties" / "launchSettings.json"
+        """Lee la connection string desde launchSettings.json (módulo compartido de conexión)"""
+        settings = load_connection_settings(self.project_path)
         
-        if not launch_settings_path.exists():
-            print(f"❌ ERROR: No se encontró launchSettings.json en {launch_settings_path}")
-            print("   Asegúrate de que el proyecto existe y tiene la estructura correcta")
-            return None
-            
-        try:
-            with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                
-            # Buscar en los profiles la variable SQL
-            for profile_name, profile_data in settings.get("profiles", {}).items():
-                env_vars = profile_data.get("environmentVariables", {})
-                sql_connection = env_vars.get("SQL")
-                
-                if sql_connection:
-                    print(f"✅ Connection string encontrado en profile: {profile_name}")
-                    print(f"   📄 Archivo: {launch_settings_path}")
-                    print(f"   🔗 Conexión: {sql_connection[:50]}...")
-                    return sql_connection
-                    
-            print(f"❌ ERROR: No se encontró variable 'SQL' en environmentVariables")
-            print(f"   📄 Archivo: {launch_settings_path}")
+        if not settings:
             print("   💡 Ejemplo de configuración:")
             print('   "environmentVariables": {')
             print('     "ASPNETCORE_ENVIRONMENT": "Development",')
             print('     "SQL": "Server=localhost;Database=MiTienda;Trusted_Connection=true;"')
             print('   }')
             return None
-            
-        except json.JSONDecodeError as e:
-            print(f"❌ ERROR: El archivo launchSettings.json no es válido: {e}")
-            return None
-        except Exception as e:
-            print(f"❌ ERROR leyendo launchSettings.json: {e}")
-            return None
+        
+        print(f"   📄 Archivo: {settings.source}")
+        print(f"   🔗 Conexión: {settings.describe()}")
+        return settings.ef()
     
     def prepare_directories(self):
         """Prepara directorios necesarios sin eliminar archivos existentes"""
@@ -143,6 +121,31 @@ class DatabaseModelGenerator:
         finally:
             os.chdir(original_cwd)
     
+    def nn_key(self, entity_name, context):
+        """Clave de una entidad según su bloque en AppDbContext: 'id', 'compuesta', 'keyless' o None"""
+        for block in context.split("modelBuilder.Entity<")[1:]:
+            if block.split(">", 1)[0] != entity_name:
+                continue
+            if "HasNoKey()" in block:
+                return "keyless"
+            if re.search(r'HasKey\(\w+\s*=>\s*new\s*\{', block):
+                return "compuesta"
+            return "id"
+        return None
+    
+    def nn_key_info(self, entity_name, context):
+        """Sufijo para los listados de NN según la clave real en AppDbContext"""
+        key = self.nn_key(entity_name, context)
+        if key == "compuesta":
+            return " (clave compuesta)"
+        if key == "keyless":
+            return " (⚠️ sin clave)"
+        return ""
+    
+    def read_context(self):
+        context_file = self.data_path / "AppDbContext.cs"
+        return context_file.read_text(encoding='utf-8') if context_file.exists() else ""
+    
     def organize_nn_entities(self):
         """Organiza las entidades NN en carpeta separada con namespace correcto"""
         print("\n🔗 ORGANIZANDO ENTIDADES NN")
@@ -166,6 +169,8 @@ class DatabaseModelGenerator:
             return True
         
         print(f"   📂 Moviendo {len(nn_files)} entidades NN a carpeta NN/")
+        context = self.read_context()
+        keyless = []
         
         # Mover cada archivo NN y actualizar namespace
         for nn_file in nn_files:
@@ -187,13 +192,22 @@ class DatabaseModelGenerator:
                 # Eliminar archivo original
                 nn_file.unlink()
                 
-                print(f"   ✅ {nn_file.name} → NN/{nn_file.name}")
+                # Las NN compact no tienen Id: su clave (source_id, target_id) debe quedar en HasKey de AppDbContext
+                key = self.nn_key(nn_file.stem, context)
+                if key == "keyless":
+                    keyless.append(nn_file.stem)
+                print(f"   ✅ {nn_file.name} → NN/{nn_file.name}{self.nn_key_info(nn_file.stem, context)}")
                 
             except Exception as e:
                 print(f"   ⚠️  Error moviendo {nn_file.name}: {e}")
                 return False
         
         print(f"   🎯 Entidades NN organizadas en: {nn_path}")
+        
+        # Una NN sin PK se scaffoldea con HasNoKey(): EF no la rastrea y no se puede insertar ni borrar
+        if keyless:
+            print(f"   ⚠️  Sin clave en AppDbContext (HasNoKey): {', '.join(keyless)}")
+            print("   💡 La tabla no tiene PRIMARY KEY; recréala con table.py --nn (clave compuesta) o agrega Id")
         return True
     
     def organize_system_entities(self):
@@ -339,8 +353,9 @@ class DatabaseModelGenerator:
             if nn_files:
                 print(f"\n🔗 Entidades NN ({len(nn_files)}):")
                 print(f"   📂 {nn_path}")
+                context = self.read_context()
                 for file in nn_files:
-                    print(f"   ✅ {file.name}")
+                    print(f"   ✅ {file.name}{self.nn_key_info(file.stem, context)}")
         
         # Listar entidades del sistema
         system_path = self.entities_path / "SystemEntities"
@@ -23,19 +23,37 @@ import argparse
 import json
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "db"))
+from connection_settings import load_connection_settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from metadata_document import MetadataDocument, attribute_name
+
 try:
     import pyodbc
     PYODBC_AVAILABLE = True
 except ImportError:
     PYODBC_AVAILABLE = False
 
+# Hilos por defecto para procesar entidades en paralelo
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+# Tipos de FieldPermission (orden en que se escriben en el atributo)
+FIELD_PERMISSION_TYPES = ("CREATE", "UPDATE", "VIEW")
+
+# SQL Server admite ~2100 parámetros por consulta
+PERMISSION_QUERY_CHUNK = 1000
+
 class EntityMetadataManager:
     def __init__(self):
         self.root_path = Path.cwd()
         self.shared_models_path = self.root_path / "Shared.Models"
         self.entities_path = self.shared_models_path / "Entities"
         self.attributes_namespace = "Shared.Models.Attributes"
-        self.connection_string = self.get_connection_string()
+        self._entity_index = None       # nombre de entidad -> Path del modelo
+        self._connection_string = None  # se resuelve al primer uso (no en --list)
         
         # Mapeo de atributos disponibles
         self.available_attributes = {
@@ -105,89 +123,30 @@ class EntityMetadataManager:
         # Si no existe, usar el directorio raíz de entidades
         return self.entities_path / f"{entity_name}.Metadata.cs"
     
+    def build_entity_index(self) -> Dict[str, Path]:
+        """Indexar una sola vez los modelos de Shared.Models/Entities (la raíz tiene prioridad sobre subcarpetas)"""
+        index = {}
+        if self.entities_path.exists():
+            for cs_file in sorted(self.entities_path.rglob("*.cs"), key=lambda p: (len(p.parts), str(p))):
+                if not cs_file.name.endswith(".Metadata.cs"):
+                    index.setdefault(cs_file.stem, cs_file)
+        self._entity_index = index
+        return index
+    
     def get_entity_file_path(self, entity_name: str) -> Path:
         """Obtiene la ruta del archivo de entidad generado por EF Core"""
-        # Buscar primero en el directorio raíz de entidades
-        entity_file = self.entities_path / f"{entity_name}.cs"
-        if entity_file.exists():
-            return entity_file
-        
-        # Buscar en subdirectorios
-        for subdirectory in self.entities_path.iterdir():
-            if subdirectory.is_dir():
-                entity_file = subdirectory / f"{entity_name}.cs"
-                if entity_file.exists():
-                    return entity_file
+        if self._entity_index is None:
+            self.build_entity_index()
         
         # Si no se encuentra, devolver la ruta por defecto
-        return self.entities_path / f"{entity_name}.cs"
+        return self._entity_index.get(entity_name, self.entities_path / f"{entity_name}.cs")
     
     def entity_exists(self, entity_name: str) -> bool:
         """Verifica si la entidad existe (archivo generado por EF Core)"""
         return self.get_entity_file_path(entity_name).exists()
     
-    def parse_existing_metadata(self, metadata_file: Path) -> Dict:
-        """Parse archivo metadata existente para extraer información"""
-        if not metadata_file.exists():
-            return {"fields": {}, "imports": set(), "existing_content": ""}
-        
-        content = metadata_file.read_text(encoding='utf-8')
-        
-        # Extraer imports existentes
-        imports = set()
-        import_pattern = r'using\s+([^;]+);'
-        for match in re.finditer(import_pattern, content):
-            imports.add(match.group(1).strip())
-        
-        # Extraer campos con atributos existentes
-        fields = {}
-        
-        # Buscar la clase metadata
-        metadata_class_pattern = r'public\s+class\s+\w+Metadata\s*\{([^}]*)\}'
-        metadata_match = re.search(metadata_class_pattern, content, re.DOTALL)
-        
-        if metadata_match:
-            metadata_content = metadata_match.group(1)
-            
-            # Extraer campos con sus atributos
-            field_pattern = r'(\[[^\]]+\]\s*)*\s*public\s+\w+\s+(\w+);'
-            
-            for match in re.finditer(field_pattern, metadata_content, re.MULTILINE):
-                attributes_str = match.group(1) or ""
-                field_name = match.group(2)
-                
-                # Extraer atributos individuales
-                attr_pattern = r'\[([^\]]+)\]'
-                attributes = re.findall(attr_pattern, attributes_str)
-                
-                fields[field_name] = attributes
-        
-        return {
-            "fields": fields,
-            "imports": imports,
-            "existing_content": content
-        }
-    
-    def create_metadata_file(self, entity_name: str, field_name: str, attribute: str) -> bool:
-        """Crea un nuevo archivo .Metadata.cs"""
-        metadata_file = self.get_metadata_file_path(entity_name)
-        
-        # Verificar que la entidad existe
-        if not self.entity_exists(entity_name):
-            print(f"❌ ERROR: La entidad {entity_name} no existe en {self.entities_path}")
-            print(f"   Archivos disponibles:")
-            for file in self.entities_path.glob("*.cs"):
-                if not file.name.endswith(".Metadata.cs"):
-                    print(f"   - {file.stem}")
-            return False
-        
-        attribute_info = self.available_attributes.get(attribute)
-        if not attribute_info:
-            print(f"❌ ERROR: Atributo '{attribute}' no disponible")
-            print(f"   Atributos disponibles: {list(self.available_attributes.keys())}")
-            return False
-        
-        # Determinar el namespace basado en la ubicación del archivo
+    def get_entity_namespace(self, entity_name: str) -> str:
+        """Namespace del archivo de entidad generado por EF Core"""
         entity_file = self.get_entity_file_path(entity_name)
         namespace = "Shared.Models.Entities"
         
@@ -197,99 +156,48 @@ class EntityMetadataManager:
             namespace_match = re.search(r'namespace\s+([\w.]+);', entity_content)
             if namespace_match:
                 namespace = namespace_match.group(1)
-
-        # Contenido del archivo
-        content = f"""using System;
-using System.ComponentModel.DataAnnotations;
-using {self.attributes_namespace};
-
-namespace {namespace}
-{{
-    [MetadataType(typeof({entity_name}Metadata))]
-    public partial class {entity_name} {{ }}
-
-    public class {entity_name}Metadata
-    {{
-        [{attribute}]
-        public string {field_name};
-    }}
-}}
-"""
-        
-        # Crear el archivo
-        metadata_file.write_text(content, encoding='utf-8')
         
-        print(f"✅ Archivo metadata creado: {metadata_file.name}")
-        print(f"   🎯 Entidad: {entity_name}")
-        print(f"   📝 Campo: {field_name}")
-        print(f"   🏷️  Atributo: [{attribute}]")
-        
-        return True
+        return namespace
     
-    def update_metadata_file(self, entity_name: str, field_name: str, attribute: str) -> bool:
-        """Actualiza un archivo .Metadata.cs existente"""
+    def load_metadata_document(self, entity_name: str, log: Optional[List[str]] = None) -> Optional[MetadataDocument]:
+        """Documento .Metadata.cs de la entidad (parseado una vez, o nuevo si no existe)"""
         metadata_file = self.get_metadata_file_path(entity_name)
         
-        # Parse contenido existente
-        existing_data = self.parse_existing_metadata(metadata_file)
-        
-        # Verificar si el campo ya tiene este atributo
-        existing_attributes = existing_data["fields"].get(field_name, [])
-        if attribute in existing_attributes:
-            print(f"⚠️  El campo '{field_name}' ya tiene el atributo [{attribute}]")
-            print(f"   Atributos actuales: {existing_attributes}")
-            return False
-        
-        # Leer contenido actual
-        content = metadata_file.read_text(encoding='utf-8')
-        
-        # Buscar la clase metadata
-        metadata_class_pattern = r'(public\s+class\s+\w+Metadata\s*\{)([^}]*)(^\s*\})'
-        match = re.search(metadata_class_pattern, content, re.MULTILINE | re.DOTALL)
-        
-        if not match:
-            print(f"❌ ERROR: No se pudo encontrar la clase Metadata en {metadata_file.name}")
-            return False
-        
-        class_start = match.group(1)
-        class_content = match.group(2)
-        class_end = match.group(3)
-        
-        # Verificar si el campo ya existe
-        field_pattern = rf'(\[[^\]]+\]\s*)*\s*public\s+\w+\s+{field_name};'
-        field_match = re.search(field_pattern, class_content)
-        
-        if field_match:
-            # Campo existe, agregar atributo
-            existing_field_line = field_match.group(0)
-            new_field_line = f"        [{attribute}]\n        {existing_field_line.strip()}"
-            
-            # Reemplazar en el contenido de la clase
-            new_class_content = class_content.replace(existing_field_line, new_field_line)
-        else:
-            # Campo no existe, agregarlo
-            new_field = f"\n        [{attribute}]\n        public string {field_name};\n"
-            new_class_content = class_content + new_field
-        
-        # Reconstruir contenido completo
-        new_content = content.replace(match.group(0), class_start + new_class_content + class_end)
+        if metadata_file.exists():
+            document = MetadataDocument.load(metadata_file, entity_name)
+            if document is None:
+                message = f"❌ ERROR: No se pudo encontrar la clase Metadata en {metadata_file.name}"
+                if log is not None:
+                    log.append(f"   {message}")
+                else:
+                    print(message)
+            return document
         
-        # Escribir archivo actualizado
-        metadata_file.write_text(new_content, encoding='utf-8')
+        return MetadataDocument.new(
+            metadata_file, entity_name,
+            self.get_entity_namespace(entity_name), self.attributes_namespace
+        )
+    
+    def parse_existing_metadata(self, metadata_file: Path) -> Dict:
+        """Parse archivo metadata existente para extraer información"""
+        if not metadata_file.exists():
+            return {"fields": {}, "imports": set(), "existing_content": ""}
         
-        print(f"✅ Archivo metadata actualizado: {metadata_file.name}")
-        print(f"   🎯 Entidad: {entity_name}")
-        print(f"   📝 Campo: {field_name}")
-        print(f"   🏷️  Atributo: [{attribute}] (agregado)")
+        document = MetadataDocument.load(metadata_file)
+        content = document.original if document else metadata_file.read_text(encoding='utf-8')
+        imports = {match.group(1).strip() for match in re.finditer(r'using\s+([^;]+);', content)}
         
-        return True
+        return {
+            "fields": document.field_attributes() if document else {},
+            "imports": imports,
+            "existing_content": content
+        }
     
     def add_attribute(self, table_name: str, field_name: str, attribute: str) -> bool:
-        """Punto de entrada principal para agregar atributo (modo simple)"""
+        """Punto de entrada principal para agregar atributo (modo simple; admite argumentos: AutoIncremental(Sequence = "..."))"""
         
         # Convertir nombre de tabla a entidad
         entity_name = self.table_name_to_entity_name(table_name)
-        metadata_file = self.get_metadata_file_path(entity_name)
         
         print(f"🔄 Procesando:")
         print(f"   📊 Tabla: {table_name}")
@@ -299,18 +207,40 @@ namespace {namespace}
         print()
         
         # Verificar si el atributo existe
-        if attribute not in self.available_attributes:
+        if attribute_name(attribute) not in self.available_attributes:
             print(f"❌ ERROR: Atributo '{attribute}' no disponible")
             print(f"   Atributos disponibles:")
             for attr_name, attr_info in self.available_attributes.items():
                 print(f"   - {attr_name}: {attr_info['description']}")
             return False
         
-        # Decidir si crear o actualizar
-        if metadata_file.exists():
-            return self.update_metadata_file(entity_name, field_name, attribute)
-        else:
-            return self.create_metadata_file(entity_name, field_name, attribute)
+        # Verificar que la entidad existe
+        if not self.entity_exists(entity_name):
+            print(f"❌ ERROR: La entidad {entity_name} no existe en {self.entities_path}")
+            print(f"   Archivos disponibles:")
+            for file in self.entities_path.glob("*.cs"):
+                if not file.name.endswith(".Metadata.cs"):
+                    print(f"   - {file.stem}")
+            return False
+        
+        document = self.load_metadata_document(entity_name)
+        if document is None:
+            return False
+        
+        created = not document.exists
+        if not document.add_attribute(field_name, attribute):
+            print(f"⚠️  El campo '{field_name}' ya tiene el atributo [{attribute}]")
+            print(f"   Atributos actuales: {document.get_field(field_name).attributes}")
+            return False
+        
+        document.save()
+        
+        print(f"✅ Archivo metadata {'creado' if created else 'actualizado'}: {document.path.name}")
+        print(f"   🎯 Entidad: {entity_name}")
+        print(f"   📝 Campo: {field_name}")
+        print(f"   🏷️  Atributo: [{attribute}]{'' if created else ' (agregado)'}")
+        
+        return True
 
     def parse_field_definitions(self, field_args: List[str]) -> Dict[str, Dict[str, List[str]]]:
         """
@@ -349,16 +279,14 @@ namespace {namespace}
                 print(f"⚠️  Datos incompletos en: {field_arg}")
                 continue
             
-            # Agregar a la estructura
-            if entity_name not in entities_dict:
-                entities_dict[entity_name] = {}
-            
-            entities_dict[entity_name][field_name] = attributes
+            # Agregar a la estructura (repetir entidad:campo acumula atributos)
+            field_attributes = entities_dict.setdefault(entity_name, {}).setdefault(field_name, [])
+            field_attributes.extend(attr for attr in attributes if attr not in field_attributes)
         
         return entities_dict
 
-    def process_multiple_entities(self, entities_dict: Dict[str, Dict[str, List[str]]]) -> bool:
-        """Procesar múltiples entidades con sus campos y atributos"""
+    def process_multiple_entities(self, entities_dict: Dict[str, Dict[str, List[str]]], jobs: Optional[int] = None) -> bool:
+        """Procesar múltiples entidades con sus campos y atributos (entidades en paralelo)"""
         
         if not entities_dict:
             print("❌ ERROR: No se pudieron procesar las entidades")
@@ -386,343 +314,324 @@ namespace {namespace}
             print(f"   Atributos disponibles: {list(self.available_attributes.keys())}")
             return False
         
-        success_count = 0
-        processed_entities = 0
+        # Índice de modelos construido una sola vez y compartido por los hilos
+        self.build_entity_index()
         
-        # Procesar cada entidad
+        # Fase 1 (hilo principal): agrupar por entidad y resolver lo interactivo
+        plans = {}
         for table_name, fields_dict in entities_dict.items():
             entity_name = self.table_name_to_entity_name(table_name)
-            
-            print(f"🏗️  Procesando entidad: {table_name} -> {entity_name}")
-            
-            # Verificar que la entidad existe
-            if not self.entity_exists(entity_name):
-                print(f"   ❌ ERROR: La entidad {entity_name} no existe")
-                continue
-            
-            entity_success_count = 0
-            entity_total = sum(len(attrs) for attrs in fields_dict.values())
-            
-            # Procesar cada campo de la entidad
+            plan = plans.setdefault(entity_name, {"tables": [], "fields": {}})
+            plan["tables"].append(table_name)
             for field_name, attributes in fields_dict.items():
-                print(f"   📝 Campo: {field_name}")
-                
-                for attribute in attributes:
-                    # Manejar FieldPermission de manera especial
-                    if attribute == "FieldPermission":
-                        print(f"      🔐 Configurando FieldPermission interactivamente...")
-                        interactive_result = self.handle_field_permission_interactive(entity_name, field_name)
-                        
-                        if interactive_result:
-                            # Usar el resultado interactivo como atributo
-                            metadata_file = self.get_metadata_file_path(entity_name)
-                            
-                            if metadata_file.exists():
-                                success = self.update_metadata_file_single_custom(entity_name, field_name, interactive_result)
-                            else:
-                                success = self.create_metadata_file_single_custom(entity_name, field_name, interactive_result)
-                            
-                            if success:
-                                success_count += 1
-                                entity_success_count += 1
-                                print(f"         ✅ {field_name}.FieldPermission configurado")
-                            else:
-                                print(f"         ⚠️  {field_name}.FieldPermission no pudo ser configurado")
-                        else:
-                            print(f"         ❌ {field_name}.FieldPermission cancelado")
-                    else:
-                        # Procesar atributos normales
-                        print(f"      🏷️  Agregando [{attribute}]...")
-                        
-                        metadata_file = self.get_metadata_file_path(entity_name)
-                        
-                        if metadata_file.exists():
-                            success = self.update_metadata_file_single(entity_name, field_name, attribute)
-                        else:
-                            success = self.create_metadata_file_single(entity_name, field_name, attribute)
-                        
-                        if success:
-                            success_count += 1
-                            entity_success_count += 1
-                            print(f"         ✅ {field_name}.{attribute} agregado")
-                        else:
-                            print(f"         ⚠️  {field_name}.{attribute} no agregado (ya existe)")
-            
-            print(f"   📊 Entidad completada: {entity_success_count}/{entity_total}")
-            print(f"   📁 Archivo: {self.get_metadata_file_path(entity_name).name}")
-            print()
-            processed_entities += 1
+                field_attributes = plan["fields"].setdefault(field_name, [])
+                field_attributes.extend(attr for attr in attributes if attr not in field_attributes)
         
-        print(f"📊 RESUMEN FINAL:")
-        print(f"   🏗️  Entidades procesadas: {processed_entities}/{len(entities_dict)}")
-        print(f"   ✅ Operaciones exitosas: {success_count}/{total_operations}")
-        print(f"   📁 Archivos modificados: {processed_entities}")
+        for entity_name, plan in plans.items():
+            if self.entity_exists(entity_name):
+                plan["fields"] = self.resolve_interactive_attributes(entity_name, plan["fields"])
         
+        # Fase 2 y 3: entidades en paralelo, reporte en orden de entrada
+        success_count = self.run_entity_plans(plans, jobs, total_operations)
         return success_count > 0
 
-    def create_metadata_file_single(self, entity_name: str, field_name: str, attribute: str) -> bool:
-        """Crea archivo metadata para un solo campo/atributo (sin prints)"""
-        metadata_file = self.get_metadata_file_path(entity_name)
-        
-        if metadata_file.exists():
-            return self.update_metadata_file_single(entity_name, field_name, attribute)
-        
-        # Determinar el namespace basado en la ubicación del archivo
-        entity_file = self.get_entity_file_path(entity_name)
-        namespace = "Shared.Models.Entities"
-        
-        if entity_file.exists():
-            # Leer el archivo de entidad para extraer el namespace
-            entity_content = entity_file.read_text(encoding='utf-8')
-            namespace_match = re.search(r'namespace\s+([\w.]+);', entity_content)
-            if namespace_match:
-                namespace = namespace_match.group(1)
-
-        # Contenido del archivo
-        content = f"""using System;
-using System.ComponentModel.DataAnnotations;
-using {self.attributes_namespace};
-
-namespace {namespace}
-{{
-    [MetadataType(typeof({entity_name}Metadata))]
-    public partial class {entity_name} {{ }}
-
-    public class {entity_name}Metadata
-    {{
-        [{attribute}]
-        public string {field_name};
-    }}
-}}
-"""
-        
-        metadata_file.write_text(content, encoding='utf-8')
-        return True
-
-    def update_metadata_file_single(self, entity_name: str, field_name: str, attribute: str) -> bool:
-        """Actualiza archivo metadata para un solo campo/atributo (sin prints)"""
-        metadata_file = self.get_metadata_file_path(entity_name)
-        
-        # Parse contenido existente
-        existing_data = self.parse_existing_metadata(metadata_file)
-        
-        # Verificar si el campo ya tiene este atributo
-        existing_attributes = existing_data["fields"].get(field_name, [])
-        if attribute in existing_attributes:
-            return False  # Ya existe
-        
-        # Leer contenido actual
-        content = metadata_file.read_text(encoding='utf-8')
-        
-        # Buscar la clase metadata
-        metadata_class_pattern = r'(public\s+class\s+\w+Metadata\s*\{)([^}]*)(^\s*\})'
-        match = re.search(metadata_class_pattern, content, re.MULTILINE | re.DOTALL)
-        
-        if not match:
-            return False
-        
-        class_start = match.group(1)
-        class_content = match.group(2)
-        class_end = match.group(3)
-        
-        # Verificar si el campo ya existe
-        field_pattern = rf'(\[[^\]]+\]\s*)*\s*public\s+\w+\s+{field_name};'
-        field_match = re.search(field_pattern, class_content)
-        
-        if field_match:
-            # Campo existe, agregar atributo
-            existing_field_line = field_match.group(0)
-            new_field_line = f"        [{attribute}]\n        {existing_field_line.strip()}"
-            new_class_content = class_content.replace(existing_field_line, new_field_line)
-        else:
-            # Campo no existe, agregarlo
-            new_field = f"\n        [{attribute}]\n        public string {field_name};\n"
-            new_class_content = class_content + new_field
+    def run_entity_plans(self, plans: Dict[str, Dict], jobs: Optional[int], total_operations: int) -> int:
+        """Aplicar planes {entidad: {"tables", "fields"}} en paralelo y reportar en orden; retorna operaciones exitosas"""
+        # Cada entidad en paralelo (un .Metadata.cs por entidad, independientes entre sí)
+        workers = max(1, min(jobs or DEFAULT_JOBS, len(plans)))
+        print(f"⚙️  Procesando {len(plans)} entidades con {workers} hilo(s)")
+        print()
         
-        # Reconstruir contenido completo
-        new_content = content.replace(match.group(0), class_start + new_class_content + class_end)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda item: self.process_entity(item[0], item[1]["tables"], item[1]["fields"]),
+                plans.items()
+            ))
         
-        # Escribir archivo actualizado
-        metadata_file.write_text(new_content, encoding='utf-8')
-        return True
-
-    def create_metadata_file_single_custom(self, entity_name: str, field_name: str, custom_attribute: str) -> bool:
-        """Crea archivo metadata para un solo campo/atributo con contenido personalizado (sin prints)"""
-        metadata_file = self.get_metadata_file_path(entity_name)
+        # Reportar en el orden de entrada (determinístico)
+        success_count = 0
+        processed_entities = 0
+        written_files = 0
         
-        if metadata_file.exists():
-            return self.update_metadata_file_single_custom(entity_name, field_name, custom_attribute)
+        for result in results:
+            for line in result["log"]:
+                print(line)
+            success_count += result["success"]
+            processed_entities += result["processed"]
+            written_files += result["written"]
         
-        # Determinar el namespace basado en la ubicación del archivo
-        entity_file = self.get_entity_file_path(entity_name)
-        namespace = "Shared.Models.Entities"
+        print(f"📊 RESUMEN FINAL:")
+        print(f"   🏗️  Entidades procesadas: {processed_entities}/{len(plans)}")
+        print(f"   ✅ Operaciones exitosas: {success_count}/{total_operations}")
+        print(f"   📁 Archivos modificados: {written_files}")
         
-        if entity_file.exists():
-            # Leer el archivo de entidad para extraer el namespace
-            entity_content = entity_file.read_text(encoding='utf-8')
-            namespace_match = re.search(r'namespace\s+([\w.]+);', entity_content)
-            if namespace_match:
-                namespace = namespace_match.group(1)
+        return success_count
 
-        # Contenido del archivo
-        content = f"""using System;
-using System.ComponentModel.DataAnnotations;
-using {self.attributes_namespace};
-
-namespace {namespace}
-{{
-    [MetadataType(typeof({entity_name}Metadata))]
-    public partial class {entity_name} {{ }}
-
-    public class {entity_name}Metadata
-    {{
-        [{custom_attribute}]
-        public string {field_name};
-    }}
-}}
-"""
+    def resolve_interactive_attributes(self, entity_name: str, fields_dict: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """Convertir cada atributo en (atributo, texto final); FieldPermission se configura interactivamente (None = cancelado)"""
+        resolved = {}
+        
+        for field_name, attributes in fields_dict.items():
+            resolved[field_name] = []
+            for attribute in attributes:
+                if attribute == "FieldPermission":
+                    print(f"🔐 Configurando FieldPermission interactivamente: {entity_name}.{field_name}")
+                    resolved[field_name].append(
+                        (attribute, self.handle_field_permission_interactive(entity_name, field_name))
+                    )
+                else:
+                    resolved[field_name].append((attribute, attribute))
         
-        metadata_file.write_text(content, encoding='utf-8')
-        return True
+        return resolved
 
-    def update_metadata_file_single_custom(self, entity_name: str, field_name: str, custom_attribute: str) -> bool:
-        """Actualiza archivo metadata para un solo campo/atributo con contenido personalizado (sin prints)"""
-        metadata_file = self.get_metadata_file_path(entity_name)
+    def process_entity(self, entity_name: str, table_names: List[str], fields_plan: Dict[str, list]) -> Dict:
+        """Procesar una entidad (seguro para hilos): una lectura y una escritura de su .Metadata.cs"""
+        log = [f"🏗️  Procesando entidad: {', '.join(table_names)} -> {entity_name}"]
+        result = {"log": log, "success": 0, "processed": 0, "written": 0}
         
-        # Leer contenido actual
-        content = metadata_file.read_text(encoding='utf-8')
+        # Verificar que la entidad existe
+        if not self.entity_exists(entity_name):
+            log.append(f"   ❌ ERROR: La entidad {entity_name} no existe")
+            log.append("")
+            return result
         
-        # Buscar la clase metadata
-        metadata_class_pattern = r'(public\s+class\s+\w+Metadata\s*\{)([^}]*)(^\s*\})'
-        match = re.search(metadata_class_pattern, content, re.MULTILINE | re.DOTALL)
+        try:
+            document = self.load_metadata_document(entity_name, log)
+            if document is None:
+                log.append("")
+                return result
+            
+            entity_total = sum(len(attrs) for attrs in fields_plan.values())
+            result["success"] = self.apply_field_attributes(document, fields_plan, log)
+            
+            # Serializar una sola vez con todos los cambios de la entidad
+            result["written"] = int(document.save())
+        except Exception as e:
+            log.append(f"   ❌ ERROR procesando {entity_name}: {e}")
+            log.append("")
+            return result
+        
+        log.append(f"   📊 Entidad completada: {result['success']}/{entity_total}")
+        log.append(f"   📁 Archivo: {document.path.name}")
+        log.append("")
+        result["processed"] = 1
+        return result
+
+    def apply_field_attributes(self, document: MetadataDocument, fields_plan: Dict[str, list], log: List[str]) -> int:
+        """Aplicar en memoria los atributos de cada campo sobre el documento; retorna operaciones exitosas"""
+        success_count = 0
         
-        if not match:
-            return False
+        for field_name, attributes in fields_plan.items():
+            log.append(f"   📝 Campo: {field_name}")
+            
+            for attribute, value in attributes:
+                # FieldPermission ya viene resuelto desde la configuración interactiva
+                if attribute == "FieldPermission":
+                    if not value:
+                        log.append(f"         ❌ {field_name}.FieldPermission cancelado")
+                    elif document.set_attribute(field_name, value):
+                        success_count += 1
+                        log.append(f"         ✅ {field_name}.FieldPermission configurado")
+                    else:
+                        log.append(f"         ⚠️  {field_name}.FieldPermission no pudo ser configurado (sin cambios)")
+                else:
+                    # Procesar atributos normales
+                    log.append(f"      🏷️  Agregando [{attribute}]...")
+                    
+                    if document.add_attribute(field_name, value):
+                        success_count += 1
+                        log.append(f"         ✅ {field_name}.{attribute} agregado")
+                    else:
+                        log.append(f"         ⚠️  {field_name}.{attribute} no agregado (ya existe)")
         
-        class_start = match.group(1)
-        class_content = match.group(2)
-        class_end = match.group(3)
+        return success_count
+    
+    def _relative_path(self, path: Optional[Path]) -> Optional[str]:
+        """Ruta relativa a la raíz del proyecto (para el inventario JSON)"""
+        if path is None:
+            return None
+        return path.relative_to(self.root_path).as_posix() if path.is_relative_to(self.root_path) else str(path)
+    
+    def build_inventory(self) -> Dict:
+        """Inventario de una sola pasada: entidad -> metadata, campos, atributos y conteos"""
+        entity_files = {}
+        metadata_files = {}
+        
+        # Un único recorrido del árbol (la raíz tiene prioridad sobre subcarpetas)
+        if self.entities_path.exists():
+            for cs_file in sorted(self.entities_path.rglob("*.cs"), key=lambda p: (len(p.parts), str(p))):
+                if cs_file.name.endswith(".Metadata.cs"):
+                    metadata_files[cs_file] = cs_file.name[:-len(".Metadata.cs")]
+                else:
+                    entity_files.setdefault(cs_file.stem, cs_file)
+        self._entity_index = entity_files
         
-        # Buscar si el campo ya existe con FieldPermission
-        field_pattern = rf'(\[FieldPermission[^\]]*\]\s*)*\s*public\s+\w+\s+{field_name};'
-        field_match = re.search(field_pattern, class_content)
+        entities = []
+        missing_metadata = []
+        attribute_counts = {}
         
-        if field_match:
-            # Campo existe con FieldPermission, reemplazarlo
-            existing_field_line = field_match.group(0)
-            new_field_line = f"        [{custom_attribute}]\n        public string {field_name};"
-            new_class_content = class_content.replace(existing_field_line, new_field_line)
-        else:
-            # Verificar si el campo existe sin FieldPermission
-            simple_field_pattern = rf'(\[[^\]]+\]\s*)*\s*public\s+\w+\s+{field_name};'
-            simple_field_match = re.search(simple_field_pattern, class_content)
+        for entity_name in sorted(entity_files):
+            entity_file = entity_files[entity_name]
+            metadata_file = entity_file.parent / f"{entity_name}.Metadata.cs"
+            fields = {}
             
-            if simple_field_match:
-                # Campo existe sin FieldPermission, agregar el atributo
-                existing_field_line = simple_field_match.group(0)
-                new_field_line = f"        [{custom_attribute}]\n        {existing_field_line.strip()}"
-                new_class_content = class_content.replace(existing_field_line, new_field_line)
+            if metadata_file in metadata_files:
+                del metadata_files[metadata_file]
+                document = MetadataDocument.load(metadata_file, entity_name)
+                fields = document.field_attributes() if document else {}
+                for attributes in fields.values():
+                    for attribute in attributes:
+                        name = attribute_name(attribute)
+                        attribute_counts[name] = attribute_counts.get(name, 0) + 1
             else:
-                # Campo no existe, agregarlo
-                new_field = f"\n        [{custom_attribute}]\n        public string {field_name};\n"
-                new_class_content = class_content + new_field
-        
-        # Reconstruir contenido completo
-        new_content = content.replace(match.group(0), class_start + new_class_content + class_end)
+                metadata_file = None
+                missing_metadata.append(entity_name)
+            
+            entities.append({
+                "name": entity_name,
+                "file": self._relative_path(entity_file),
+                "metadata_file": self._relative_path(metadata_file),
+                "fields": fields
+            })
         
-        # Escribir archivo actualizado
-        metadata_file.write_text(new_content, encoding='utf-8')
-        return True
+        return {
+            "entities_path": self._relative_path(self.entities_path),
+            "total_entities": len(entities),
+            "with_metadata": len(entities) - len(missing_metadata),
+            "attribute_counts": dict(sorted(attribute_counts.items())),
+            "missing_metadata": missing_metadata,
+            # .Metadata.cs cuya entidad no existe (o está en otra carpeta)
+            "orphan_metadata": sorted(self._relative_path(path) for path in metadata_files),
+            "entities": entities
+        }
     
-    def list_entities(self):
-        """Lista todas las entidades disponibles"""
+    def list_entities(self, as_json: bool = False) -> Dict:
+        """Lista todas las entidades disponibles (o el inventario completo en JSON)"""
+        inventory = self.build_inventory()
+        
+        if as_json:
+            print(json.dumps(inventory, indent=2, ensure_ascii=False))
+            return inventory
+        
         print("📋 ENTIDADES DISPONIBLES:")
         print("-" * 40)
         
         if not self.entities_path.exists():
             print("❌ No se encontró el directorio Shared.Models/Entities/")
-            return
-        
-        entity_files = []
-        # Buscar en directorio raíz
-        for file in self.entities_path.glob("*.cs"):
-            if not file.name.endswith(".Metadata.cs"):
-                entity_files.append(file.stem)
+            return inventory
         
-        # Buscar en subdirectorios
-        for subdirectory in self.entities_path.iterdir():
-            if subdirectory.is_dir():
-                for file in subdirectory.glob("*.cs"):
-                    if not file.name.endswith(".Metadata.cs"):
-                        entity_files.append(file.stem)
-        
-        if not entity_files:
+        if not inventory["entities"]:
             print("❌ No se encontraron entidades")
-            return
-        
-        for entity in sorted(entity_files):
-            metadata_file = self.get_metadata_file_path(entity)
-            has_metadata = "✅" if metadata_file.exists() else "⭕"
-            print(f"   {has_metadata} {entity}")
-        
-        print(f"\n📊 Total: {len(entity_files)} entidades")
+            return inventory
+        
+        for entity in inventory["entities"]:
+            has_metadata = "✅" if entity["metadata_file"] else "⭕"
+            print(f"   {has_metadata} {entity['name']}")
+        
+        print(f"\n📊 Total: {inventory['total_entities']} entidades")
+        if inventory["attribute_counts"]:
+            counts = ", ".join(f"{name}: {count}" for name, count in inventory["attribute_counts"].items())
+            print(f"🏷️  Atributos: {counts}")
+        if inventory["orphan_metadata"]:
+            print(f"⚠️  Metadata sin entidad: {', '.join(inventory['orphan_metadata'])}")
         print("✅ = Tiene archivo .Metadata.cs")
         print("⭕ = Sin archivo .Metadata.cs")
+        return inventory
+
+    @property
+    def connection_string(self) -> Optional[str]:
+        if self._connection_string is None:
+            self._connection_string = self.get_connection_string()
+        return self._connection_string
 
     def get_connection_string(self) -> Optional[str]:
-        """Obtiene connection string desde launchSettings.json"""
-        try:
-            launch_settings_path = self.root_path / "Backend" / "Properties" / "launchSettings.json"
-            if not launch_settings_path.exists():
-                return None
-                
-            with open(launch_settings_path, 'r') as f:
-                launch_settings = json.load(f)
-            
-            # Buscar en el perfil https
-            https_profile = launch_settings.get("profiles", {}).get("https", {})
-            env_vars = https_profile.get("environmentVariables", {})
-            sql_connection = env_vars.get("SQL")
-            
-            return sql_connection
-        except Exception as ex:
-            print(f"⚠️  No se pudo obtener connection string: {ex}")
+        """Obtiene la connection string ODBC desde launchSettings.json (módulo compartido)"""
+        settings = load_connection_settings(self.root_path / "Backend")
+        return settings.odbc() if settings else None
+
+    def connect(self):
+        """Conexión pyodbc (None si no hay driver o connection string)"""
+        if not PYODBC_AVAILABLE or not self.connection_string:
+            print("⚠️  pyodbc no disponible o sin connection string")
             return None
+        return pyodbc.connect(self.connection_string, autocommit=False)
+
+    def fetch_existing_permissions(self, cursor, action_keys: List[str]) -> set:
+        """ActionKeys que ya existen en system_permissions (una consulta por bloque de 1000)"""
+        existing = set()
+        keys = list(dict.fromkeys(action_keys))
+        for start in range(0, len(keys), PERMISSION_QUERY_CHUNK):
+            chunk = keys[start:start + PERMISSION_QUERY_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"SELECT ActionKey FROM system_permissions WHERE ActionKey IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    def insert_permissions(self, cursor, records: List[Tuple[str, str, str, str]]):
+        """Insertar permisos (nombre, descripción, action_key, grupo) en un solo lote; el commit lo hace el llamador"""
+        if not records:
+            return
+        cursor.fast_executemany = True
+        cursor.executemany("""
+            INSERT INTO system_permissions (Nombre, Descripcion, ActionKey, GroupKey, GrupoNombre, Active, FechaCreacion, FechaModificacion)
+            VALUES (?, ?, ?, ?, ?, 1, GETUTCDATE(), GETUTCDATE())
+        """, [(nombre, descripcion, action_key, grupo, grupo) for nombre, descripcion, action_key, grupo in records])
 
     def check_permission_exists(self, action_key: str) -> bool:
         """Verifica si un permiso existe en la base de datos"""
-        if not PYODBC_AVAILABLE or not self.connection_string:
-            return False
-            
         try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM system_permissions WHERE ActionKey = ?", (action_key,))
-                count = cursor.fetchone()[0]
-                return count > 0
+            conn = self.connect()
+            if conn is None:
+                return False
+            with conn:
+                return action_key in self.fetch_existing_permissions(conn.cursor(), [action_key])
         except Exception as ex:
             print(f"⚠️  Error verificando permiso {action_key}: {ex}")
             return False
 
     def create_permission_in_db(self, action_key: str, nombre: str, grupo: str, descripcion: str) -> bool:
         """Crea un permiso en la base de datos"""
-        if not PYODBC_AVAILABLE or not self.connection_string:
-            print("⚠️  pyodbc no disponible o sin connection string")
-            return False
-            
         try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO system_permissions (Nombre, Descripcion, ActionKey, GroupKey, GrupoNombre, Active, FechaCreacion, FechaModificacion)
-                    VALUES (?, ?, ?, ?, ?, 1, GETUTCDATE(), GETUTCDATE())
-                """, (nombre, descripcion, action_key, grupo, grupo))
+            conn = self.connect()
+            if conn is None:
+                return False
+            with conn:
+                self.insert_permissions(conn.cursor(), [(nombre, descripcion, action_key, grupo)])
                 conn.commit()
                 return True
         except Exception as ex:
             print(f"❌ Error creando permiso {action_key}: {ex}")
             return False
 
+    def field_permission_keys(self, entity_name: str, field_name: str) -> Dict[str, str]:
+        """ActionKeys sugeridas por tipo de permiso para un campo"""
+        entity_upper = entity_name.upper()
+        field_upper = field_name.upper()
+        
+        return {
+            "CREATE": f"{entity_upper}.{field_upper}.CREATE",
+            "UPDATE": f"{entity_upper}.{field_upper}.EDIT",
+            "VIEW": f"{entity_upper}.{field_upper}.VIEW"
+        }
+
+    def field_permission_record(self, entity_name: str, field_name: str, perm_type: str, action_key: str) -> Tuple[str, str, str, str]:
+        """(nombre, descripción, action_key, grupo) de un permiso de campo"""
+        # Generar nombres descriptivos
+        action_names = {
+            "CREATE": f"Crear {field_name} en {entity_name}",
+            "UPDATE": f"Modificar {field_name} en {entity_name}",
+            "VIEW": f"Ver {field_name} en {entity_name}"
+        }
+        
+        nombre = action_names.get(perm_type, f"{perm_type} {field_name}")
+        descripcion = f"Permiso para {perm_type.lower()} el campo {field_name} de la entidad {entity_name}"
+        return nombre, descripcion, action_key, entity_name.upper()
+
+    def field_permission_attribute(self, permissions: Dict[str, str]) -> str:
+        """FieldPermission(CREATE="...", UPDATE="...", VIEW="...") en orden fijo"""
+        parts = [f'{perm_type}="{permissions[perm_type]}"' for perm_type in FIELD_PERMISSION_TYPES if perm_type in permissions]
+        return f"FieldPermission({', '.join(parts)})"
+
     def handle_field_permission_interactive(self, entity_name: str, field_name: str) -> Optional[str]:
         """Maneja FieldPermission de manera interactiva"""
         
@@ -732,14 +641,7 @@ namespace {namespace}
         print("-" * 50)
         
         # Generar nombres de permisos sugeridos
-        entity_upper = entity_name.upper()
-        field_upper = field_name.upper()
-        
-        permission_suggestions = {
-            "CREATE": f"{entity_upper}.{field_upper}.CREATE",
-            "UPDATE": f"{entity_upper}.{field_upper}.EDIT", 
-            "VIEW": f"{entity_upper}.{field_upper}.VIEW"
-        }
+        permission_suggestions = self.field_permission_keys(entity_name, field_name)
         
         print("🎯 Selecciona qué permisos aplicar (puedes elegir múltiples):")
         print("   1. CREATE - Controla creación de registros con este campo")
@@ -782,56 +684,61 @@ namespace {namespace}
         for perm_type, action_key in selected_permissions.items():
             print(f"   {perm_type}: {action_key}")
         
-        # Verificar cuáles existen en BD
+        # Verificar cuáles existen en BD (una sola consulta)
         existing_permissions = {}
         missing_permissions = {}
         
         print(f"\n🔍 Verificando permisos en base de datos...")
         
+        try:
+            conn = self.connect()
+        except Exception as ex:
+            print(f"⚠️  Error conectando a la base de datos: {ex}")
+            conn = None
+        
+        existing_keys = set()
+        if conn is not None:
+            try:
+                existing_keys = self.fetch_existing_permissions(conn.cursor(), list(selected_permissions.values()))
+            except Exception as ex:
+                print(f"⚠️  Error verificando permisos: {ex}")
+        
         for perm_type, action_key in selected_permissions.items():
-            if self.check_permission_exists(action_key):
+            if action_key in existing_keys:
                 existing_permissions[perm_type] = action_key
                 print(f"   ✅ {action_key} existe")
             else:
                 missing_permissions[perm_type] = action_key
                 print(f"   ❌ {action_key} NO existe")
         
-        # Crear permisos faltantes si el usuario lo desea
-        if missing_permissions:
+        # Crear permisos faltantes si el usuario lo desea (un solo lote)
+        if missing_permissions and conn is not None:
             print(f"\n🔨 Se encontraron {len(missing_permissions)} permisos faltantes.")
             create_choice = input("¿Deseas crearlos automáticamente? (s/N): ").strip().lower()
             
             if create_choice in ['s', 'si', 'sí', 'y', 'yes']:
-                grupo_name = entity_name.upper()
-                
-                for perm_type, action_key in missing_permissions.items():
-                    # Generar nombres descriptivos
-                    action_names = {
-                        "CREATE": f"Crear {field_name} en {entity_name}",
-                        "UPDATE": f"Modificar {field_name} en {entity_name}",
-                        "VIEW": f"Ver {field_name} en {entity_name}"
-                    }
-                    
-                    nombre = action_names.get(perm_type, f"{perm_type} {field_name}")
-                    descripcion = f"Permiso para {perm_type.lower()} el campo {field_name} de la entidad {entity_name}"
-                    
-                    print(f"   🔨 Creando {action_key}...")
-                    if self.create_permission_in_db(action_key, nombre, grupo_name, descripcion):
-                        print(f"   ✅ {action_key} creado exitosamente")
-                        existing_permissions[perm_type] = action_key
-                    else:
-                        print(f"   ❌ Error creando {action_key}")
+                records = [
+                    self.field_permission_record(entity_name, field_name, perm_type, action_key)
+                    for perm_type, action_key in missing_permissions.items()
+                ]
+                try:
+                    print(f"   🔨 Creando {', '.join(missing_permissions.values())}...")
+                    self.insert_permissions(conn.cursor(), records)
+                    conn.commit()
+                    existing_permissions.update(missing_permissions)
+                    print(f"   ✅ {len(records)} permisos creados exitosamente")
+                except Exception as ex:
+                    conn.rollback()
+                    print(f"   ❌ Error creando permisos: {ex}")
             else:
                 print("⚠️  Los permisos faltantes NO fueron creados")
         
+        if conn is not None:
+            conn.close()
+        
         # Generar atributo FieldPermission
         if existing_permissions:
-            parts = []
-            for perm_type in ["CREATE", "UPDATE", "VIEW"]:
-                if perm_type in existing_permissions:
-                    parts.append(f'{perm_type}="{existing_permissions[perm_type]}"')
-            
-            attribute_content = f"FieldPermission({', '.join(parts)})"
+            attribute_content = self.field_permission_attribute(existing_permissions)
             
             print(f"\n✅ Atributo generado:")
             print(f"   [{attribute_content}]")
@@ -841,6 +748,145 @@ namespace {namespace}
             print("❌ No se pudieron configurar los permisos")
             return None
 
+    def parse_field_permission_spec(self, spec_file: Path) -> Optional[List[Tuple[str, str, List[str]]]]:
+        """
+        Leer un archivo de especificación de FieldPermission
+        
+        Formato texto (una fila por campo, # para comentarios):
+            empleado:SueldoBase:CREATE|UPDATE|VIEW
+            empleado:Rut:VIEW
+            categoria:Nombre:ALL
+        
+        Formato JSON:
+            [{"entity": "empleado", "field": "SueldoBase", "permissions": ["CREATE", "VIEW"]}]
+        """
+        if not spec_file.exists():
+            print(f"❌ ERROR: No se encontró el archivo de especificación {spec_file}")
+            return None
+        
+        raw_rows = []
+        content = spec_file.read_text(encoding='utf-8-sig')
+        
+        if spec_file.suffix.lower() == '.json':
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError as e:
+                print(f"❌ ERROR: El archivo de especificación no es JSON válido: {e}")
+                return None
+            for number, row in enumerate(data if isinstance(data, list) else data.get("fields", []), 1):
+                permissions = row.get("permissions", "ALL")
+                if isinstance(permissions, str):
+                    permissions = permissions.split('|')
+                raw_rows.append((number, row.get("entity", ""), row.get("field", ""), permissions))
+        else:
+            for number, line in enumerate(content.splitlines(), 1):
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                parts = [part.strip() for part in line.split(':')]
+                if len(parts) != 3:
+                    print(f"⚠️  Línea {number} inválida: {line}")
+                    print("💡 Formato esperado: entidad:campo:CREATE|UPDATE|VIEW")
+                    continue
+                raw_rows.append((number, parts[0], parts[1], parts[2].split('|')))
+        
+        rows = []
+        for number, table_name, field_name, permissions in raw_rows:
+            perm_types = [perm.strip().upper() for perm in permissions if perm.strip()]
+            if "ALL" in perm_types:
+                perm_types = list(FIELD_PERMISSION_TYPES)
+            invalid = [perm for perm in perm_types if perm not in FIELD_PERMISSION_TYPES]
+            if not table_name or not field_name or not perm_types or invalid:
+                print(f"⚠️  Fila {number} inválida: {table_name}:{field_name}:{'|'.join(permissions)}")
+                continue
+            rows.append((table_name.strip(), field_name.strip(), perm_types))
+        
+        return rows
+
+    def provision_field_permissions(self, spec_file: Path, jobs: Optional[int] = None, skip_db: bool = False) -> bool:
+        """
+        Aprovisionar FieldPermission sin interacción desde un archivo de especificación:
+        una consulta de existencia, una transacción de inserción y una escritura por .Metadata.cs
+        """
+        rows = self.parse_field_permission_spec(spec_file)
+        if not rows:
+            print("❌ ERROR: La especificación no contiene filas válidas")
+            return False
+        
+        self.build_entity_index()
+        
+        # Resolver ActionKeys por entidad/campo
+        plans = {}
+        records = {}                # action_key -> registro de system_permissions
+        for table_name, field_name, perm_types in rows:
+            entity_name = self.table_name_to_entity_name(table_name)
+            if not self.entity_exists(entity_name):
+                print(f"⚠️  La entidad {entity_name} no existe (se omite {table_name}:{field_name})")
+                continue
+            
+            suggestions = self.field_permission_keys(entity_name, field_name)
+            plan = plans.setdefault(entity_name, {"tables": [], "fields": {}, "permissions": {}})
+            if table_name not in plan["tables"]:
+                plan["tables"].append(table_name)
+            field_permissions = plan["permissions"].setdefault(field_name, {})
+            for perm_type in perm_types:
+                action_key = suggestions[perm_type]
+                field_permissions[perm_type] = action_key
+                records[action_key] = self.field_permission_record(entity_name, field_name, perm_type, action_key)
+        
+        if not plans:
+            print("❌ ERROR: Ninguna entidad de la especificación existe")
+            return False
+        
+        print(f"🔐 Aprovisionando FieldPermission desde {spec_file.name}")
+        print(f"   🏗️  Entidades: {len(plans)}")
+        print(f"   📝 Campos: {sum(len(plan['permissions']) for plan in plans.values())}")
+        print(f"   🔑 ActionKeys: {len(records)}")
+        print()
+        
+        # Base de datos: una consulta de existencia + un lote de inserción en una transacción
+        if skip_db:
+            print("⏭️  Base de datos omitida (--skip-db): solo se escriben los atributos")
+        else:
+            try:
+                conn = self.connect()
+                if conn is None:
+                    print("❌ ERROR: No se pudo conectar (usa --skip-db para escribir solo los atributos)")
+                    return False
+                
+                try:
+                    cursor = conn.cursor()
+                    existing = self.fetch_existing_permissions(cursor, list(records))
+                    missing = [records[key] for key in records if key not in existing]
+                    print(f"🔍 Permisos existentes: {len(existing)}, faltantes: {len(missing)}")
+                    
+                    self.insert_permissions(cursor, missing)
+                    conn.commit()
+                    if missing:
+                        print(f"✅ {len(missing)} permisos creados en una transacción")
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+            except Exception as ex:
+                print(f"❌ Error aprovisionando permisos (sin cambios en BD ni metadata): {ex}")
+                return False
+        print()
+        
+        # Metadata: un atributo FieldPermission por campo, una escritura por archivo
+        for plan in plans.values():
+            plan["fields"] = {
+                field_name: [("FieldPermission", self.field_permission_attribute(permissions))]
+                for field_name, permissions in plan.pop("permissions").items()
+            }
+        
+        total_operations = sum(len(plan["fields"]) for plan in plans.values())
+        self.run_entity_plans(plans, jobs, total_operations)
+        
+        # Sin cambios también es un resultado correcto (re-ejecución idempotente)
+        return True
+
 def main():
     parser = argparse.ArgumentParser(
         description="🎯 Custom Validator Tool - Entity Metadata Manager",
@@ -861,6 +907,12 @@ Ejemplos de uso:
   
   # Listar entidades disponibles
   python customvalidator.py --list
+  
+  # Inventario completo en JSON (para CI)
+  python customvalidator.py --list --json
+  
+  # FieldPermission sin interacción desde un archivo de especificación
+  python customvalidator.py --field-permissions permisos.txt
 
 Formato de argumentos:
   entidad:campo:atributo1|atributo2 [entidad2:campo2:atributo3]
@@ -881,16 +933,37 @@ Atributos disponibles:
     parser.add_argument("field_definitions", nargs='*', 
                        help="Definiciones de campos en formato tabla:campo:atributo1|atributo2")
     parser.add_argument("--list", action="store_true", help="Listar entidades disponibles")
+    parser.add_argument("--json", action="store_true",
+                       help="Con --list: inventario completo en JSON (entidades, campos, atributos, metadata faltante)")
+    parser.add_argument("--field-permissions", metavar="SPEC",
+                       help="Aprovisionar FieldPermission sin interacción desde un archivo (texto entidad:campo:CREATE|UPDATE|VIEW o JSON)")
+    parser.add_argument("--skip-db", action="store_true",
+                       help="Con --field-permissions: no crear permisos en BD, solo escribir atributos")
+    parser.add_argument("--jobs", type=int, default=None,
+                       help=f"Entidades a procesar en paralelo (default: {DEFAULT_JOBS})")
     
     args = parser.parse_args()
     
     manager = EntityMetadataManager()
+    
+    if args.list and args.json:
+        # Salida limpia para CI: solo el JSON en stdout
+        manager.list_entities(as_json=True)
+        return
+    
     manager.print_header()
     
     if args.list:
         manager.list_entities()
         return
     
+    if args.field_permissions:
+        success = manager.provision_field_permissions(Path(args.field_permissions), jobs=args.jobs, skip_db=args.skip_db)
+        if not success:
+            sys.exit(1)
+        print("\n🎉 ¡FieldPermission aprovisionado!")
+        return
+    
     if not args.field_definitions:
         print("❌ ERROR: Se requieren definiciones de campos")
         print("\n💡 Formato: python customvalidator.py entidad:campo:atributo [entidad2:campo2:atributo2]")
@@ -907,7 +980,7 @@ Atributos disponibles:
         print("❌ ERROR: No se pudieron procesar las definiciones de campos")
         sys.exit(1)
     
-    success = manager.process_multiple_entities(entities_dict)
+    success = manager.process_multiple_entities(entities_dict, jobs=args.jobs)
     
     if success:
         print("\n🎉 ¡Operación completada exitosamente!")
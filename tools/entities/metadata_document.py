@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+📄 Metadata Document
+Modelo en memoria de un archivo .Metadata.cs
+
+El archivo se parsea una sola vez en campos y atributos; las operaciones
+(agregar o reemplazar atributos) se aplican en memoria y el documento se
+serializa con una única escritura al final, solo si algo cambió.
+
+Formato esperado (el que genera customvalidator):
+
+    public class CategoriaMetadata
+    {
+        [SoloCrear]
+        [Auditar]
+        public string Nombre;
+    }
+
+Lo que no se reconozca dentro de la clase Metadata (comentarios, miembros
+escritos a mano) se conserva tal cual: cada miembro completo, hasta su llave
+de cierre o su ';', se vuelve a escribir byte a byte.
+
+Verificación de ida y vuelta (parse + render sin cambios):
+    python tools/entities/metadata_document.py [archivo.Metadata.cs ...]
+"""
+
+import re
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_INDENT = "        "
+
+_CLASS_PATTERN = re.compile(r'public\s+(?:partial\s+)?class\s+(\w+)Metadata\b[^{]*\{')
+_MEMBER_PATTERN = re.compile(r'public\s+[^;{=\[\]]+?\s+(\w+)\s*(?:;|\{[^}]*\})')
+_NAMESPACE_PATTERN = re.compile(r'namespace\s+([\w.]+)\s*[;{]')
+
+
+def attribute_name(attribute: str) -> str:
+    """Nombre de un atributo sin argumentos ni sufijo 'Attribute' (FieldPermission(...) -> FieldPermission)"""
+    name = attribute.split('(', 1)[0].strip()
+    if name.endswith('Attribute') and name != 'Attribute':
+        name = name[:-len('Attribute')]
+    return name
+
+
+def _find_closing(text: str, start: int, open_char: str, close_char: str) -> int:
+    """Índice del cierre que corresponde a la apertura en text[start] (ignora strings y comentarios)"""
+    depth = 0
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            i += 1
+            while i < length and text[i] != '"':
+                i += 2 if text[i] == '\\' else 1
+        elif text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = length if newline == -1 else newline
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        elif char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _member_end(text: str, start: int) -> int:
+    """Fin de un miembro no reconocido: tras su ';' o la llave que cierra su cuerpo (ignora strings y comentarios)"""
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            i += 1
+            while i < length and text[i] != '"':
+                i += 2 if text[i] == '\\' else 1
+        elif text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = length if newline == -1 else newline
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        elif char == ';':
+            return i + 1
+        elif char == '{':
+            close = _find_closing(text, i, '{', '}')
+            if close == -1:
+                return length
+            # Inicializadores (= new() { ... };, lambdas): el miembro sigue hasta su ';'
+            following = re.compile(r'\s*').match(text, close + 1).end()
+            if following < length and text[following] in ';=':
+                i = close + 1
+                continue
+            return close + 1
+        i += 1
+    return length
+
+
+def _split_attribute_list(inner: str) -> List[str]:
+    """'A, B(x, "y")' -> ['A', 'B(x, "y")']"""
+    attributes, depth, current, in_string = [], 0, [], False
+    for char in inner:
+        if char == '"':
+            in_string = not in_string
+        elif not in_string:
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                attributes.append(''.join(current).strip())
+                current = []
+                continue
+        current.append(char)
+    if ''.join(current).strip():
+        attributes.append(''.join(current).strip())
+    return attributes
+
+
+def _blank_lines(text: str, start: int, end: int) -> int:
+    """Líneas en blanco entre dos elementos del cuerpo"""
+    return max(text.count('\n', start, end) - 1, 0)
+
+
+class RawBlock(str):
+    """Miembro, comentario o directiva sin reconocer: texto literal con su indentación"""
+
+    blank_lines = None              # líneas en blanco antes del bloque (None: las de un campo nuevo)
+
+
+class MetadataField:
+    """Campo de la clase Metadata con sus atributos"""
+
+    __slots__ = ('name', 'declaration', 'attributes', 'comments', 'blank_lines')
+
+    def __init__(self, name: str, declaration: Optional[str] = None,
+                 attributes: Optional[List[str]] = None, comments: Optional[List[str]] = None,
+                 blank_lines: Optional[int] = None):
+        self.name = name
+        self.declaration = declaration or f"public string {name};"
+        self.attributes = attributes or []
+        self.comments = comments or []
+        self.blank_lines = blank_lines
+
+    def attribute_names(self) -> List[str]:
+        return [attribute_name(attribute) for attribute in self.attributes]
+
+    def find_attribute(self, name: str) -> int:
+        names = self.attribute_names()
+        return names.index(name) if name in names else -1
+
+
+class MetadataDocument:
+    """Archivo .Metadata.cs parseado: cabecera + campos de la clase Metadata + cierre"""
+
+    def __init__(self, path: Path, entity_name: str, header: str, footer: str,
+                 items: list, indent: str = DEFAULT_INDENT, original: Optional[str] = None,
+                 trailing_blank_lines: int = 0):
+        self.path = Path(path)
+        self.entity_name = entity_name
+        self.header = header
+        self.footer = footer
+        self.items = items              # MetadataField o RawBlock
+        self.indent = indent
+        self.trailing_blank_lines = trailing_blank_lines
+        self.original = original        # None si el archivo aún no existe
+        self.changed = original is None
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def new(cls, path: Path, entity_name: str, namespace: str, attributes_namespace: str) -> 'MetadataDocument':
+        """Documento vacío para una entidad sin .Metadata.cs"""
+        header = f"""using System;
+using System.ComponentModel.DataAnnotations;
+using {attributes_namespace};
+
+namespace {namespace}
+{{
+    [MetadataType(typeof({entity_name}Metadata))]
+    public partial class {entity_name} {{ }}
+
+    public class {entity_name}Metadata
+    {{"""
+        footer = "    }\n}\n"
+        return cls(path, entity_name, header, footer, [])
+
+    @classmethod
+    def load(cls, path: Path, entity_name: Optional[str] = None) -> Optional['MetadataDocument']:
+        """Leer y parsear un .Metadata.cs existente (una lectura); None si no tiene clase Metadata"""
+        path = Path(path)
+        return cls.parse(path.read_text(encoding='utf-8'), path, entity_name)
+
+    @classmethod
+    def parse(cls, content: str, path: Path, entity_name: Optional[str] = None) -> Optional['MetadataDocument']:
+        class_match = _CLASS_PATTERN.search(content)
+        if not class_match:
+            return None
+
+        open_index = class_match.end() - 1
+        close_index = _find_closing(content, open_index, '{', '}')
+        if close_index == -1:
+            return None
+
+        # El cierre conserva la indentación de su línea
+        footer_start = content.rfind('\n', open_index, close_index) + 1 or close_index
+        if content[footer_start:close_index].strip():
+            footer_start = close_index
+
+        body = content[open_index + 1:footer_start]
+        items, indent, trailing_blank_lines = cls._parse_body(body)
+
+        return cls(
+            path, entity_name or class_match.group(1),
+            content[:open_index + 1], content[footer_start:],
+            items, indent, original=content, trailing_blank_lines=trailing_blank_lines
+        )
+
+    @staticmethod
+    def _parse_body(body: str):
+        """Separar el cuerpo de la clase en campos (con atributos y comentarios) y bloques literales"""
+        items = []
+        indent = None
+        pending_attributes, pending_comments = [], []
+        pending_start = None            # inicio (con indentación) de lo pendiente
+        item_end = 0                    # fin del último elemento: mide las líneas en blanco
+        position, length = 0, len(body)
+
+        def raw_block(start, end):
+            block = RawBlock(body[start:end].rstrip())
+            block.blank_lines = _blank_lines(body, item_end, start)
+            return block
+
+        while position < length:
+            # Saltar espacios, recordando la indentación de la línea actual
+            match = re.compile(r'\s*').match(body, position)
+            line_start = max(body.rfind('\n', 0, match.end()) + 1, position)
+            position = match.end()
+            if position >= length:
+                break
+            if pending_start is None:
+                pending_start = line_start
+
+            if body.startswith('//', position):
+                end = body.find('\n', position)
+                end = length if end == -1 else end
+                pending_comments.append(body[position:end].rstrip())
+                position = end
+            elif body.startswith('/*', position):
+                end = body.find('*/', position + 2)
+                end = length if end == -1 else end + 2
+                pending_comments.append(body[position:end])
+                position = end
+            elif body[position] == '[':
+                end = _find_closing(body, position, '[', ']')
+                if end == -1:
+                    break
+                pending_attributes.extend(_split_attribute_list(body[position + 1:end]))
+                position = end + 1
+            else:
+                member = _MEMBER_PATTERN.match(body, position)
+                # Propiedad con inicializador ({ get; set; } = valor;): no es un campo simple
+                if member and re.compile(r'\s*=').match(body, member.end()):
+                    member = None
+                if member:
+                    if indent is None:
+                        indent = body[line_start:position] if not body[line_start:position].strip() else None
+                    items.append(MetadataField(
+                        member.group(1), member.group(0).strip(),
+                        pending_attributes, pending_comments,
+                        _blank_lines(body, item_end, pending_start)
+                    ))
+                    position = member.end()
+                else:
+                    # Miembro no reconocido: se conserva literal hasta su cierre (con lo pendiente)
+                    end = body.find('\n', position) if body[position] == '#' else _member_end(body, position)
+                    end = length if end == -1 else end
+                    items.append(raw_block(pending_start, end))
+                    position = end
+                item_end = position
+                pending_attributes, pending_comments = [], []
+                pending_start = None
+
+        if pending_comments or pending_attributes:
+            items.append(raw_block(pending_start, length))
+            item_end = pending_start + len(items[-1])
+        return items, indent or DEFAULT_INDENT, _blank_lines(body, item_end, length)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @property
+    def exists(self) -> bool:
+        return self.original is not None
+
+    @property
+    def fields(self) -> List[MetadataField]:
+        return [item for item in self.items if isinstance(item, MetadataField)]
+
+    def get_field(self, field_name: str) -> Optional[MetadataField]:
+        for item in self.items:
+            if isinstance(item, MetadataField) and item.name == field_name:
+                return item
+        return None
+
+    def field_attributes(self):
+        """{campo: [atributos]} (mismo formato que parse_existing_metadata)"""
+        return {field.name: list(field.attributes) for field in self.fields}
+
+    # ------------------------------------------------------------------
+    # Operaciones en memoria
+    # ------------------------------------------------------------------
+
+    def _get_or_add_field(self, field_name: str) -> MetadataField:
+        field = self.get_field(field_name)
+        if field is None:
+            field = MetadataField(field_name)
+            self.items.append(field)
+        return field
+
+    def add_attribute(self, field_name: str, attribute: str) -> bool:
+        """Agregar atributo al campo (crea el campo si no existe); False si ya lo tenía"""
+        field = self._get_or_add_field(field_name)
+        if field.find_attribute(attribute_name(attribute)) != -1:
+            return False
+        field.attributes.append(attribute)
+        self.changed = True
+        return True
+
+    def set_attribute(self, field_name: str, attribute: str) -> bool:
+        """Agregar o reemplazar el atributo del mismo nombre (ej: FieldPermission(...)); False si queda igual"""
+        field = self._get_or_add_field(field_name)
+        index = field.find_attribute(attribute_name(attribute))
+        if index == -1:
+            field.attributes.append(attribute)
+        elif field.attributes[index] == attribute:
+            return False
+        else:
+            field.attributes[index] = attribute
+        self.changed = True
+        return True
+
+    # ------------------------------------------------------------------
+    # Serialización
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        """Campos con la indentación de la clase; bloques literales y líneas en blanco como en el original"""
+        body = ""
+        for index, item in enumerate(self.items):
+            if isinstance(item, MetadataField):
+                lines = item.comments + [f"[{attribute}]" for attribute in item.attributes] + [item.declaration]
+                block = '\n'.join(self.indent + line for line in lines)
+            else:
+                block = item
+            # Elementos nuevos: separados por una línea en blanco (ninguna antes del primero)
+            blank_lines = item.blank_lines if item.blank_lines is not None else (1 if index else 0)
+            body += '\n' * (blank_lines + 1) + block
+        if not body:
+            return f"{self.header}\n{self.footer}"
+        return f"{self.header}{body}{chr(10) * (self.trailing_blank_lines + 1)}{self.footer}"
+
+    def save(self) -> bool:
+        """Escribir el archivo (una escritura) solo si hubo cambios"""
+        if not self.changed:
+            return False
+        content = self.render()
+        if content == self.original:
+            self.changed = False
+            return False
+        self.path.write_text(content, encoding='utf-8')
+        self.original = content
+        self.changed = False
+        return True
+
+
+# Miembros escritos a mano que deben sobrevivir intactos a parse + render
+_ROUNDTRIP_SAMPLE = '''using System;
+using System.ComponentModel.DataAnnotations;
+using Shared.Models.Attributes;
+
+namespace Shared.Models.Entities.SystemEntities
+{
+    [MetadataType(typeof(SystemConfigMetadata))]
+    public partial class SystemConfig { }
+
+    public class SystemConfigMetadata
+    {
+        [NoSelect]
+        public string Name;
+
+        // Escrito a mano
+        public static string Foo()
+        {
+            if (true)
+            {
+                return "x}";
+            }
+            return "y";
+        }
+
+        public static string Bar() { return "x"; }
+
+        public static readonly string[] Valores = new[] { "a", "b" };
+    }
+}
+'''
+
+
+def roundtrip_check(content: str, path: Path = Path("roundtrip.Metadata.cs")) -> bool:
+    """True si parsear y volver a serializar deja el contenido idéntico"""
+    document = MetadataDocument.parse(content, path)
+    return document is not None and document.render() == content
+
+
+if __name__ == "__main__":
+    import sys
+
+    sample = MetadataDocument.parse(_ROUNDTRIP_SAMPLE, Path("SystemConfig.Metadata.cs"))
+    sample.add_attribute("Name", "Auditar")
+    checks = [("(ejemplo con métodos escritos a mano)", roundtrip_check(_ROUNDTRIP_SAMPLE)),
+              ("(ejemplo + atributo agregado)",
+               sample.render() == _ROUNDTRIP_SAMPLE.replace("[NoSelect]\n", "[NoSelect]\n        [Auditar]\n"))]
+    for file_name in sys.argv[1:]:
+        checks.append((file_name, roundtrip_check(Path(file_name).read_text(encoding='utf-8'), Path(file_name))))
+
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+    sys.exit(0 if all(ok for _, ok in checks) else 1)
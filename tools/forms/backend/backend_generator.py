@@ -31,13 +31,10 @@ class BackendGenerator:
             if model_namespace:
                 variables['model_namespace'] = model_namespace
             
-            # Renderizar template
-            service_content = self.template_engine.render_template("backend/service.cs.template", variables)
-            
-            # Escribir archivo
+            # Renderizar template directo al archivo (solo escribe si cambió)
             service_file = module_path / f"{entity_name}Service.cs"
-            service_file.write_text(service_content, encoding='utf-8')
-            print(f"✅ {entity_name}Service.cs generado")
+            changed = self.template_engine.render_to_file("backend/service.cs.template", variables, service_file)
+            print(f"✅ {entity_name}Service.cs generado" + ("" if changed else " (sin cambios)"))
             return True
             
         except Exception as e:
@@ -54,13 +51,10 @@ class BackendGenerator:
             if model_namespace:
                 variables['model_namespace'] = model_namespace
             
-            # Renderizar template
-            controller_content = self.template_engine.render_template("backend/controller.cs.template", variables)
-            
-            # Escribir archivo
+            # Renderizar template directo al archivo (solo escribe si cambió)
             controller_file = module_path / f"{entity_name}Controller.cs"
-            controller_file.write_text(controller_content, encoding='utf-8')
-            print(f"✅ {entity_name}Controller.cs generado")
+            changed = self.template_engine.render_to_file("backend/controller.cs.template", variables, controller_file)
+            print(f"✅ {entity_name}Controller.cs generado" + ("" if changed else " (sin cambios)"))
             return True
             
         except Exception as e:
@@ -38,7 +38,7 @@ if sys.platform == "win32":
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer)
 
 class EntityGenerator:
-    def __init__(self):
+    def __init__(self, key_strategy=None, skip_indexes=None, index_advisor=True, fulltext=False):
         self.root_path = Path.cwd()
         self.tools_path = self.root_path / "tools"
         self.forms_path = self.tools_path / "forms"
@@ -55,11 +55,14 @@ class EntityGenerator:
         from frontend.service_registry import FrontendServiceRegistry
         from shared.validation import EntityValidator
         from shared.entity_configurator import EntityConfigurator
-        from table import DatabaseTableGenerator
+        from table import DatabaseTableGenerator, DEFAULT_KEY_STRATEGY
         from permissions_generator import PermissionsGenerator
         
         # Inicializar componentes
-        self.db_generator = DatabaseTableGenerator()
+        self.db_generator = DatabaseTableGenerator(key_strategy=key_strategy or DEFAULT_KEY_STRATEGY)
+        self.skip_indexes = skip_indexes or []
+        self.index_advisor = index_advisor
+        self.fulltext = fulltext
         self.backend_generator = BackendGenerator(self.root_path)
         self.backend_registry = BackendServiceRegistry(self.root_path)
         self.frontend_generator = FrontendGenerator(self.root_path)
@@ -90,6 +93,8 @@ class EntityGenerator:
             field_str = f"{field.name}:{field.field_type.value}"
             if field.size:
                 field_str += f":{field.size}"
+            if field.searchable_normalized:
+                field_str += ":searchable_normalized"
             fields_for_table.append(field_str)
         
         fks_for_table = []
@@ -97,6 +102,13 @@ class EntityGenerator:
             fk_str = f"{fk.field}:{fk.ref_table}"
             fks_for_table.append(fk_str)
         
+        # NN compact: clave compuesta (source_id, target_id) en lugar de BaseEntity
+        nn = None
+        if config.nn_config and config.nn_config.layout == "compact":
+            nn = (config.nn_config.source_table, config.nn_config.target_table)
+        
+        extra_indexes = self.advise_indexes(config, table_name) if self.index_advisor and not nn else []
+        
         success = self.db_generator.run(
             table_name=table_name,
             fields=fields_for_table,
@@ -106,7 +118,14 @@ class EntityGenerator:
             preview=False,
             autosync=True,
             add_fields_mode=False,
-            module=config.module
+            module=config.module,
+            skip_indexes=self.skip_indexes,
+            extra_indexes=extra_indexes,
+            fulltext_fields=config.search_fields if self.fulltext else None,
+            nn=nn,
+            nn_audit=config.nn_config.audit if nn else False,
+            compression=config.compression,
+            columnstore=config.columnstore_fields or None
         )
         
         if not success:
@@ -146,6 +165,31 @@ class EntityGenerator:
 
         return success  # Solo fallar si la tabla no se creó, no por permisos
     
+    def full_text_properties(self, config):
+        """Propiedades EF de los search_fields con índice full-text (None sin --fulltext)"""
+        if not self.fulltext or not config.search_fields:
+            return None
+        return [''.join(part.capitalize() for part in field.split('_') if part) for field in config.search_fields]
+    
+    def advise_indexes(self, config, table_name):
+        """Asesor de índices: índices de cobertura desde grid_fields, lookups y el OrderBy del ViewManager"""
+        from shared.index_advisor import IndexAdvisor, load_catalog_indexes
+        
+        tables = [table_name] + [lookup.target_table for lookup in config.lookups.values()]
+        catalog = load_catalog_indexes(self.db_generator.connection_settings(), tables)
+        planned = self.db_generator.support_indexes(
+            table_name, [{'field': fk.field} for fk in config.foreign_keys], None, self.skip_indexes
+        )
+        suggestions = IndexAdvisor(catalog).advise(config, table_name, planned)
+        
+        if suggestions:
+            print(f"🧭 Asesor de índices: {len(suggestions)} índice(s) de cobertura")
+            for suggestion in suggestions:
+                include = f" INCLUDE ({', '.join(suggestion.include)})" if suggestion.include else ""
+                print(f"   • {suggestion.table}({', '.join(suggestion.columns)}){include}")
+            print()
+        return [suggestion.to_dict() for suggestion in suggestions]
+    
     def generate_permissions_smart(self, entity_name, entity_plural=None, is_nn_relation=False):
         """Generar permisos con verificación inteligente"""
         try:
@@ -287,36 +331,13 @@ class EntityGenerator:
     
     def read_connection_string(self):
         """Lee la connection string desde Backend/Properties/launchSettings.json"""
-        import json
-
-        launch_settings_path = self.root_path / "Backend" / "Properties" / "launchSettings.json"
-
-        if not launch_settings_path.exists():
-            print(f"❌ ERROR: No se encontró launchSettings.json en {launch_settings_path}")
-            return None
-
-        try:
-            with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
+        settings = self.connection_settings()
+        return settings.ef() if settings else None
 
-            # Buscar en los profiles la variable SQL
-            for profile_name, profile_data in settings.get("profiles", {}).items():
-                env_vars = profile_data.get("environmentVariables", {})
-                sql_connection = env_vars.get("SQL")
-
-                if sql_connection:
-                    print(f"✅ Connection string encontrado en profile: {profile_name}")
-                    return sql_connection
-
-            print(f"❌ ERROR: No se encontró variable 'SQL' en environmentVariables")
-            return None
-
-        except json.JSONDecodeError as e:
-            print(f"❌ ERROR: El archivo launchSettings.json no es válido: {e}")
-            return None
-        except Exception as e:
-            print(f"❌ ERROR leyendo launchSettings.json: {e}")
-            return None
+    def connection_settings(self):
+        """Conexión compartida con table.py / permisos (tools/db/connection_settings.py)"""
+        from connection_settings import load_connection_settings
+        return load_connection_settings(self.root_path / "Backend")
 
     def extract_database_name(self, connection_string):
         """Extrae el nombre de la base de datos del connection string"""
@@ -371,10 +392,11 @@ class EntityGenerator:
 
         try:
             # Leer connection string dinámico
-            connection_string = self.read_connection_string()
-            if not connection_string:
+            settings = self.connection_settings()
+            if not settings:
                 print("❌ No se pudo obtener connection string para auto-registro")
                 return False
+            connection_string = settings.ef()
 
             # Extraer nombre de base de datos
             database_name = self.extract_database_name(connection_string)
@@ -434,10 +456,7 @@ class EntityGenerator:
             """
 
             # Ejecutar SQL usando sqlcmd con base de datos dinámica
-            cmd = [
-                'sqlcmd', '-S', 'localhost,1333', '-U', 'sa', '-P', 'Soporte.2019',
-                '-d', database_name, '-C', '-Q', sql_command
-            ]
+            cmd = ['sqlcmd', *settings.sqlcmd_args(database_name), '-Q', sql_command]
 
             result = subprocess.run(cmd, capture_output=True, text=True)
 
@@ -610,8 +629,9 @@ class EntityGenerator:
                 registrator = EntityRegistrationAPI()
                 registration_success = registrator.register_entity(
                     entity_name=config.entity_name,
-                    module_path=config.module
+                    module_path=config.module,
                     # display_property y search_fields se auto-detectan
+                    full_text_fields=self.full_text_properties(config)
                 )
 
                 if registration_success:
@@ -643,6 +663,9 @@ class EntityGenerator:
         if not self.target_db(config):
             return False
         
+        # La etapa DB regeneró los modelos: el índice de la interfaz debe verlos
+        self.frontend_generator.model_index.refresh()
+        
         print()
         print("=" * 50)
         print()
@@ -673,8 +696,9 @@ class EntityGenerator:
             registrator = EntityRegistrationAPI()
             registration_success = registrator.register_entity(
                 entity_name=config.entity_name,
-                module_path=config.module
+                module_path=config.module,
                 # display_property y search_fields se auto-detectan
+                full_text_fields=self.full_text_properties(config)
             )
 
             if registration_success:
@@ -936,6 +960,10 @@ class EntityGenerator:
             return False
 
 def main():
+    # Layouts NN compartidos con tools/db/table.py
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "db"))
+    from table import NN_LAYOUTS, DEFAULT_NN_LAYOUT
+    
     parser = argparse.ArgumentParser(
         description='🎯 Entity Generator - Generador Avanzado de Entidades CRUD',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -964,6 +992,10 @@ Ejemplo completo:
                        help='Tabla target para relación NN (ej: productos)')
     parser.add_argument('--alias',
                        help='Alias opcional para relación NN (ej: promocion)')
+    parser.add_argument('--nn-layout', choices=list(NN_LAYOUTS.keys()), default=DEFAULT_NN_LAYOUT,
+                       help='Layout de la tabla NN: ' + '; '.join(f'{name} = {description}' for name, description in NN_LAYOUTS.items()))
+    parser.add_argument('--nn-audit', action='store_true',
+                       help='Con --nn-layout compact: agregar FechaCreacion y CreadorId')
     
     # Argumentos comunes
     parser.add_argument('--module', required=True,
@@ -976,6 +1008,21 @@ Ejemplo completo:
                        help='Campos de BD: "nombre:tipo:tamaño"')
     parser.add_argument('--fk', nargs='*',
                        help='Foreign Keys: "campo:tabla_referencia"')
+    # Mismas opciones que KEY_STRATEGIES en tools/db/table.py
+    parser.add_argument('--key-strategy', choices=['sequential', 'org-clustered', 'identity', 'newid'],
+                       default='sequential',
+                       help='Clave primaria / índice clustered de la tabla (default: sequential = NEWSEQUENTIALID())')
+    parser.add_argument('--no-index', nargs='*', default=[],
+                       help='Columnas FK sin índice automático (OrganizationId omite el índice de tenant)')
+    parser.add_argument('--fulltext', action='store_true',
+                       help='Índice full-text sobre --search-fields (CONTAINS en lugar de LIKE)')
+    # Mismas opciones que COMPRESSION_MODES en tools/db/table.py
+    parser.add_argument('--compression', choices=['row', 'page'],
+                       help='Compresión de la tabla y sus índices (tablas de alto volumen)')
+    parser.add_argument('--columnstore',
+                       help='Columnstore no agrupado para reportes: "campo1,campo2,FechaCreacion"')
+    parser.add_argument('--no-index-advisor', action='store_true',
+                       help='No crear los índices de cobertura sugeridos desde grilla, lookups y OrderBy')
     
     # Configuración de UI
     parser.add_argument('--form-fields', nargs='*',
@@ -1038,14 +1085,26 @@ Ejemplo completo:
             print("💡 Usa: --source venta --to productos --target db")
             sys.exit(1)
     
-    # Validaciones básicas para target db/todo
-    if args.target in ['db', 'todo']:
+    if (args.nn_layout != DEFAULT_NN_LAYOUT or args.nn_audit) and not is_nn_mode:
+        print("❌ ERROR: --nn-layout y --nn-audit requieren --source --to")
+        sys.exit(1)
+    if args.nn_audit and args.nn_layout != 'compact':
+        print("❌ ERROR: --nn-audit requiere --nn-layout compact")
+        sys.exit(1)
+    
+    # Validaciones básicas para target db/todo (NN compact ya tiene sus columnas clave)
+    if args.target in ['db', 'todo'] and args.nn_layout != 'compact':
         if not args.fields and not args.fk:
             print("❌ ERROR: --fields o --fk requerido para targets 'db' y 'todo'")
             print("💡 Ejemplo: --fields \"nombre:string:100\" --fk \"categoria_id:categorias\"")
             sys.exit(1)
     
-    generator = EntityGenerator()
+    if args.fulltext and not args.search_fields:
+        print("❌ ERROR: --fulltext requiere --search-fields")
+        print("💡 Ejemplo: --search-fields \"nombre,codigo\" --fulltext")
+        sys.exit(1)
+    
+    generator = EntityGenerator(args.key_strategy, args.no_index, not args.no_index_advisor, args.fulltext)
     
     try:
         success = generator.run(args)
@@ -9,7 +9,7 @@ import sys
 from pathlib import Path
 
 class FastFieldGenerator:
-    def __init__(self, templates_path=None, root_path=None):
+    def __init__(self, templates_path=None, root_path=None, template_engine=None, model_index=None):
         if templates_path:
             self.templates_path = Path(templates_path)
             # Importar template engine
@@ -17,8 +17,9 @@ class FastFieldGenerator:
             from shared.template_engine import TemplateEngine
             from shared.lookup_resolver import LookupResolver
             
-            self.template_engine = TemplateEngine(self.templates_path)
-            self.lookup_resolver = LookupResolver(root_path or self.templates_path.parent.parent.parent)
+            self.template_engine = template_engine or TemplateEngine(self.templates_path)
+            self.lookup_resolver = LookupResolver(root_path or self.templates_path.parent.parent.parent,
+                                                  model_index=model_index)
         else:
             self.template_engine = None
             self.lookup_resolver = None
@@ -26,8 +27,8 @@ class FastFieldGenerator:
         # Configuración de lookups del usuario (se setea externamente)
         self.user_lookups_config = None
     
-    def generate_form_field(self, field):
-        """Generar campo de formulario basado en el tipo usando templates"""
+    def describe_form_field(self, field):
+        """Describir el input de un campo como template + variables (para {% include %})"""
         field_name = field['name']
         field_type = field['type']
         
@@ -37,74 +38,68 @@ class FastFieldGenerator:
             if user_lookup:
                 print(f"✅ Usando lookup configurado por usuario en Fast: {field_name} -> {user_lookup.target_table}")
                 lookup_config = self._convert_user_lookup_to_config(user_lookup, field_name)
-                return self.lookup_resolver.generate_lookup_input(lookup_config, self.template_engine)
+                return self._input_spec('lookup_input', self.lookup_resolver.lookup_input_variables(lookup_config))
         
         # PRIORIDAD 2: Detectar si es un campo FK (Lookup) automáticamente
         if field_type == 'Guid' and self.lookup_resolver:
             lookup_config = self.lookup_resolver.resolve_lookup_config(field_name)
             if lookup_config:
                 print(f"✅ Detectado Lookup automático en Fast: {field_name} -> {lookup_config['entity_name']}")
-                return self.lookup_resolver.generate_lookup_input(lookup_config, self.template_engine)
+                return self._input_spec('lookup_input', self.lookup_resolver.lookup_input_variables(lookup_config))
         
         # Campos normales (no FK)
         field_display = self._get_display_name(field_name)
         field_placeholder = self._get_placeholder(field_name, field_display)
         
-        base_variables = {
+        variables = {
             'FIELD_NAME': field_name,
             'FIELD_DISPLAY': field_display,
             'FIELD_PLACEHOLDER': field_placeholder
         }
         
-        # Generar según tipo usando templates
-        if self.template_engine:
-            if field_type == 'string':
-                if field_name.lower() == 'descripcion':
-                    return self._render_input_template('textarea_input', base_variables)
-                else:
-                    return self._render_input_template('textbox_input', base_variables)
-            elif field_type in ['int', 'decimal']:
-                return self._render_numeric_template(field_type, base_variables)
-            elif field_type == 'DateTime':
-                return self._render_datetime_template(base_variables)
-            elif field_type == 'bool':
-                return self._render_switch_template(base_variables)
-            else:
-                return self._render_input_template('textbox_input', base_variables)  # Fallback
+        # Elegir template según tipo
+        if field_type == 'string':
+            if field_name.lower() == 'descripcion':
+                return self._input_spec('textarea_input', variables)
+            return self._input_spec('textbox_input', variables)
+        elif field_type in ['int', 'decimal']:
+            if field_type == 'int':
+                variables['NUMERIC_FORMAT'] = ''
+                variables['FIELD_PLACEHOLDER'] = '0'
+            else:  # decimal
+                variables['NUMERIC_FORMAT'] = 'Format="F2"'
+                variables['FIELD_PLACEHOLDER'] = '0.00'
+            return self._input_spec('numeric_input', variables)
+        elif field_type == 'DateTime':
+            variables.update({
+                'SHOW_TIME': 'true',
+                'DATE_FORMAT': 'dd/MM/yyyy HH:mm'
+            })
+            return self._input_spec('datetime_input', variables)
+        elif field_type == 'bool':
+            return self._input_spec('switch_input', variables)
         else:
-            # Fallback a código hardcodeado si no hay templates
-            return self._generate_fallback_field(field_name, field_type)
+            return self._input_spec('textbox_input', variables)  # Fallback
     
-    def _render_input_template(self, template_name, variables):
-        """Renderizar template de input específico"""
+    def generate_form_field(self, field):
+        """Generar campo de formulario basado en el tipo usando templates"""
+        if not self.template_engine:
+            # Fallback a código hardcodeado si no hay templates
+            return self._generate_fallback_field(field['name'], field['type'])
+        
+        spec = self.describe_form_field(field)
         try:
-            return self.template_engine.render_template(f"frontend/inputs/{template_name}.template", variables)
+            return self.template_engine.render_partial(spec['template'], spec['variables'])
         except Exception as e:
-            print(f"⚠️ Error renderizando {template_name}: {e}")
-            return f"<!-- Error: {template_name} -->"
-    
-    def _render_numeric_template(self, field_type, variables):
-        """Renderizar template numérico con formato específico"""
-        if field_type == 'int':
-            variables['NUMERIC_FORMAT'] = ''
-            variables['FIELD_PLACEHOLDER'] = '0'
-        else:  # decimal
-            variables['NUMERIC_FORMAT'] = 'Format="F2"'
-            variables['FIELD_PLACEHOLDER'] = '0.00'
-        
-        return self._render_input_template('numeric_input', variables)
-    
-    def _render_datetime_template(self, variables):
-        """Renderizar template de fecha/hora"""
-        variables.update({
-            'SHOW_TIME': 'true',
-            'DATE_FORMAT': 'dd/MM/yyyy HH:mm'
-        })
-        return self._render_input_template('datetime_input', variables)
+            print(f"⚠️ Error renderizando {spec['template']}: {e}")
+            return f"<!-- Error: {spec['template']} -->"
     
-    def _render_switch_template(self, variables):
-        """Renderizar template para campo booleano (switch)"""
-        return self._render_input_template('switch_input', variables)
+    def _input_spec(self, template_name, variables):
+        """Template de input + variables con que se renderiza"""
+        return {
+            'template': f"frontend/inputs/{template_name}.template",
+            'variables': variables
+        }
     
     def _get_placeholder(self, field_name, display_name):
         """Generar placeholder apropiado"""
@@ -374,9 +369,9 @@ class FastFieldGenerator:
         
         if not self.lookup_resolver:
             return {
-                'service_injections': '',
-                'search_fields': '',
-                'initializations': ''
+                'services': [],
+                'search_fields': [],
+                'initializations': []
             }
         
         for field in fields:
@@ -398,26 +393,25 @@ class FastFieldGenerator:
                 
                 # VALIDAR SI YA EXISTE EL SERVICIO ANTES DE AGREGARLO
                 if service_name not in added_services:
-                    lookup_services.append(f"[Inject] private {service_name} {service_name} {{ get; set; }} = null!;")
+                    lookup_services.append(service_name)
                     added_services.add(service_name)
                     print(f"✅ Servicio agregado en Fast: {service_name}")
                 else:
                     print(f"⚠️ Servicio duplicado omitido en Fast: {service_name}")
                 
-                # Campo de búsqueda (estos pueden repetirse sin problema)
-                search_field_name = f"{entity_name.lower()}SearchFields"
-                # IMPORTANTE: Usar namespace completo para evitar conflictos
-                full_entity_name = f"Shared.Models.Entities.{entity_name}"
-                search_field_definition = f"private Expression<Func<{full_entity_name}, object>>[] {search_field_name} = new Expression<Func<{full_entity_name}, object>>[] {{ x => x.Nombre }};"
-                
-                # También evitar duplicados en search fields
-                if search_field_definition not in lookup_search_fields:
-                    lookup_search_fields.append(search_field_definition)
+                # Campo de búsqueda (uno por entidad, el template arma la definición completa)
+                search_field = {
+                    'entity_name': entity_name,
+                    'field_name': f"{entity_name.lower()}SearchFields",
+                    'property': self.lookup_resolver.search_property(entity_name, lookup_config.get('display_property'))
+                }
+                if all(s['field_name'] != search_field['field_name'] for s in lookup_search_fields):
+                    lookup_search_fields.append(search_field)
                 
                 # No necesitamos inicialización especial por ahora
         
         return {
-            'service_injections': '\n    '.join(lookup_services),
-            'search_fields': '\n    '.join(lookup_search_fields),
-            'initializations': '\n        '.join(lookup_initializations) if lookup_initializations else '// No lookups to initialize'
+            'services': lookup_services,
+            'search_fields': lookup_search_fields,
+            'initializations': lookup_initializations
         }
\ No newline at end of file
@@ -9,25 +9,23 @@ import sys
 from pathlib import Path
 
 class FormularioFieldGenerator:
-    def __init__(self, templates_path=None, root_path=None):
-        if templates_path:
-            self.templates_path = Path(templates_path)
-            # Importar template engine y lookup resolver
-            sys.path.append(str(self.templates_path.parent.parent))
-            from shared.template_engine import TemplateEngine
-            from shared.lookup_resolver import LookupResolver
-            
-            self.template_engine = TemplateEngine(self.templates_path)
-            self.lookup_resolver = LookupResolver(root_path or self.templates_path.parent.parent.parent)
-        else:
-            self.template_engine = None
-            self.lookup_resolver = None
+    def __init__(self, templates_path=None, root_path=None, template_engine=None, model_index=None):
+        # Los inputs de Formulario solo existen como templates: sin ruta se usan los de tools/forms/templates
+        self.templates_path = Path(templates_path) if templates_path else Path(__file__).resolve().parent.parent / "templates"
+        # Importar template engine y lookup resolver
+        sys.path.append(str(self.templates_path.parent.parent))
+        from shared.template_engine import TemplateEngine
+        from shared.lookup_resolver import LookupResolver
+        
+        self.template_engine = template_engine or TemplateEngine(self.templates_path)
+        self.lookup_resolver = LookupResolver(root_path or self.templates_path.parent.parent.parent,
+                                              model_index=model_index)
         
         # Configuración de lookups del usuario (se setea externamente)
         self.user_lookups_config = None
     
-    def generate_form_field(self, field):
-        """Generar campo de formulario para Formulario (con Style width 100%)"""
+    def describe_form_field(self, field):
+        """Describir el input de Formulario (con Style width 100%) como template + variables"""
         field_name = field['name']
         field_type = field['type']
         
@@ -38,106 +36,66 @@ class FormularioFieldGenerator:
             if user_lookup:
                 print(f"✅ Usando lookup configurado por usuario: {field_name} -> {user_lookup.target_table}")
                 lookup_config = self._convert_user_lookup_to_config(user_lookup, field_name)
-                return self._generate_formulario_lookup_input(lookup_config)
+                return self._lookup_input_spec(lookup_config)
         
         # PRIORIDAD 2: Detectar si es un campo FK (Lookup) automáticamente
         if field_type == 'Guid' and self.lookup_resolver:
             lookup_config = self.lookup_resolver.resolve_lookup_config(field_name)
             if lookup_config:
                 print(f"✅ Detectado Lookup automático en Formulario: {field_name} -> {lookup_config['entity_name']}")
-                return self._generate_formulario_lookup_input(lookup_config)
+                return self._lookup_input_spec(lookup_config)
         
         # Campos normales (no FK)
         field_display = self._get_display_name(field_name)
         field_placeholder = self._get_placeholder(field_name, field_display)
         
-        # Generar según tipo usando lógica específica para formulario
+        variables = {
+            'FIELD_NAME': field_name,
+            'FIELD_DISPLAY': field_display,
+            'FIELD_PLACEHOLDER': field_placeholder
+        }
+        
+        # Elegir template según tipo usando lógica específica para formulario
         if field_type == 'string':
             if field_name.lower() == 'descripcion':
-                return self._generate_formulario_textarea(field_name, field_display, field_placeholder)
-            else:
-                return self._generate_formulario_textbox(field_name, field_display, field_placeholder)
+                return self._input_spec('textarea_input', variables)
+            return self._input_spec('textbox_input', variables)
         elif field_type in ['int', 'decimal']:
-            return self._generate_formulario_numeric(field_name, field_display, field_type)
+            if field_type == 'int':
+                variables['FIELD_PLACEHOLDER'] = '0'
+                variables['NUMERIC_FORMAT'] = ''
+            else:  # decimal
+                variables['FIELD_PLACEHOLDER'] = '0.00'
+                variables['NUMERIC_FORMAT'] = 'Format="F2"'
+            return self._input_spec('numeric_input', variables)
         elif field_type == 'DateTime':
-            return self._generate_formulario_datetime(field_name, field_display)
+            return self._input_spec('datetime_input', variables)
         elif field_type == 'bool':
-            return self._generate_formulario_switch(field_name, field_display)
+            return self._input_spec('switch_input', variables)
         else:
-            return self._generate_formulario_textbox(field_name, field_display, field_placeholder)  # Fallback
-    
-    def _generate_formulario_textbox(self, field_name, field_display, field_placeholder):
-        """Generar TextBox para formulario con width: 100%"""
-        return f'''<ValidatedInput FieldName="{field_name}" Value="@entity.{field_name}">
-                                                <RadzenFormField Text="{field_display}" Style="width: 100%">
-                                                    <RadzenTextBox @bind-Value="@entity.{field_name}" 
-                                                                   Placeholder="{field_placeholder}" />
-                                                </RadzenFormField>
-                                            </ValidatedInput>'''
+            return self._input_spec('textbox_input', variables)  # Fallback
     
-    def _generate_formulario_textarea(self, field_name, field_display, field_placeholder):
-        """Generar TextArea para formulario con width: 100%"""
-        return f'''<ValidatedInput FieldName="{field_name}" Value="@entity.{field_name}">
-                                                <RadzenFormField Text="{field_display} (Opcional)" Style="width: 100%">
-                                                    <RadzenTextArea @bind-Value="@entity.{field_name}" 
-                                                                    Placeholder="{field_placeholder}" 
-                                                                    Rows="3" />
-                                                </RadzenFormField>
-                                            </ValidatedInput>'''
-    
-    def _generate_formulario_numeric(self, field_name, field_display, field_type):
-        """Generar Numeric para formulario"""
-        if field_type == 'int':
-            placeholder = '0'
-            format_attr = ''
-        else:  # decimal
-            placeholder = '0.00'
-            format_attr = 'Format="F2"'
-        
-        return f'''<ValidatedInput FieldName="{field_name}" Value="@entity.{field_name}">
-                                                <RadzenFormField Text="{field_display}" Style="width: 100%">
-                                                    <RadzenNumeric @bind-Value="entity.{field_name}" 
-                                                                   Placeholder="{placeholder}"
-                                                                   {format_attr}
-                                                                   ShowUpDown="false" />
-                                                </RadzenFormField>
-                                            </ValidatedInput>'''
-    
-    def _generate_formulario_datetime(self, field_name, field_display):
-        """Generar DatePicker para formulario"""
-        return f'''<ValidatedInput FieldName="{field_name}" Value="@entity.{field_name}">
-                                                <RadzenFormField Text="{field_display}" Style="width: 100%">
-                                                    <RadzenDatePicker @bind-Value="entity.{field_name}" 
-                                                                      ShowTime="true"
-                                                                      DateFormat="dd/MM/yyyy HH:mm" />
-                                                </RadzenFormField>
-                                            </ValidatedInput>'''
+    def generate_form_field(self, field):
+        """Generar campo de formulario para Formulario (con Style width 100%)"""
+        spec = self.describe_form_field(field)
+        try:
+            return self.template_engine.render_partial(spec['template'], spec['variables'])
+        except Exception as e:
+            print(f"⚠️ Error renderizando {spec['template']}: {e}")
+            return f"<!-- Error: {spec['template']} -->"
     
-    def _generate_formulario_lookup_input(self, lookup_config):
-        """Generar Lookup para formulario con width: 100%"""
-        field_name = lookup_config['field_name']
-        field_display = self._get_display_name(field_name)
-        
-        return f'''<ValidatedInput FieldName="{field_name}" Value="@entity.{field_name}">
-                                                <RadzenFormField Text="{field_display}" Style="width: 100%">
-                                                    <Lookup TEntity="{lookup_config['entity_name']}" 
-                                                           TValue="{lookup_config['value_type']}" 
-                                                           @bind-Value="entity.{field_name}"
-                                                           Service="{lookup_config['service_name']}"
-                                                           FastCreateComponentType="typeof({lookup_config['entity_name']}Fast)"
-                                                           DisplayProperty="{lookup_config['display_property']}"
-                                                           EntityDisplayName="{lookup_config['entity_display']}"
-                                                           SearchableFields="@{lookup_config['entity_name'].lower()}SearchFields"
-                                                           {('EnableCache="true"' if lookup_config['cache_enabled'] else '')} />
-                                                </RadzenFormField>
-                                            </ValidatedInput>'''
+    def _input_spec(self, template_name, variables):
+        """Template de input de Formulario + variables con que se renderiza"""
+        return {
+            'template': f"frontend/inputs/formulario/{template_name}.template",
+            'variables': variables
+        }
     
-    def _generate_formulario_switch(self, field_name, field_display):
-        """Generar RadzenSwitch para campos booleanos"""
-        return f'''<RadzenStack Orientation="Orientation.Horizontal" AlignItems="AlignItems.Center" Gap="0.5rem">
-                                                <RadzenLabel Text="{field_display}" Component="{field_name}" />
-                                                <RadzenSwitch @bind-Value="entity.{field_name}" Name="{field_name}" />
-                                            </RadzenStack>'''
+    def _lookup_input_spec(self, lookup_config):
+        """Input de Lookup para formulario con width: 100%"""
+        variables = self.lookup_resolver.lookup_input_variables(lookup_config)
+        variables['FIELD_DISPLAY'] = self._get_display_name(lookup_config['field_name'])
+        return self._input_spec('lookup_input', variables)
     
     def _get_display_name(self, field_name):
         """Obtener nombre para mostrar"""
@@ -224,9 +182,9 @@ class FormularioFieldGenerator:
         
         if not self.lookup_resolver:
             return {
-                'service_injections': '',
-                'search_fields': '',
-                'initializations': ''
+                'services': [],
+                'search_fields': [],
+                'initializations': []
             }
         
         for field in fields:
@@ -248,26 +206,25 @@ class FormularioFieldGenerator:
                 
                 # VALIDAR SI YA EXISTE EL SERVICIO ANTES DE AGREGARLO
                 if service_name not in added_services:
-                    lookup_services.append(f"[Inject] private {service_name} {service_name} {{ get; set; }} = null!;")
+                    lookup_services.append(service_name)
                     added_services.add(service_name)
                     print(f"✅ Servicio agregado: {service_name}")
                 else:
                     print(f"⚠️ Servicio duplicado omitido: {service_name}")
                 
-                # Campo de búsqueda (estos pueden repetirse sin problema)
-                search_field_name = f"{entity_name.lower()}SearchFields"
-                # IMPORTANTE: Usar namespace completo para evitar conflictos
-                full_entity_name = f"Shared.Models.Entities.{entity_name}"
-                search_field_definition = f"private Expression<Func<{full_entity_name}, object>>[] {search_field_name} = new Expression<Func<{full_entity_name}, object>>[] {{ x => x.Nombre }};"
-                
-                # También evitar duplicados en search fields
-                if search_field_definition not in lookup_search_fields:
-                    lookup_search_fields.append(search_field_definition)
+                # Campo de búsqueda (uno por entidad, el template arma la definición completa)
+                search_field = {
+                    'entity_name': entity_name,
+                    'field_name': f"{entity_name.lower()}SearchFields",
+                    'property': self.lookup_resolver.search_property(entity_name, lookup_config.get('display_property'))
+                }
+                if all(s['field_name'] != search_field['field_name'] for s in lookup_search_fields):
+                    lookup_search_fields.append(search_field)
                 
                 # No necesitamos inicialización especial por ahora
         
         return {
-            'service_injections': '\n    '.join(lookup_services),
-            'search_fields': '\n    '.join(lookup_search_fields),
-            'initializations': '\n        '.join(lookup_initializations) if lookup_initializations else '// No lookups to initialize'
+            'services': lookup_services,
+            'search_fields': lookup_search_fields,
+            'initializations': lookup_initializations
         }
\ No newline at end of file
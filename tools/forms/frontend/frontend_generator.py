@@ -16,6 +16,7 @@ class FrontendGenerator:
         # Importar template engine y generadores
         sys.path.append(str(self.forms_path))
         from shared.template_engine import TemplateEngine
+        from shared.model_index import ModelIndex
         from frontend.viewmanager import ViewManagerGenerator
         from frontend.fast_generator import FastFieldGenerator
         from frontend.formulario_generator import FormularioFieldGenerator
@@ -23,9 +24,10 @@ class FrontendGenerator:
         # Inicializar componentes
         templates_path = self.forms_path / "templates"
         self.template_engine = TemplateEngine(templates_path)
-        self.viewmanager_generator = ViewManagerGenerator(self.root_path)
-        self.fast_generator = FastFieldGenerator(templates_path, self.root_path)
-        self.formulario_generator = FormularioFieldGenerator(templates_path, self.root_path)
+        self.model_index = ModelIndex(self.root_path)
+        self.viewmanager_generator = ViewManagerGenerator(self.root_path, self.template_engine, self.model_index)
+        self.fast_generator = FastFieldGenerator(templates_path, self.root_path, self.template_engine, self.model_index)
+        self.formulario_generator = FormularioFieldGenerator(templates_path, self.root_path, self.template_engine, self.model_index)
     
     def generate_service(self, entity_name, module, module_path):
         """Generar archivo Service del frontend usando template"""
@@ -33,13 +35,10 @@ class FrontendGenerator:
             # Preparar variables para el template
             variables = self.template_engine.prepare_entity_variables(entity_name, module)
             
-            # Renderizar template
-            service_content = self.template_engine.render_template("frontend/services/service.cs.template", variables)
-            
-            # Escribir archivo
+            # Renderizar template directo al archivo (solo escribe si cambió)
             service_file = module_path / f"{entity_name}Service.cs"
-            service_file.write_text(service_content, encoding='utf-8')
-            print(f"✅ Frontend {entity_name}Service.cs generado")
+            changed = self.template_engine.render_to_file("frontend/services/service.cs.template", variables, service_file)
+            print(f"✅ Frontend {entity_name}Service.cs generado" + ("" if changed else " (sin cambios)"))
             return True
             
         except Exception as e:
@@ -109,19 +108,15 @@ class FrontendGenerator:
             elif component_type == 'formulario':
                 self._prepare_formulario_variables(entity_name, variables, config)
             
-            # Renderizar templates
-            razor_content = self.template_engine.render_template(f"frontend/components/{component_type}.razor.template", variables)
-            cs_content = self.template_engine.render_template(f"frontend/components/{component_type}.razor.cs.template", variables)
-            
-            # Escribir archivos
+            # Renderizar templates directo a los archivos (solo escriben si cambiaron)
             razor_file = module_path / f"{entity_name}{component_type.title()}.razor"
             cs_file = module_path / f"{entity_name}{component_type.title()}.razor.cs"
             
-            razor_file.write_text(razor_content, encoding='utf-8')
-            cs_file.write_text(cs_content, encoding='utf-8')
+            razor_changed = self.template_engine.render_to_file(f"frontend/components/{component_type}.razor.template", variables, razor_file)
+            cs_changed = self.template_engine.render_to_file(f"frontend/components/{component_type}.razor.cs.template", variables, cs_file)
             
-            print(f"✅ {entity_name}{component_type.title()}.razor generado")
-            print(f"✅ {entity_name}{component_type.title()}.razor.cs generado")
+            print(f"✅ {entity_name}{component_type.title()}.razor generado" + ("" if razor_changed else " (sin cambios)"))
+            print(f"✅ {entity_name}{component_type.title()}.razor.cs generado" + ("" if cs_changed else " (sin cambios)"))
             return True
             
         except Exception as e:
@@ -143,13 +138,13 @@ class FrontendGenerator:
         # Detectar campos de la entidad
         fields = self.viewmanager_generator.detect_entity_fields(entity_name)
         
-        # Generar campos de formulario
+        # Describir campos de formulario: el template los itera y renderiza en una sola llamada
         form_fields = []
         validation_rules = []
         field_validations = []
         
         for field in fields:
-            form_fields.append(self.fast_generator.generate_form_field(field))
+            form_fields.append(self.fast_generator.describe_form_field(field))
             validation_rules.append(self.fast_generator.generate_validation_rule(field))
             field_validations.append(self.fast_generator.generate_field_validation_check(field))
         
@@ -158,10 +153,10 @@ class FrontendGenerator:
         
         # Agregar a variables
         variables.update({
-            'FORM_FIELDS': '\n                '.join(form_fields),
-            'VALIDATION_RULES': '\n            '.join(validation_rules),
-            'FIELD_VALIDATIONS': '\n\n            '.join(field_validations),
-            'LOOKUP_SERVICE_INJECTIONS': lookup_deps['service_injections'],
+            'FORM_FIELDS': form_fields,
+            'VALIDATION_RULES': validation_rules,
+            'FIELD_VALIDATIONS': field_validations,
+            'LOOKUP_SERVICES': lookup_deps['services'],
             'LOOKUP_SEARCH_FIELDS': lookup_deps['search_fields'],
             'LOOKUP_FIELD_INITIALIZATIONS': lookup_deps['initializations']
         })
@@ -185,13 +180,13 @@ class FrontendGenerator:
         primary_field = fields[0]['name'] if fields else 'Nombre'
         variables['PRIMARY_FIELD'] = primary_field
         
-        # Generar campos de formulario
+        # Describir campos de formulario: el template los itera y renderiza en una sola llamada
         form_fields = []
         validation_rules = []
         field_validations = []
         
         for field in fields:
-            form_fields.append(self.formulario_generator.generate_form_field(field))
+            form_fields.append(self.formulario_generator.describe_form_field(field))
             validation_rules.append(self.fast_generator.generate_validation_rule(field))  # Reutilizar validaciones
             field_validations.append(self.fast_generator.generate_field_validation_check(field))  # Reutilizar validaciones
         
@@ -200,10 +195,10 @@ class FrontendGenerator:
         
         # Agregar a variables
         variables.update({
-            'FORM_FIELDS_WITH_PERMISSIONS': '\n                                            '.join(form_fields),
-            'VALIDATION_RULES': '\n            '.join(validation_rules),
-            'FIELD_VALIDATIONS': '\n\n            '.join(field_validations),
-            'LOOKUP_SERVICE_INJECTIONS': lookup_deps['service_injections'],
+            'FORM_FIELDS_WITH_PERMISSIONS': form_fields,
+            'VALIDATION_RULES': validation_rules,
+            'FIELD_VALIDATIONS': field_validations,
+            'LOOKUP_SERVICES': lookup_deps['services'],
             'LOOKUP_SEARCH_FIELDS': lookup_deps['search_fields'],
             'LOOKUP_FIELD_INITIALIZATIONS': lookup_deps['initializations']
         })
@@ -9,52 +9,29 @@ import sys
 from pathlib import Path
 
 class ViewManagerGenerator:
-    def __init__(self, root_path):
+    def __init__(self, root_path, template_engine=None, model_index=None):
         self.root_path = Path(root_path)
         self.forms_path = self.root_path / "tools" / "forms"
         
-        # Importar template engine
+        # Importar template engine e índice de modelos
         sys.path.append(str(self.forms_path))
         from shared.template_engine import TemplateEngine
+        from shared.model_index import ModelIndex
         
-        # Inicializar motor de templates
+        # Inicializar motor de templates e índice (compartidos si vienen del FrontendGenerator)
         templates_path = self.forms_path / "templates"
-        self.template_engine = TemplateEngine(templates_path)
+        self.template_engine = template_engine or TemplateEngine(templates_path)
+        self.model_index = model_index or ModelIndex(self.root_path)
     
     def detect_entity_fields(self, entity_name):
         """Detectar campos de la entidad desde el modelo generado"""
         try:
-            entity_file = self.root_path / "Shared.Models" / "Entities" / f"{entity_name}.cs"
+            fields = self.model_index.get_fields(entity_name)
             
-            if not entity_file.exists():
+            if fields is None:
                 print(f"⚠️ Modelo {entity_name}.cs no encontrado, usando campos por defecto")
                 return self.get_default_fields(entity_name)
             
-            content = entity_file.read_text(encoding='utf-8')
-            fields = []
-            
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                # Buscar propiedades públicas NO virtuales (ej: public string? Nombre { get; set; })
-                if line.startswith('public ') and '{ get; set; }' in line and 'virtual' not in line:
-                    # Extraer nombre de propiedad
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        prop_name = parts[2].replace('?', '').replace(' ', '')
-                        type_name = parts[1].replace('?', '')
-                        
-                        # Filtrar propiedades base (heredadas) y navegación
-                        base_props = ['Id', 'OrganizationId', 'FechaCreacion', 'FechaModificacion', 
-                                    'CreadorId', 'ModificadorId', 'Active']
-                        
-                        if prop_name not in base_props:
-                            fields.append({
-                                'name': prop_name,
-                                'type': type_name,
-                                'is_nullable': '?' in parts[1]
-                            })
-            
             if not fields:
                 return self.get_default_fields(entity_name)
             
@@ -68,29 +45,8 @@ class ViewManagerGenerator:
     def detect_navigation_properties(self, entity_name):
         """Detectar propiedades de navegación reales del modelo"""
         try:
-            entity_file = self.root_path / "Shared.Models" / "Entities" / f"{entity_name}.cs"
-            
-            if not entity_file.exists():
-                return {}
-            
-            content = entity_file.read_text(encoding='utf-8')
-            navigation_props = {}
-            
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                # Buscar propiedades virtuales (navegación): public virtual EntityName? PropName { get; set; }
-                if line.startswith('public virtual ') and '{ get; set; }' in line and 'ICollection' not in line:
-                    # Extraer información
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        entity_type = parts[2].replace('?', '').replace(' ', '')  # "Areas", "Centrodecosto"
-                        prop_name = parts[3].replace('?', '').replace(' ', '')   # "Area", "Centrodecosto", etc.
-                        
-                        # Mapear: nombre de entidad → nombre real de propiedad
-                        navigation_props[entity_type] = prop_name
-            
-            return navigation_props
+            # Mapear: nombre de entidad → nombre real de propiedad ("Areas" -> "Area")
+            return {nav.target_type: nav.name for nav in self.model_index.get_navigations(entity_name)}
             
         except Exception as e:
             return {}
@@ -158,20 +114,15 @@ class ViewManagerGenerator:
         if field_name.lower() == 'descripcion':
             sortable = "false"
         
-        # Template base - usar placeholder temporal
-        config = f"""new ColumnConfig<Shared.Models.Entities.ENTITY_NAME_PLACEHOLDER>
-                    {{
-                        Property = "{field_name}",
-                        Title = "{title}",
-                        Width = "{width}",
-                        Sortable = {sortable},
-                        Filterable = {filterable},
-                        TextAlign = TextAlign.Left,
-                        Visible = true,
-                        Order = {order}
-                    }}"""
-        
-        return config
+        return {
+            'property': field_name,
+            'title': title,
+            'width': width,
+            'sortable': sortable,
+            'filterable': filterable,
+            'text_align': 'TextAlign.Left',
+            'order': order
+        }
     
     def generate_from_config(self, config):
         """Generar configuraciones desde config parseado de grid_fields"""
@@ -228,19 +179,15 @@ class ViewManagerGenerator:
             }
             text_align = align_map.get(grid_field.align.value, 'TextAlign.Left')
             
-            config_text = f"""new ColumnConfig<Shared.Models.Entities.ENTITY_NAME_PLACEHOLDER>
-                    {{
-                        Property = "{property_name}",
-                        Title = "{title}",
-                        Width = "{grid_field.width}",
-                        Sortable = {sortable},
-                        Filterable = {filterable},
-                        TextAlign = {text_align},
-                        Visible = true,
-                        Order = {order}
-                    }}"""
-            
-            column_configs.append(config_text)
+            column_configs.append({
+                'property': property_name,
+                'title': title,
+                'width': grid_field.width,
+                'sortable': sortable,
+                'filterable': filterable,
+                'text_align': text_align,
+                'order': order
+            })
             order += 1
         
         return column_configs, includes, primary_field
@@ -289,20 +236,14 @@ class ViewManagerGenerator:
             variables.update({
                 'PRIMARY_FIELD': primary_field,
                 'PRIMARY_FIELD_TITLE': primary_field,
-                'COLUMN_CONFIGS': ',\n                    '.join(column_configs),
-                'INCLUDES': '\n                    '.join(includes) if includes else ''
+                'COLUMNS': column_configs,
+                'INCLUDES': includes
             })
             
-            # Renderizar template
-            viewmanager_content = self.template_engine.render_template("frontend/services/viewmanager.cs.template", variables)
-            
-            # Reemplazar placeholder final
-            viewmanager_content = viewmanager_content.replace("ENTITY_NAME_PLACEHOLDER", entity_name)
-            
-            # Escribir archivo
+            # Renderizar template directo al archivo (solo escribe si cambió)
             viewmanager_file = module_path / f"{entity_name}ViewManager.cs"
-            viewmanager_file.write_text(viewmanager_content, encoding='utf-8')
-            print(f"✅ {entity_name}ViewManager.cs generado")
+            changed = self.template_engine.render_to_file("frontend/services/viewmanager.cs.template", variables, viewmanager_file)
+            print(f"✅ {entity_name}ViewManager.cs generado" + ("" if changed else " (sin cambios)"))
             return True
             
         except Exception as e:
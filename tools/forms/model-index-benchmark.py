@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Model Index Benchmark - Parser de declaraciones C# sobre un árbol sintético
+Genera N entidades con atributos, `required`, `init`, colecciones genéricas y
+declaraciones multilínea, y compara el parser del ModelIndex con la detección
+anterior basada en split de líneas (tiempo y propiedades detectadas).
+
+Usage:
+    python tools/forms/model-index-benchmark.py
+    python tools/forms/model-index-benchmark.py --entities 5000
+"""
+
+import sys
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# Configurar encoding UTF-8 para Windows
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from shared.model_index import ModelIndex, BASE_PROPERTIES
+
+MODULES = ['Ventas', 'Inventario', 'Compras', 'Rrhh', 'Finanzas']
+SCALAR_TYPES = ['string', 'int', 'decimal', 'DateTime', 'bool', 'Guid']
+
+
+def build_entity(index, rng):
+    """Código de una entidad sintética; devuelve (código, campos esperados, navegaciones esperadas)"""
+    name = f"Entidad{index:05d}"
+    other = f"Entidad{rng.randrange(max(index, 1)):05d}"
+    lines = [
+        "using System;",
+        "using System.Collections.Generic;",
+        "",
+        "namespace Shared.Models.Entities;",
+        "",
+        f"public partial class {name}",
+        "{",
+        "    public Guid Id { get; set; }",
+        "    public Guid? OrganizationId { get; set; }",
+        "    public bool Active { get; set; }",
+    ]
+    fields = []
+    for number in range(rng.randint(6, 14)):
+        field_type = rng.choice(SCALAR_TYPES)
+        field_name = f"Campo{number}"
+        nullable = '?' if rng.random() < 0.5 else ''
+        style = rng.randrange(5)
+        if style == 0:
+            lines.append(f"    [StringLength(100)]\n    [Display(Name = \"{field_name}\")]")
+            lines.append(f"    public {field_type}{nullable} {field_name} {{ get; set; }}")
+        elif style == 1:
+            lines.append(f"    public required {field_type}{nullable} {field_name} {{ get; init; }}")
+        elif style == 2:
+            lines.append(f"    public {field_type}{nullable}\n        {field_name}\n    {{\n        get;\n        set;\n    }}")
+        elif style == 3:
+            lines.append(f"    [Required] public {field_type}{nullable} {field_name} {{ get; set; }} = default!;")
+        else:
+            lines.append(f"    public {field_type}{nullable} {field_name} {{ get; set; }}")
+        fields.append(field_name)
+    lines.append(f"    public virtual {other}? Referencia {{ get; set; }}")
+    lines.append(f"    public virtual ICollection<{other}> Detalles {{ get; set; }} = new List<{other}>();")
+    lines.append(f"    public Dictionary<string, List<int>> Extra {{ get; set; }} = new();")
+    lines.append("}")
+    return name, "\n".join(lines) + "\n", fields + ['Extra'], 1
+
+
+def build_tree(root, count, seed):
+    rng = random.Random(seed)
+    entities_path = root / "Shared.Models" / "Entities"
+    expected = {}
+    for index in range(count):
+        name, code, fields, navigations = build_entity(index, rng)
+        folder = entities_path / rng.choice(MODULES) if index % 3 else entities_path
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"{name}.cs").write_text(code, encoding='utf-8')
+        expected[name] = (fields, navigations)
+    return expected
+
+
+def legacy_detect(entity_file):
+    """Detección anterior de ViewManagerGenerator (split por espacios + '{ get; set; }')"""
+    fields, navigations = [], {}
+    for line in entity_file.read_text(encoding='utf-8').split('\n'):
+        line = line.strip()
+        if line.startswith('public ') and '{ get; set; }' in line and 'virtual' not in line:
+            parts = line.split()
+            if len(parts) >= 3:
+                prop_name = parts[2].replace('?', '').replace(' ', '')
+                if prop_name not in BASE_PROPERTIES:
+                    fields.append(prop_name)
+        if line.startswith('public virtual ') and '{ get; set; }' in line and 'ICollection' not in line:
+            parts = line.split()
+            if len(parts) >= 4:
+                navigations[parts[2].replace('?', '')] = parts[3].replace('?', '')
+    return fields, navigations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del parser de declaraciones C# del ModelIndex')
+    parser.add_argument('--entities', type=int, default=1000, help='Entidades sintéticas (default: 1000)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        expected = build_tree(root, args.entities, args.seed)
+        print(f"⏱️ Árbol sintético: {args.entities} entidades")
+
+        # Detección anterior
+        start = time.perf_counter()
+        legacy_ok = 0
+        for cs_file in (root / "Shared.Models" / "Entities").rglob("*.cs"):
+            fields, navigations = legacy_detect(cs_file)
+            expected_fields, expected_navs = expected[cs_file.stem]
+            legacy_ok += fields == expected_fields and len(navigations) == expected_navs
+        legacy_time = time.perf_counter() - start
+
+        # ModelIndex (un escaneo + un parse por archivo)
+        start = time.perf_counter()
+        index = ModelIndex(root)
+        parser_ok = 0
+        for name in index.entity_names():
+            fields = [field['name'] for field in index.get_fields(name)]
+            navigations = index.get_navigations(name)
+            expected_fields, expected_navs = expected[name]
+            parser_ok += fields == expected_fields and len(navigations) == expected_navs
+        parser_time = time.perf_counter() - start
+
+        # Segunda pasada: todo sale del caché del índice
+        start = time.perf_counter()
+        for name in index.entity_names():
+            index.get_fields(name)
+            index.get_navigations(name)
+        cached_time = time.perf_counter() - start
+
+    total = len(expected)
+    print(f"   Split de líneas: {legacy_time * 1000:.1f} ms, entidades correctas {legacy_ok}/{total}")
+    print(f"   ModelIndex:      {parser_time * 1000:.1f} ms, entidades correctas {parser_ok}/{total} "
+          f"({parser_time / total * 1e6:.0f} µs/entidad)")
+    print(f"   ModelIndex (caché): {cached_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,126 @@
 🔗 Entity Registration Script
 Registra automáticamente nuevas entidades en el sistema de Custom Fields
 Se llama desde entity-generator.py cuando se crea una nueva entidad con --target todo
+
+Las entidades registradas se guardan en Frontend/Services/registered-entities.json
+y se generan en un único partial Frontend/Services/RegisteredEntities.g.cs
+(EntityRegistrationService.RegisterGeneratedEntities), en una sola escritura.
+
+Usage:
+    python register_entity.py Empleado Core.RRHH
+    python register_entity.py --batch entities-urls.json
+    python register_entity.py --batch entities-urls.json --api http://localhost:5240
+    python register_entity.py --regenerate
 """
 
 import sys
 import os
+import re
 import json
-import requests
 from pathlib import Path
 
+from registration_client import EntityRegistrationClient
+from shared.model_index import ModelIndex
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SERVICES_PATH = PROJECT_ROOT / "Frontend" / "Services"
+MANIFEST_FILE = SERVICES_PATH / "registered-entities.json"
+GENERATED_FILE = SERVICES_PATH / "RegisteredEntities.g.cs"
+MANIFEST_VERSION = 1
+# CustomFields.API: EntityRegistrationController (solo en Development)
+DEFAULT_API_URL = "http://localhost:5240"
+
+_NAMESPACE_PATTERN = re.compile(r'^\s*namespace\s+([\w.]+)', re.MULTILINE)
+
+
+class ServiceIndex:
+    """
+    Índice de los *Service.cs del Frontend.
+    El árbol se recorre una sola vez (al primer lookup) y cada entidad se
+    resuelve contra el índice en memoria.
+    """
+
+    def __init__(self, frontend_path=None):
+        self.frontend_path = Path(frontend_path or PROJECT_ROOT / "Frontend")
+        self._services = None
+
+    def _build(self):
+        services = []
+        if self.frontend_path.exists():
+            for path in self.frontend_path.rglob("*Service.cs"):
+                if 'bin' in path.parts or 'obj' in path.parts:
+                    continue
+                services.append((path.stem, path))
+        self._services = sorted(services, key=lambda item: (item[0], str(item[1])))
+
+    def lookup(self, entity_name):
+        """Tipo del servicio específico de la entidad (con namespace), o None"""
+        if self._services is None:
+            self._build()
+
+        # Mismo orden de preferencia que antes: *{Entidad}Service.cs y luego *{Entidad}*Service.cs
+        matchers = (
+            lambda stem: stem.endswith(f"{entity_name}Service"),
+            lambda stem: entity_name in stem[:-len("Service")],
+        )
+        for matches in matchers:
+            for stem, path in self._services:
+                if matches(stem):
+                    return self._qualified_name(stem, path)
+        return None
+
+    @staticmethod
+    def _qualified_name(stem, path):
+        try:
+            namespace = _NAMESPACE_PATTERN.search(path.read_text(encoding='utf-8'))
+        except OSError:
+            namespace = None
+        return f"{namespace.group(1)}.{stem}" if namespace else stem
+
+
 class EntityRegistrationAPI:
     """API para registrar entidades en el sistema Custom Fields"""
 
-    def __init__(self, base_url="http://localhost:5000"):
-        self.base_url = base_url
-        self.api_url = f"{base_url}/api/entity-registration"
-
-    def register_entity(self, entity_name, module_path, display_property=None, search_fields=None, backend_api=None):
+    def __init__(self, base_url=DEFAULT_API_URL, manifest_file=None, generated_file=None, use_api=False):
+        self.base_url = base_url.rstrip('/')
+        self.api_url = f"{self.base_url}/api/entity-registration"
+        self.manifest_file = Path(manifest_file or MANIFEST_FILE)
+        self.generated_file = Path(generated_file or GENERATED_FILE)
+        self.service_index = ServiceIndex()
+        self.model_index = ModelIndex(PROJECT_ROOT)
+        # use_api: registrar también en el backend en ejecución (sin rebuild ni reinicio)
+        self.use_api = use_api
+        self.client = EntityRegistrationClient(self.api_url) if use_api else None
+
+    def build_payload(self, entity_name, module_path, display_property=None, search_fields=None, backend_api=None,
+                      full_text_fields=None):
+        """Payload de registro con display property, search fields y backend auto-detectados si faltan"""
+        # Auto-detectar display property si no se especifica
+        if display_property is None:
+            display_property = self._detect_display_property(entity_name)
+
+        # Auto-detectar search fields si no se especifican
+        if search_fields is None:
+            search_fields = self._detect_search_fields(entity_name, display_property)
+
+        # Determinar backend API automáticamente si no se especifica
+        if backend_api is None:
+            backend_api = self._determine_backend_api(module_path)
+
+        payload = {
+            "entityName": entity_name,
+            "modulePath": module_path,
+            "displayProperty": display_property,
+            "searchFields": list(search_fields),
+            "backendApi": backend_api
+        }
+        # Campos con índice full-text (table.py --fulltext): el backend puede usar CONTAINS
+        if full_text_fields:
+            payload["fullTextFields"] = list(full_text_fields)
+        return payload
+
+    def register_entity(self, entity_name, module_path, display_property=None, search_fields=None, backend_api=None,
+                        full_text_fields=None):
         """
         Registrar una nueva entidad en el sistema
 
@@ -29,43 +133,108 @@ class EntityRegistrationAPI:
             display_property: Propiedad para mostrar (ej: "NombreCompleto")
             search_fields: Lista de campos searchables
             backend_api: API Backend a usar (ej: "MainBackend", "FormBackend")
+            full_text_fields: Campos con índice full-text (opcional)
         """
         try:
-            # Auto-detectar display property si no se especifica
-            if display_property is None:
-                display_property = self._detect_display_property(entity_name)
-
-            # Auto-detectar search fields si no se especifican
-            if search_fields is None:
-                search_fields = self._detect_search_fields(entity_name, display_property)
-
-            # Determinar backend API automáticamente si no se especifica
-            if backend_api is None:
-                backend_api = self._determine_backend_api(module_path)
-
-            payload = {
-                "entityName": entity_name,
-                "modulePath": module_path,
-                "displayProperty": display_property,
-                "searchFields": search_fields,
-                "backendApi": backend_api
-            }
+            payload = self.build_payload(entity_name, module_path, display_property, search_fields, backend_api,
+                                         full_text_fields)
 
             print(f"🔗 Registrando entidad '{entity_name}' en Custom Fields...")
             print(f"   📁 Módulo: {module_path}")
-            print(f"   👁️ Display Property: {display_property}")
+            print(f"   👁️ Display Property: {payload['displayProperty']}")
             print(f"   🔍 Search Fields: {', '.join(payload['searchFields'])}")
-            print(f"   🖥️ Backend API: {backend_api}")
-
-            # En un entorno real, esto haría una llamada HTTP a la API
-            # Por ahora, simularemos el registro escribiendo a un archivo de configuración
+            print(f"   🖥️ Backend API: {payload['backendApi']}")
+            if payload.get('fullTextFields'):
+                print(f"   🔎 Full-text: {', '.join(payload['fullTextFields'])}")
 
-            return self._write_to_config_file(payload)
+            return self.register_entities([payload])
 
         except Exception as e:
             print(f"❌ Error registrando entidad '{entity_name}': {e}")
             return False
 
+    def register_entities(self, payloads):
+        """
+        Registrar varias entidades en una pasada: se actualiza el manifest
+        (registered-entities.json) y se regenera RegisteredEntities.g.cs una sola vez.
+        Con use_api las entidades se envían además al backend en lotes; si el API no
+        está disponible queda solo el registro por archivo (requiere rebuild).
+        """
+        try:
+            manifest = self.load_manifest()
+            counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+
+            for payload in payloads:
+                status = self._upsert(manifest, payload)
+                counts[status] += 1
+                if status == 'unchanged':
+                    print(f"⚠️ La entidad '{payload['entityName']}' ya está registrada")
+
+            if self.use_api:
+                self._register_via_api([manifest[payload["entityName"]] for payload in payloads])
+
+            if counts['added'] or counts['updated']:
+                self.save_manifest(manifest)
+            generated = self.generate_registrations(manifest)
+
+            print(f"✅ Registro: {counts['added']} nuevas, {counts['updated']} actualizadas, "
+                  f"{counts['unchanged']} sin cambios")
+            if generated:
+                print(f"✅ {self.generated_file.name} regenerado ({len(manifest)} entidades)")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error escribiendo registro de entidades: {e}")
+            return False
+
+    def _register_via_api(self, entries):
+        print(f"🌐 Registrando {len(entries)} entidades en {self.api_url}...")
+        try:
+            registered = self.client.register_batch(entries)
+        finally:
+            self.client.close()
+
+        if registered:
+            print(f"✅ Registradas en system_form_entities ({self.client.requests_sent} peticiones); "
+                  f"el Frontend las carga al iniciar o con RefreshEntitiesFromDatabaseAsync, sin rebuild")
+        else:
+            print("⚠️ API de registro no disponible: se usa solo el registro por archivo (requiere rebuild)")
+        return registered
+
+    def _upsert(self, manifest, payload):
+        """Agregar o actualizar la entrada; el servicio se resuelve contra el índice solo si falta"""
+        entity_name = payload["entityName"]
+        current = manifest.get(entity_name)
+
+        entry = dict(payload)
+        service_type = payload.get("serviceType") or (current or {}).get("serviceType")
+        if not service_type:
+            service_type = self._detect_service_type(entity_name)
+        entry["serviceType"] = service_type
+
+        if current == entry:
+            return 'unchanged'
+        manifest[entity_name] = entry
+        return 'updated' if current else 'added'
+
+    def load_manifest(self):
+        """{entityName: entrada} desde registered-entities.json"""
+        if not self.manifest_file.exists():
+            return {}
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {entry["entityName"]: entry for entry in data.get("entities", [])}
+
+    def save_manifest(self, manifest):
+        data = {
+            "version": MANIFEST_VERSION,
+            "entities": [manifest[name] for name in sorted(manifest, key=str.lower)]
+        }
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
     def _determine_backend_api(self, module_path):
         """
         Determinar automáticamente qué backend API usar basado en el módulo
@@ -90,101 +259,75 @@ class EntityRegistrationAPI:
             # Default para módulos personalizados
             return "GlobalBackend"   # Cambiar MainBackend por GlobalBackend
 
-    def _write_to_config_file(self, payload):
-        """
-        Escribir configuración directamente al código C# de EntityRegistrationService
-        """
-        try:
-            service_file = Path(__file__).parent.parent.parent / "Frontend" / "Services" / "EntityRegistrationService.cs"
-
-            if not service_file.exists():
-                print(f"❌ Error: No se encontró {service_file}")
-                return False
-
-            # Leer archivo actual
-            with open(service_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Generar código C# para la nueva entidad
-            entity_name = payload["entityName"]
-            entity_lower = entity_name.lower()
-            display_property = payload["displayProperty"]
-            search_fields = payload["searchFields"]
-
-            # Detectar si la entidad tiene servicio específico o usar genérico
-            service_type = self._detect_service_type(entity_name)
-
-            # Generar código de configuración
-            config_code = f'''
-            // {entity_name}
-            var {entity_lower}Config = new EntityConfiguration
-            {{
-                EntityType = typeof(Shared.Models.Entities.{entity_name}),
-                ServiceType = typeof({service_type}),
-                DisplayProperty = "{display_property}",
-                ValueProperty = "Id",
-                SearchFields = new[] {{ {", ".join(f'"{field}"' for field in search_fields)} }},
-                EnableCache = true
-            }};
-            RegisterEntity("{entity_lower}", {entity_lower}Config);'''
-
-            # Buscar el punto de inserción en RegisterKnownEntities
-            marker = "// ===== ENTIDADES DEL SISTEMA ====="
-
-            if marker in content:
-                # Verificar si ya existe la entidad
-                entity_marker = f"// {entity_name}"
-                if entity_marker in content:
-                    print(f"⚠️ La entidad '{entity_name}' ya está registrada")
-                    return True
-
-                # Insertar antes del marcador de entidades del sistema
-                content = content.replace(marker, config_code + f"\n\n            {marker}")
-
-                # Escribir archivo actualizado
-                with open(service_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-
-                print(f"✅ Entidad '{entity_name}' agregada al EntityRegistrationService.cs")
-                return True
-            else:
-                print(f"❌ Error: No se encontró el marcador de inserción en {service_file}")
-                return False
-
-        except Exception as e:
-            print(f"❌ Error escribiendo código C#: {e}")
-            return False
+    def render_registrations(self, manifest):
+        """Código C# de RegisteredEntities.g.cs para todas las entidades del manifest"""
+        blocks = []
+        for name in sorted(manifest, key=str.lower):
+            entry = manifest[name]
+            entity_name = entry["entityName"]
+            search_fields = ", ".join(f'"{field}"' for field in entry["searchFields"])
+            full_text = ""
+            if entry.get("fullTextFields"):
+                full_text_fields = ", ".join(f'"{field}"' for field in entry["fullTextFields"])
+                full_text = f"\n            FullTextFields = new[] {{ {full_text_fields} }},"
+            blocks.append(f'''        // {entity_name}
+        RegisterEntity("{entity_name.lower()}", new EntityConfiguration
+        {{
+            EntityType = typeof(Shared.Models.Entities.{entity_name}),
+            ServiceType = typeof({entry["serviceType"]}),
+            DisplayProperty = "{entry["displayProperty"]}",
+            ValueProperty = "Id",
+            SearchFields = new[] {{ {search_fields} }},{full_text}
+            EnableCache = true
+        }});''')
+
+        body = "\n\n".join(blocks) or "        // Sin entidades registradas"
+        return f'''// <auto-generated>
+// Generado por tools/forms/register_entity.py desde {self.manifest_file.name}. No editar a mano.
+// </auto-generated>
+
+namespace Frontend.Services;
+
+public partial class EntityRegistrationService
+{{
+    /// <summary>
+    /// Entidades de dominio registradas con tools/forms/register_entity.py
+    /// </summary>
+    partial void RegisterGeneratedEntities()
+    {{
+{body}
+    }}
+}}
+'''
+
+    def generate_registrations(self, manifest=None):
+        """Escribir RegisteredEntities.g.cs (una escritura, solo si cambia); True si se escribió"""
+        if manifest is None:
+            manifest = self.load_manifest()
+        # CRLF como el resto de los .cs del Frontend, en cualquier sistema operativo
+        content = self.render_registrations(manifest).replace("\n", "\r\n")
+
+        if self.generated_file.exists():
+            with open(self.generated_file, 'r', encoding='utf-8', newline='') as f:
+                if f.read() == content:
+                    return False
+
+        with open(self.generated_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return True
 
     def _detect_service_type(self, entity_name):
         """
         Detectar si existe un servicio específico o usar GenericEntityService
         """
-        try:
-            # Buscar servicio específico en Frontend/Services o Frontend/Modules
-            frontend_path = Path(__file__).parent.parent.parent / "Frontend"
-
-            # Patrones de búsqueda para servicios específicos
-            service_patterns = [
-                f"*{entity_name}Service.cs",
-                f"*{entity_name}*Service.cs"
-            ]
-
-            for pattern in service_patterns:
-                matches = list(frontend_path.rglob(pattern))
-                if matches:
-                    # Intentar extraer el nombre del servicio del archivo
-                    service_file = matches[0]
-                    service_name = service_file.stem  # Nombre sin extensión
-                    print(f"🔍 Servicio específico encontrado: {service_name}")
-                    return service_name
-
-            # Si no se encuentra servicio específico, usar genérico
-            print(f"🔧 Usando servicio genérico para {entity_name}")
-            return f"GenericEntityService<Shared.Models.Entities.{entity_name}>"
+        service_name = self.service_index.lookup(entity_name)
+        if service_name:
+            print(f"🔍 Servicio específico encontrado: {service_name}")
+            return service_name
 
-        except Exception as e:
-            print(f"⚠️ Error detectando servicio para {entity_name}: {e}")
-            return f"GenericEntityService<Shared.Models.Entities.{entity_name}>"
+        # Si no se encuentra servicio específico, usar genérico
+        print(f"🔧 Usando servicio genérico para {entity_name}")
+        return f"GenericEntityService<Shared.Models.Entities.{entity_name}>"
 
     def _detect_display_property(self, entity_name):
         """
@@ -241,6 +384,9 @@ class EntityRegistrationAPI:
                 if display_property not in search_fields:
                     search_fields.insert(0, display_property)
 
+                # Columnas de búsqueda normalizada (searchable_normalized): buscar sin acentos ni mayúsculas
+                search_fields = [self.model_index.search_property(entity_name, prop) for prop in search_fields]
+
             # Si no se encontraron, usar defaults
             if not search_fields:
                 search_fields = [display_property] if display_property != "Name" else ["Name", "Nombre"]
@@ -252,13 +398,85 @@ class EntityRegistrationAPI:
             print(f"⚠️ Error auto-detectando SearchFields: {e}")
             return [display_property] if display_property else ["Name", "Nombre"]
 
+def load_batch_file(batch_file):
+    """
+    Entidades a registrar desde JSON: lista de objetos con entityName/modulePath
+    (y opcionalmente displayProperty, searchFields, backendApi) o el formato de
+    entities-urls.json (entidad/modulo)
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("entities", [])
+
+    entries = []
+    for item in data:
+        entity_name = item.get("entityName") or item.get("entidad")
+        module_path = item.get("modulePath") or item.get("modulo")
+        if not entity_name or not module_path:
+            print(f"⚠️ Entrada ignorada (falta entidad o módulo): {item}")
+            continue
+        entries.append({
+            "entity_name": entity_name,
+            "module_path": module_path,
+            "display_property": item.get("displayProperty"),
+            "search_fields": item.get("searchFields"),
+            "backend_api": item.get("backendApi"),
+        })
+    return entries
+
+
+def main_batch(batch_file, api_base_url=None):
+    """Registrar todas las entidades de un JSON con una sola escritura de RegisteredEntities.g.cs"""
+    registrator = create_registrator(api_base_url)
+    entries = load_batch_file(batch_file)
+    print(f"🔗 Registrando {len(entries)} entidades desde {batch_file}...")
+
+    payloads = [registrator.build_payload(**entry) for entry in entries]
+    if not registrator.register_entities(payloads):
+        sys.exit(1)
+
+
+def create_registrator(api_base_url=None):
+    if api_base_url:
+        return EntityRegistrationAPI(base_url=api_base_url, use_api=True)
+    return EntityRegistrationAPI()
+
+
+def extract_api_option(argv):
+    """Quitar '--api [url]' de argv; retorna (argv, base_url o None)"""
+    if "--api" not in argv:
+        return argv, None
+    index = argv.index("--api")
+    base_url = DEFAULT_API_URL
+    remaining = argv[:index] + argv[index + 1:]
+    if index + 1 < len(argv) and argv[index + 1].startswith("http"):
+        base_url = argv[index + 1]
+        remaining = argv[:index] + argv[index + 2:]
+    return remaining, base_url
+
+
 def main():
     """Main function para uso desde línea de comandos"""
+    sys.argv, api_base_url = extract_api_option(sys.argv)
+
+    if len(sys.argv) == 3 and sys.argv[1] == "--batch":
+        main_batch(sys.argv[2], api_base_url)
+        return
+    if len(sys.argv) == 2 and sys.argv[1] == "--regenerate":
+        registrator = EntityRegistrationAPI()
+        written = registrator.generate_registrations()
+        print(f"✅ {registrator.generated_file.name} {'regenerado' if written else 'sin cambios'}")
+        return
+
     if len(sys.argv) < 3:
         print("❌ ERROR: Uso incorrecto")
         print("💡 Uso: python register_entity.py <entity_name> <module_path> [display_property] [backend_api] [search_fields...]")
         print("📝 Ejemplo: python register_entity.py Empleado Core.RRHH NombreCompleto GlobalBackend Nombre Apellido Email")
         print("🤖 Backend API se auto-detecta si no se especifica")
+        print("📦 Registro masivo: python register_entity.py --batch entidades.json")
+        print(f"🌐 En caliente contra el backend: agregar --api [{DEFAULT_API_URL}]")
+        print("🔄 Regenerar RegisteredEntities.g.cs: python register_entity.py --regenerate")
         sys.exit(1)
 
     entity_name = sys.argv[1]
@@ -277,7 +495,7 @@ def main():
     search_fields = sys.argv[search_fields_start:] if len(sys.argv) > search_fields_start else None
 
     # Crear registrador
-    registrator = EntityRegistrationAPI()
+    registrator = create_registrator(api_base_url)
 
     # Registrar entidad
     success = registrator.register_entity(
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🌐 Entity Registration Client
+Cliente HTTP para /api/entity-registration
+
+Registra muchas entidades en pocas peticiones (lotes de batch_size) sobre una
+sesión keep-alive, con reintentos y backoff exponencial ante errores de red o
+respuestas 502/503/504. Si el API no responde, register_batch retorna False y
+register_entity.py continúa con el registro por archivo.
+
+Contrato (implementado por CustomFields.API EntityRegistrationController, solo en
+Development, que hace upsert en system_form_entities; registration_stub_server.py
+lo imita para pruebas):
+    POST {api_url}/batch   {"entities": [payload, ...]}
+    -> 200 {"registered": n, "failed": [{"entityName": ..., "error": ...}]}
+
+Usage:
+    client = EntityRegistrationClient("http://localhost:5240/api/entity-registration")
+    if not client.register_batch(payloads):
+        ...  # fallback
+"""
+
+import time
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 10
+RETRY_STATUS = (502, 503, 504)
+
+
+class EntityRegistrationClient:
+    """Registro en caliente de entidades contra el backend en ejecución"""
+
+    def __init__(self, api_url, batch_size=DEFAULT_BATCH_SIZE, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT):
+        self.api_url = api_url.rstrip('/')
+        self.batch_size = max(1, batch_size)
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.requests_sent = 0
+        self._session = None
+
+    @property
+    def available(self):
+        return REQUESTS_AVAILABLE
+
+    @property
+    def session(self):
+        # Una sola sesión: la conexión TCP se reutiliza entre lotes (keep-alive)
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({'Content-Type': 'application/json', 'Connection': 'keep-alive'})
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _post(self, url, body):
+        """POST con reintentos; retorna la respuesta o None si el API no está disponible"""
+        for attempt in range(self.retries):
+            try:
+                self.requests_sent += 1
+                response = self.session.post(url, json=body, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                reason = type(e).__name__
+
+            if attempt < self.retries - 1:
+                delay = self.backoff * (2 ** attempt)
+                print(f"   ⏳ {reason}, reintentando en {delay:.1f}s ({attempt + 1}/{self.retries - 1})")
+                time.sleep(delay)
+            else:
+                print(f"   ❌ {reason} tras {self.retries} intentos")
+        return None
+
+    def register_batch(self, payloads):
+        """
+        Registrar todas las entidades en lotes de batch_size.
+        True si el API aceptó todos los lotes; False si no está disponible o rechazó alguno.
+        """
+        if not REQUESTS_AVAILABLE:
+            print("⚠️ 'requests' no está instalado, no se puede usar el API de registro")
+            return False
+
+        payloads = list(payloads)
+        failed = []
+        for start in range(0, len(payloads), self.batch_size):
+            batch = payloads[start:start + self.batch_size]
+            response = self._post(f"{self.api_url}/batch", {"entities": batch})
+            if response is None:
+                return False
+            if not response.ok:
+                print(f"   ❌ El API rechazó el lote: HTTP {response.status_code} {response.text[:200]}")
+                return False
+
+            try:
+                result = response.json()
+            except ValueError:
+                result = {}
+            failed.extend(result.get("failed", []))
+
+        for item in failed:
+            print(f"   ⚠️ {item.get('entityName')}: {item.get('error', 'no registrada')}")
+        return not failed
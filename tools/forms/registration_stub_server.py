@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 Entity Registration Stub Server
+Servidor local que implementa el contrato de /api/entity-registration para
+probar register_entity.py --api sin levantar el backend.
+
+    POST /api/entity-registration          {payload}                 -> registra una entidad
+    POST /api/entity-registration/batch    {"entities": [payload...]} -> registra un lote
+    GET  /api/entity-registration          -> {"entities": [...], "requests": n}
+
+HTTP/1.1 con keep-alive. --fail-first N responde 503 a las primeras N
+peticiones para probar los reintentos.
+
+Usage:
+    python tools/forms/registration_stub_server.py --port 5055
+    python tools/forms/register_entity.py --batch entities-urls.json --api http://localhost:5055
+"""
+
+import sys
+import json
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PATH = "/api/entity-registration"
+
+
+class RegistrationStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_first=0):
+        super().__init__(address, RegistrationStubHandler)
+        self.entities = {}
+        self.requests = 0
+        self.connections = 0
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+
+
+class RegistrationStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') != API_PATH:
+            self._send(404, {"error": "not found"})
+            return
+        with self.server.lock:
+            body = {"entities": list(self.server.entities.values()), "requests": self.server.requests}
+        self._send(200, body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length)
+
+        with self.server.lock:
+            self.server.requests += 1
+            failing = self.server.requests <= self.server.fail_first
+        if failing:
+            self._send(503, {"error": "stub: fallo simulado"})
+            return
+
+        path = self.path.rstrip('/')
+        if path not in (API_PATH, f"{API_PATH}/batch"):
+            self._send(404, {"error": "not found"})
+            return
+
+        try:
+            body = json.loads(raw or b'{}')
+        except json.JSONDecodeError:
+            self._send(400, {"error": "JSON inválido"})
+            return
+
+        entities = body.get("entities", []) if path.endswith("/batch") else [body]
+        registered, failed = 0, []
+        with self.server.lock:
+            for entity in entities:
+                name = entity.get("entityName")
+                if not name:
+                    failed.append({"entityName": name, "error": "entityName requerido"})
+                    continue
+                self.server.entities[name.lower()] = entity
+                registered += 1
+        self._send(200, {"registered": registered, "failed": failed})
+
+
+def start_stub_server(port=0, fail_first=0):
+    """Levantar el stub en un hilo; retorna el servidor (server.server_address[1] es el puerto)"""
+    server = RegistrationStubServer(("127.0.0.1", port), fail_first)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local de /api/entity-registration")
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--fail-first', type=int, default=0, help='Responder 503 a las primeras N peticiones')
+    args = parser.parse_args()
+
+    server = RegistrationStubServer(("127.0.0.1", args.port), args.fail_first)
+    print(f"🧪 Stub de registro escuchando en http://127.0.0.1:{args.port}{API_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n✅ {len(server.entities)} entidades registradas en {server.requests} peticiones")
+        server.server_close()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 C# Declaration Parser
+Parser liviano de declaraciones C# para los modelos de Shared.Models
+
+Recorre cada archivo una sola vez (tokenizer + parser lineal) y extrae clases,
+propiedades, campos, atributos y propiedades de navegación. Soporta atributos,
+`required`, `init`, genéricos anidados, valores por defecto y declaraciones
+repartidas en varias líneas. No es un compilador: cuerpos de métodos y
+expresiones se saltan sin analizarlos.
+"""
+
+import re
+from bisect import bisect_right
+from pathlib import Path
+
+# Tokens: espacios, comentarios y directivas se consumen como prefijo de cada token;
+# strings completos para no confundir llaves/corchetes dentro de literales
+_TOKEN_RE = re.compile(r'''
+    (?:\s+|//[^\n]*|/\*.*?\*/|\#[^\n]*)*
+    (?:
+        (?P<string>@"(?:[^"]|"")*"|\$?@?"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+      | (?P<ident>@?[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<number>\d[\w.]*)
+      | (?P<op>=>|\?\?|::|[{}\[\]()<>;,.=?:!&|+\-*/%^~])
+      | (?P<other>[^\s])
+      | (?P<end>\s*$)
+    )''', re.X | re.S)
+
+_ATTRIBUTE_TARGET_RE = re.compile(r'^(?:assembly|module|return|field|property|type|method|param)\s*:\s*')
+
+_MODIFIERS = {
+    'public', 'private', 'protected', 'internal', 'static', 'virtual', 'override',
+    'abstract', 'sealed', 'readonly', 'required', 'new', 'partial', 'const',
+    'volatile', 'extern', 'unsafe', 'async', 'file'
+}
+
+_TYPE_KEYWORDS = {'class', 'record', 'struct', 'interface', 'enum'}
+
+_PRIMITIVE_TYPES = {
+    'string', 'String', 'int', 'Int32', 'long', 'Int64', 'short', 'byte', 'bool', 'Boolean',
+    'decimal', 'Decimal', 'double', 'float', 'char', 'object', 'Guid', 'DateTime',
+    'DateTimeOffset', 'DateOnly', 'TimeOnly', 'TimeSpan'
+}
+
+_COLLECTION_TYPES = {
+    'ICollection', 'IList', 'List', 'IEnumerable', 'HashSet', 'ISet',
+    'IReadOnlyCollection', 'IReadOnlyList', 'Collection'
+}
+
+
+class CSharpAttribute:
+    """Atributo aplicado a una declaración: [Nombre(argumentos)]"""
+    __slots__ = ('name', 'arguments')
+
+    def __init__(self, name, arguments=''):
+        self.name = name
+        self.arguments = arguments
+
+    def __repr__(self):
+        return f"CSharpAttribute({self.name!r}, {self.arguments!r})"
+
+
+class CSharpProperty:
+    """Propiedad o campo de una clase"""
+    __slots__ = ('name', 'type_name', 'nullable', 'modifiers', 'attributes',
+                 'accessors', 'initializer', 'is_field', 'line')
+
+    def __init__(self, name, type_name, nullable, modifiers, attributes,
+                 accessors, initializer, is_field, line):
+        self.name = name
+        self.type_name = type_name      # Tipo sin el '?' final (ej: "string", "ICollection<Venta>")
+        self.nullable = nullable
+        self.modifiers = modifiers
+        self.attributes = attributes
+        self.accessors = accessors      # ('get', 'set'), ('get', 'init'), ... vacío para campos
+        self.initializer = initializer
+        self.is_field = is_field
+        self.line = line
+
+    @property
+    def is_public(self):
+        return 'public' in self.modifiers
+
+    @property
+    def is_virtual(self):
+        return 'virtual' in self.modifiers
+
+    @property
+    def is_required(self):
+        return 'required' in self.modifiers
+
+    @property
+    def is_static(self):
+        return 'static' in self.modifiers or 'const' in self.modifiers
+
+    @property
+    def base_type(self):
+        """Tipo sin argumentos genéricos (ej: ICollection<Venta> -> ICollection)"""
+        return self.type_name.split('<', 1)[0].rsplit('.', 1)[-1]
+
+    @property
+    def generic_arguments(self):
+        if '<' not in self.type_name:
+            return ()
+        inner = self.type_name[self.type_name.index('<') + 1:self.type_name.rindex('>')]
+        return tuple(_split_top_level(inner))
+
+    def has_attribute(self, name):
+        return any(attribute.name == name for attribute in self.attributes)
+
+    def __repr__(self):
+        return f"CSharpProperty({self.name!r}, {self.type_name!r}{'?' if self.nullable else ''})"
+
+
+class CSharpNavigation:
+    """Propiedad de navegación EF Core (referencia o colección)"""
+    __slots__ = ('name', 'target_type', 'is_collection', 'nullable', 'attributes', 'line')
+
+    def __init__(self, name, target_type, is_collection, nullable, attributes, line):
+        self.name = name
+        self.target_type = target_type  # Entidad destino (ej: "Categoria")
+        self.is_collection = is_collection
+        self.nullable = nullable
+        self.attributes = attributes
+        self.line = line
+
+    def __repr__(self):
+        kind = 'collection' if self.is_collection else 'reference'
+        return f"CSharpNavigation({self.name!r} -> {self.target_type!r}, {kind})"
+
+
+class CSharpClass:
+    """Clase (o record/struct) con sus miembros"""
+    __slots__ = ('name', 'namespace', 'kind', 'modifiers', 'attributes', 'base_types',
+                 'properties', 'navigations', 'line')
+
+    def __init__(self, name, namespace, kind, modifiers, attributes, base_types, line):
+        self.name = name
+        self.namespace = namespace
+        self.kind = kind
+        self.modifiers = modifiers
+        self.attributes = attributes
+        self.base_types = base_types
+        self.properties = []            # Propiedades/campos escalares (no navegación)
+        self.navigations = []
+        self.line = line
+
+    @property
+    def full_name(self):
+        return f"{self.namespace}.{self.name}" if self.namespace else self.name
+
+    def get_property(self, name):
+        for prop in self.properties:
+            if prop.name == name:
+                return prop
+        return None
+
+    def __repr__(self):
+        return f"CSharpClass({self.full_name!r}, {len(self.properties)} props, {len(self.navigations)} navs)"
+
+
+class CSharpFile:
+    """Resultado de parsear un archivo .cs"""
+    __slots__ = ('path', 'namespace', 'usings', 'classes')
+
+    def __init__(self, path, namespace, usings, classes):
+        self.path = path
+        self.namespace = namespace
+        self.usings = usings
+        self.classes = classes
+
+    def get_class(self, name):
+        for cls in self.classes:
+            if cls.name == name:
+                return cls
+        return None
+
+
+def _split_top_level(text):
+    """Separar por comas respetando genéricos anidados"""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char in '<([':
+            depth += 1
+        elif char in '>)]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current).strip())
+    return parts
+
+
+def tokenize(source):
+    """Tokenizar código C# -> lista de (tipo, texto, offset), sin espacios ni comentarios"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        if kind == 'end' or kind is None:
+            continue
+        tokens.append((kind, match.group(kind), match.start(kind)))
+    return tokens
+
+
+class CSharpParser:
+    """Parser de declaraciones sobre la lista de tokens (una pasada)"""
+
+    def __init__(self, source, path=None):
+        if source.startswith('\ufeff'):
+            source = source[1:]
+        self.path = Path(path) if path else None
+        self.tokens = tokenize(source)
+        self._newlines = [match.start() for match in re.finditer('\n', source)]
+        self.pos = 0
+        self.namespace = None
+        self.usings = []
+        self.classes = []
+
+    # -- utilidades de tokens ----------------------------------------------
+
+    def _peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None, None)
+
+    def _line(self):
+        """Línea (1-based) del token actual"""
+        offset = self._peek()[2]
+        return bisect_right(self._newlines, offset - 1) + 1 if offset is not None else 0
+
+    def _text(self, offset=0):
+        return self._peek(offset)[1]
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _skip_balanced(self, open_char, close_char):
+        """Saltar desde open_char hasta su cierre correspondiente; devuelve el texto interno"""
+        depth = 0
+        start = self.pos
+        while self.pos < len(self.tokens):
+            text = self._next()[1]
+            if text == open_char:
+                depth += 1
+            elif text == close_char:
+                depth -= 1
+                if depth == 0:
+                    return self._join(self.tokens[start + 1:self.pos - 1])
+        return self._join(self.tokens[start + 1:])
+
+    def _skip_statement(self):
+        """Saltar hasta ';' o hasta el bloque {...} que termina la declaración"""
+        while self.pos < len(self.tokens):
+            text = self._text()
+            if text == ';':
+                self.pos += 1
+                return
+            if text == '{':
+                self._skip_balanced('{', '}')
+                if self._text() == ';':
+                    self.pos += 1
+                return
+            if text in ('(', '['):
+                self._skip_balanced(text, ')' if text == '(' else ']')
+                continue
+            self.pos += 1
+
+    @staticmethod
+    def _join(tokens):
+        """Reconstruir texto de tokens (compacto: sin espacios alrededor de puntuación)"""
+        out = []
+        previous = None
+        for kind, text, _ in tokens:
+            if out and previous in ('ident', 'number', 'string') and kind in ('ident', 'number', 'string'):
+                out.append(' ')
+            elif out and (text in ('=>', '=', '??', '&&', '||') or out[-1] in ('=>', '=', '??', '&&', '||', ',')):
+                out.append(' ')
+            out.append(text)
+            previous = kind
+        return ''.join(out)
+
+    # -- parse ---------------------------------------------------------------
+
+    def parse(self):
+        self._parse_block(container=None, top_level=True)
+        return CSharpFile(self.path, self.namespace, self.usings, self.classes)
+
+    def _parse_block(self, container, top_level=False):
+        """Parsear declaraciones hasta '}' (o fin de archivo si top_level)"""
+        while self.pos < len(self.tokens):
+            text = self._text()
+
+            if text == '}':
+                self.pos += 1
+                return
+            if text == ';':
+                self.pos += 1
+                continue
+
+            if top_level and text == 'using':
+                self.pos += 1
+                start = self.pos
+                self._skip_statement()
+                self.usings.append(self._join(self.tokens[start:self.pos - 1]))
+                continue
+
+            if text == 'namespace':
+                self.pos += 1
+                start = self.pos
+                while self._text() not in ('{', ';', None):
+                    self.pos += 1
+                self.namespace = self._join(self.tokens[start:self.pos])
+                if self._text() == ';':
+                    self.pos += 1   # namespace con ámbito de archivo
+                else:
+                    self.pos += 1
+                    self._parse_block(container, top_level=True)
+                continue
+
+            self._parse_member(container)
+
+    def _parse_attributes(self):
+        attributes = []
+        while self._text() == '[':
+            inner = self._skip_balanced('[', ']')
+            for part in _split_top_level(inner):
+                part = _ATTRIBUTE_TARGET_RE.sub('', part)
+                match = re.match(r'([\w.]+)\s*(?:\((.*)\))?$', part, re.S)
+                if match:
+                    name = match.group(1).rsplit('.', 1)[-1]
+                    if name.endswith('Attribute') and len(name) > len('Attribute'):
+                        name = name[:-len('Attribute')]
+                    attributes.append(CSharpAttribute(name, (match.group(2) or '').strip()))
+        return tuple(attributes)
+
+    def _parse_type(self):
+        """Leer un tipo: Nombre(.Nombre)*<...>?[]? ; devuelve (texto, nullable)"""
+        start = self.pos
+        if self._peek()[0] != 'ident':
+            return None, False
+        self.pos += 1
+        while self._text() in ('.', '::') and self._peek(1)[0] == 'ident':
+            self.pos += 2
+        if self._text() == '<':
+            depth = 0
+            while self.pos < len(self.tokens):
+                text = self._next()[1]
+                if text == '<':
+                    depth += 1
+                elif text == '>':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif text in (';', '{', '}'):
+                    self.pos = start
+                    return None, False
+        nullable = False
+        while self._text() in ('?', '['):
+            if self._text() == '?':
+                nullable = True
+                self.pos += 1
+            elif self._text(1) == ']':
+                self.pos += 2
+            else:
+                break
+        type_text = self._join(self.tokens[start:self.pos])
+        if type_text.endswith('?'):
+            type_text = type_text[:-1]
+        return type_text, nullable
+
+    def _parse_member(self, container):
+        attributes = self._parse_attributes()
+        line = self._line()
+
+        modifiers = []
+        while self._text() in _MODIFIERS:
+            modifiers.append(self._next()[1])
+        modifiers = tuple(modifiers)
+
+        text = self._text()
+        if text is None:
+            return
+
+        if text in _TYPE_KEYWORDS:
+            self._parse_type_declaration(attributes, modifiers, line)
+            return
+
+        if text == '{':
+            self._skip_balanced('{', '}')
+            return
+
+        if container is None or self._peek()[0] != 'ident':
+            self._skip_statement()
+            return
+
+        # Constructor: Nombre(
+        if text == container.name and self._text(1) == '(':
+            self._skip_statement()
+            return
+
+        type_start = self.pos
+        type_name, nullable = self._parse_type()
+        if type_name is None or self._peek()[0] != 'ident':
+            self.pos = type_start
+            self._skip_statement()
+            return
+
+        name = self._next()[1].lstrip('@')
+        follow = self._text()
+
+        if follow == '{':
+            accessors = self._parse_accessors()
+            initializer = None
+            if self._text() == '=':
+                self.pos += 1
+                start = self.pos
+                self._skip_statement()
+                initializer = self._join(self.tokens[start:self.pos - 1])
+            self._add_property(container, CSharpProperty(
+                name, type_name, nullable, modifiers, attributes, accessors, initializer, False, line))
+        elif follow == '=>':
+            self.pos += 1
+            self._skip_statement()
+            self._add_property(container, CSharpProperty(
+                name, type_name, nullable, modifiers, attributes, ('get',), None, False, line))
+        elif follow in (';', '=', ','):
+            initializer = None
+            if follow == '=':
+                self.pos += 1
+                start = self.pos
+                self._skip_statement()
+                initializer = self._join(self.tokens[start:self.pos - 1])
+            else:
+                self._skip_statement()
+            self._add_property(container, CSharpProperty(
+                name, type_name, nullable, modifiers, attributes, (), initializer, True, line))
+        else:
+            # Métodos, eventos, indexers, operadores...
+            self._skip_statement()
+
+    def _parse_accessors(self):
+        """Leer { get; private set; init; } -> ('get', 'set') / ('get', 'init')"""
+        accessors = []
+        self.pos += 1  # '{'
+        while self.pos < len(self.tokens) and self._text() != '}':
+            text = self._text()
+            if text in ('get', 'set', 'init'):
+                accessors.append(text)
+                self.pos += 1
+                if self._text() == '{':
+                    self._skip_balanced('{', '}')
+                elif self._text() == '=>':
+                    while self._text() not in (';', '}', None):
+                        self.pos += 1
+            elif text == '[':
+                self._skip_balanced('[', ']')
+            else:
+                self.pos += 1
+        self.pos += 1  # '}'
+        return tuple(accessors)
+
+    def _parse_type_declaration(self, attributes, modifiers, line):
+        kind = self._next()[1]
+        if kind == 'record' and self._text() in ('class', 'struct'):
+            self.pos += 1
+        if self._peek()[0] != 'ident':
+            self._skip_statement()
+            return
+        name = self._next()[1]
+        if self._text() == '<':
+            self._skip_balanced('<', '>')
+
+        base_types = ()
+        if kind != 'enum' and self._text() == '(':
+            self._skip_balanced('(', ')')   # constructor primario de record
+        if self._text() == ':':
+            self.pos += 1
+            start = self.pos
+            while self._text() not in ('{', ';', 'where', None):
+                self.pos += 1
+            base_types = tuple(_split_top_level(self._join(self.tokens[start:self.pos])))
+        while self._text() not in ('{', ';', None):
+            self.pos += 1
+
+        cls = CSharpClass(name, self.namespace, kind, modifiers, attributes, base_types, line)
+        if kind != 'enum':
+            self.classes.append(cls)
+
+        if self._text() == ';':
+            self.pos += 1
+            return
+        if kind == 'enum':
+            self._skip_balanced('{', '}')
+            return
+        self.pos += 1  # '{'
+        self._parse_block(cls)
+
+    def _add_property(self, container, prop):
+        navigation = _as_navigation(prop)
+        if navigation:
+            container.navigations.append(navigation)
+        else:
+            container.properties.append(prop)
+
+
+def _as_navigation(prop):
+    """Clasificar una propiedad como navegación EF Core (virtual o colección de entidades)"""
+    if prop.is_field or prop.is_static:
+        return None
+    base_type = prop.base_type
+    if base_type in _COLLECTION_TYPES:
+        arguments = prop.generic_arguments
+        target = arguments[0].rstrip('?').rsplit('.', 1)[-1] if len(arguments) == 1 else None
+        if prop.is_virtual or (target and '<' not in target and target not in _PRIMITIVE_TYPES):
+            return CSharpNavigation(prop.name, target or base_type, True, prop.nullable, prop.attributes, prop.line)
+        return None
+    if prop.is_virtual:
+        return CSharpNavigation(prop.name, base_type, False, prop.nullable, prop.attributes, prop.line)
+    return None
+
+
+def parse_source(source, path=None):
+    """Parsear código C# ya leído"""
+    return CSharpParser(source, path).parse()
+
+
+def parse_file(path):
+    """Parsear un archivo .cs"""
+    path = Path(path)
+    return parse_source(path.read_text(encoding='utf-8-sig'), path)
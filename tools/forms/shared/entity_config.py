@@ -31,6 +31,7 @@ class RegularFieldConfig:
     size: Optional[str] = None
     sql_type: Optional[str] = None
     nullable: bool = True
+    searchable_normalized: bool = False  # Columna {name}_busqueda sin acentos ni mayúsculas
 
 @dataclass
 class ForeignKeyConfig:
@@ -53,6 +54,7 @@ class FormFieldConfig:
     placeholder: Optional[str] = None
     label: Optional[str] = None
     nullable: bool = True
+    searchable_normalized: bool = False
     validation_rules: List[str] = field(default_factory=list)
 
 @dataclass
@@ -92,6 +94,8 @@ class NNTableConfig:
     source_table: str       # venta
     target_table: str       # producto  
     alias: Optional[str] = None  # para casos como nn_venta_producto_promocion
+    layout: str = "entity"       # entity (BaseEntity) | compact (clave compuesta, ver table.py --nn)
+    audit: bool = False          # compact: agregar FechaCreacion y CreadorId
 
 @dataclass
 class EntityConfiguration:
@@ -114,6 +118,10 @@ class EntityConfiguration:
     # Configuración adicional
     search_fields: List[str] = field(default_factory=list)
     
+    # Almacenamiento (tablas de alto volumen, ver table.py --compression / --columnstore)
+    compression: Optional[str] = None                             # row | page
+    columnstore_fields: List[str] = field(default_factory=list)  # columnstore no agrupado para reportes
+    
     # Configuración NN (muchos-a-muchos)
     nn_config: Optional[NNTableConfig] = None
     is_nn_relation: bool = False
@@ -6,13 +6,16 @@ Convierte argumentos de línea de comandos en configuración tipada y validada
 """
 
 from typing import List, Optional
+import sys
 import subprocess
-import json
 from pathlib import Path
 from .entity_config import EntityConfiguration, NNTableConfig
 from .field_parsers import FieldParsers
 from .entity_validator import EntityConfigValidator
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "db"))
+from connection_settings import load_connection_settings
+
 class EntityConfigurator:
     """Configurador principal para entidades avanzadas"""
     
@@ -24,52 +27,21 @@ class EntityConfigurator:
     
     def read_connection_string(self):
         """Lee la connection string desde launchSettings.json"""
-        launch_settings_path = self.project_path / "Properties" / "launchSettings.json"
-        
-        if not launch_settings_path.exists():
-            return None
-            
-        try:
-            with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                
-            # Buscar en los profiles la variable SQL
-            for profile_name, profile_data in settings.get("profiles", {}).items():
-                env_vars = profile_data.get("environmentVariables", {})
-                sql_connection = env_vars.get("SQL")
-                
-                if sql_connection:
-                    return sql_connection
-                    
-            return None
-            
-        except Exception:
-            return None
+        settings = load_connection_settings(self.project_path)
+        return settings.ef() if settings else None
     
     def table_exists(self, table_name):
         """Verifica si una tabla existe en la base de datos"""
         try:
-            connection_string = self.read_connection_string()
-            if not connection_string:
+            settings = load_connection_settings(self.project_path)
+            if not settings:
                 return False
             
-            # Parsear connection string para extraer componentes
-            parts = {}
-            for part in connection_string.split(';'):
-                if '=' in part and part.strip():
-                    key, value = part.split('=', 1)
-                    parts[key.strip().lower()] = value.strip()
-            
-            server = parts.get('server', 'localhost')
-            database = parts.get('database', 'NewPOC')
-            user_id = parts.get('user id', 'sa')
-            password = parts.get('password', 'Soporte.2019')
-            
             # Query para verificar existencia
             check_query = f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = '{table_name}'"
             
             result = subprocess.run([
-                'sqlcmd', '-S', server, '-U', user_id, '-P', password, '-d', database,
+                'sqlcmd', *settings.sqlcmd_args(),
                 '-Q', check_query, '-h', '-1'
             ], capture_output=True, text=True, timeout=30)
             
@@ -85,27 +57,15 @@ class EntityConfigurator:
     def get_available_tables(self):
         """Obtener lista de tablas disponibles en la base de datos"""
         try:
-            connection_string = self.read_connection_string()
-            if not connection_string:
+            settings = load_connection_settings(self.project_path)
+            if not settings:
                 return []
             
-            # Parsear connection string
-            parts = {}
-            for part in connection_string.split(';'):
-                if '=' in part and part.strip():
-                    key, value = part.split('=', 1)
-                    parts[key.strip().lower()] = value.strip()
-            
-            server = parts.get('server', 'localhost')
-            database = parts.get('database', 'NewPOC')
-            user_id = parts.get('user id', 'sa')
-            password = parts.get('password', 'Soporte.2019')
-            
             # Query para obtener tablas
             query = "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' AND TABLE_NAME NOT LIKE 'system_%' ORDER BY TABLE_NAME"
             
             result = subprocess.run([
-                'sqlcmd', '-S', server, '-U', user_id, '-P', password, '-d', database,
+                'sqlcmd', *settings.sqlcmd_args(),
                 '-Q', query, '-h', '-1'
             ], capture_output=True, text=True, timeout=30)
             
@@ -158,8 +118,8 @@ class EntityConfigurator:
         
         return ef_class_name
     
-    def configure_nn_table(self, entity_name):
-        """Configurar tabla NN interactivamente"""
+    def configure_nn_table(self, entity_name, layout="entity", audit=False):
+        """Configurar tabla NN interactivamente (layout: entity | compact, ver NNTableConfig)"""
         print("🔗 DETECTADA TABLA MUCHOS-A-MUCHOS (NN)")
         print(f"📝 Tabla: {entity_name}")
         print()
@@ -226,12 +186,15 @@ class EntityConfigurator:
             print(f"   📝 Tabla final: nn_{source_table}_{target_table}_{alias}")
         else:
             print(f"   📝 Tabla final: nn_{source_table}_{target_table}")
+        print(f"   🔑 Layout: {layout}")
         print()
         
         return NNTableConfig(
             source_table=source_table,
             target_table=target_table,
-            alias=alias
+            alias=alias,
+            layout=layout,
+            audit=audit
         )
     
     def configure_from_args(self, args) -> EntityConfiguration:
@@ -273,8 +236,14 @@ class EntityConfigurator:
             config.nn_config = NNTableConfig(
                 source_table=source,
                 target_table=to,
-                alias=alias
+                alias=alias,
+                layout=getattr(args, 'nn_layout', None) or "entity",
+                audit=getattr(args, 'nn_audit', False)
             )
+            if config.nn_config.layout == "compact":
+                target_column = f"{to}_destino_id" if to == source else f"{to}_id"
+                print(f"   🔑 Layout compact: clave clustered ({source}_id, {target_column}) sin Id GUID")
+                print()
             
         else:
             # Modo entidad normal - normalizar nombre siguiendo reglas de EF Core
@@ -299,7 +268,11 @@ class EntityConfigurator:
             print("⚠️ ADVERTENCIA: Detectada tabla NN por nombre pero sin configuración --source --to")
             print("💡 Se recomienda usar: --source tabla1 --to tabla2 en lugar de --entity nn_tabla1_tabla2")
             # Configurar interactivamente como fallback
-            config.nn_config = self.configure_nn_table(config.entity_name)
+            config.nn_config = self.configure_nn_table(
+                config.entity_name,
+                layout=getattr(args, 'nn_layout', None) or "entity",
+                audit=getattr(args, 'nn_audit', False)
+            )
         
         # Parsear campos de base de datos
         if hasattr(args, 'fields') and args.fields:
@@ -318,6 +291,12 @@ class EntityConfigurator:
             for form_str in args.form_fields:
                 form_field = self.parsers.parse_form_field(form_str)
                 config.form_fields[form_field.name] = form_field
+            
+            # searchable_normalized en --form-fields aplica a la columna de BD
+            for regular_field in config.regular_fields:
+                form_field = config.form_fields.get(regular_field.name)
+                if form_field and form_field.searchable_normalized:
+                    regular_field.searchable_normalized = True
         
         # Parsear grid fields
         if hasattr(args, 'grid_fields') and args.grid_fields:
@@ -341,6 +320,12 @@ class EntityConfigurator:
         if hasattr(args, 'search_fields') and args.search_fields:
             config.search_fields = self.parsers.parse_search_fields(args.search_fields)
         
+        # Almacenamiento: compresión y columnstore (mismo formato "campo1,campo2" que search fields)
+        if getattr(args, 'compression', None):
+            config.compression = args.compression
+        if getattr(args, 'columnstore', None):
+            config.columnstore_fields = self.parsers.parse_search_fields(args.columnstore)
+        
         # Configurar parámetros de FormDesigner
         if hasattr(args, 'auto_register'):
             config.auto_register = args.auto_register
@@ -388,7 +373,8 @@ class EntityConfigurator:
                 for field in config.regular_fields:
                     size_info = f"({field.size})" if field.size else ""
                     nullable_info = " NULL" if field.nullable else " NOT NULL"
-                    print(f"      • {field.name}: {field.field_type.value}{size_info}{nullable_info}")
+                    search_info = f" (+ {field.name}_busqueda)" if field.searchable_normalized else ""
+                    print(f"      • {field.name}: {field.field_type.value}{size_info}{nullable_info}{search_info}")
             
             if config.foreign_keys:
                 print(f"   🔗 Foreign Keys ({len(config.foreign_keys)}):")
@@ -460,6 +446,15 @@ class EntityConfigurator:
             print(f"🔍 BÚSQUEDA: {', '.join(config.search_fields)}")
             print()
         
+        if config.compression or config.columnstore_fields:
+            storage = []
+            if config.compression:
+                storage.append(f"compresión {config.compression}")
+            if config.columnstore_fields:
+                storage.append(f"columnstore ({', '.join(config.columnstore_fields)})")
+            print(f"🗜️ ALMACENAMIENTO: {', '.join(storage)}")
+            print()
+        
         print("✅ Configuración validada y lista para generar")
         print("=" * 70)
         print()
\ No newline at end of file
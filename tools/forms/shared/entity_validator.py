@@ -6,7 +6,8 @@ Valida que todos los campos referenciados existan y sean coherentes
 """
 
 from typing import List, Set
-from .entity_config import EntityConfiguration
+from .entity_config import EntityConfiguration, FieldType
+from .model_index import BASE_PROPERTIES
 
 class EntityConfigValidator:
     """Validador de coherencia para configuración de entidades"""
@@ -25,6 +26,7 @@ class EntityConfigValidator:
             errors.extend(self._validate_field_coherence(config))
             errors.extend(self._validate_lookup_coherence(config))
             errors.extend(self._validate_search_coherence(config))
+            errors.extend(self._validate_storage_coherence(config))
         else:
             # Para target 'interfaz', validaciones más flexibles
             errors.extend(self._validate_interfaz_requirements(config))
@@ -122,6 +124,21 @@ class EntityConfigValidator:
         
         return errors
     
+    def _validate_storage_coherence(self, config: EntityConfiguration) -> List[str]:
+        """Validar columnas del columnstore: existentes y sin NVARCHAR(MAX)"""
+        errors = []
+        
+        all_db_fields = config.get_all_db_fields()
+        text_fields = {f.name for f in config.regular_fields if f.field_type == FieldType.TEXT}
+        
+        for column in config.columnstore_fields:
+            if column not in all_db_fields and column not in BASE_PROPERTIES:
+                errors.append(f"columnstore '{column}' no existe en --fields, --fk ni en BaseEntity")
+            elif column in text_fields:
+                errors.append(f"columnstore '{column}': los campos text (NVARCHAR(MAX)) no admiten columnstore")
+        
+        return errors
+    
     def _validate_field_types_coherence(self, config: EntityConfiguration) -> List[str]:
         """Validar que los tipos de campos sean coherentes entre BD y UI"""
         errors = []
@@ -136,6 +153,18 @@ class EntityConfigValidator:
                 if db_field.field_type != readonly_config.field_type:
                     errors.append(f"readonly-field '{field_name}': tipo '{readonly_config.field_type}' no coincide con BD '{db_field.field_type}'")
         
+        # La columna de búsqueda normalizada se indexa: solo strings que caben en una clave
+        for db_field in config.regular_fields:
+            if not db_field.searchable_normalized:
+                continue
+            size = int(db_field.size) if db_field.size and db_field.size.isdigit() else 255
+            if db_field.field_type != FieldType.STRING or size > 450:
+                errors.append(f"field '{db_field.name}': searchable_normalized requiere string de hasta 450 caracteres")
+        
+        for field_name, form_config in config.form_fields.items():
+            if form_config.searchable_normalized and field_name not in db_fields_map:
+                errors.append(f"form-field '{field_name}': searchable_normalized requiere el campo en --fields")
+        
         return errors
     
     def _validate_interfaz_requirements(self, config: EntityConfiguration) -> List[str]:
@@ -167,43 +196,19 @@ class EntityConfigValidator:
             return errors
         
         try:
+            import sys
             import subprocess
-            import json
             from pathlib import Path
             
-            # Leer connection string
-            root_path = Path.cwd()
-            project_path = root_path / "Backend"
-            launch_settings_path = project_path / "Properties" / "launchSettings.json"
-            
-            connection_string = None
-            if launch_settings_path.exists():
-                with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                
-                for profile_name, profile_data in settings.get("profiles", {}).items():
-                    env_vars = profile_data.get("environmentVariables", {})
-                    sql_connection = env_vars.get("SQL")
-                    if sql_connection:
-                        connection_string = sql_connection
-                        break
+            sys.path.append(str(Path(__file__).resolve().parents[2] / "db"))
+            from connection_settings import load_connection_settings
             
-            if not connection_string:
+            # Conexión compartida (launchSettings.json leído una vez por proceso)
+            settings = load_connection_settings(Path.cwd() / "Backend")
+            if not settings:
                 # Si no hay connection string, no validar
                 return errors
             
-            # Parsear connection string
-            parts = {}
-            for part in connection_string.split(';'):
-                if '=' in part and part.strip():
-                    key, value = part.split('=', 1)
-                    parts[key.strip().lower()] = value.strip()
-            
-            server = parts.get('server', 'localhost')
-            database = parts.get('database', 'NewPOC')
-            user_id = parts.get('user id', 'sa')
-            password = parts.get('password', 'Soporte.2019')
-            
             # Tabla que estamos creando (para detectar auto-referencias)
             current_table = config.entity_name.lower()
             
@@ -220,7 +225,7 @@ class EntityConfigValidator:
                 check_query = f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = '{table_name}'"
                 
                 result = subprocess.run([
-                    'sqlcmd', '-S', server, '-U', user_id, '-P', password, '-d', database,
+                    'sqlcmd', *settings.sqlcmd_args(),
                     '-Q', check_query, '-h', '-1'
                 ], capture_output=True, text=True, timeout=30)
                 
@@ -29,12 +29,15 @@ class FieldParsers:
     
     def parse_regular_field(self, field_str: str) -> RegularFieldConfig:
         """
-        Parse campo regular: "nombre:string:255"
+        Parse campo regular: "nombre:string:255" o "nombre:string:255:searchable_normalized"
         """
         parts = field_str.split(':')
         if len(parts) < 2:
             raise ValueError(f"Formato de campo inválido: {field_str}. Use 'nombre:tipo' o 'nombre:tipo:tamaño'")
         
+        searchable_normalized = "searchable_normalized" in [part.strip().lower() for part in parts[2:]]
+        parts = parts[:2] + [part for part in parts[2:] if part.strip().lower() != "searchable_normalized"]
+        
         field_name = parts[0]
         field_type_str = parts[1].lower()
         field_size = parts[2] if len(parts) > 2 else None
@@ -51,7 +54,8 @@ class FieldParsers:
             field_type=field_type,
             size=field_size,
             sql_type=sql_type,
-            nullable=nullable
+            nullable=nullable,
+            searchable_normalized=searchable_normalized
         )
     
     def parse_foreign_key(self, fk_str: str) -> ForeignKeyConfig:
@@ -89,6 +93,8 @@ class FieldParsers:
                 config.unique = True
             elif part == "nullable":
                 config.nullable = True
+            elif part == "searchable_normalized":
+                config.searchable_normalized = True
             elif "=" in part:
                 key, value = part.split('=', 1)
                 key = key.strip()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧭 Index Advisor - Índices nonclustered de cobertura desde la configuración de la entidad
+Convierte grid_fields, lookups y el OrderBy del ViewManager en índices para table.py
+
+La vista por defecto del ViewManager generado consulta:
+    WHERE OrganizationId = @org AND Active = 1     (BaseQueryService + ViewManager)
+    ORDER BY {PRIMARY_FIELD}                        (paginado con OFFSET/FETCH)
+    SELECT COUNT(*) ... mismo WHERE                 (total del paginador)
+
+Sugerencias:
+    - Vista por defecto: (OrganizationId, Active, campo principal) INCLUDE (columnas de la grilla)
+      -> lista y COUNT se resuelven solo con el índice
+    - Columnas de grilla ordenables/filtrables: (OrganizationId, Active, columna)
+    - Lookups: (OrganizationId, Active, display_field) INCLUDE (Id) en la tabla destino
+
+Se descartan las sugerencias que ya cubre un índice del catálogo y, cuando una
+sugerencia extiende un índice planificado por table.py (ej: el de tenant), absorbe
+sus INCLUDE para que table.py lo omita.
+"""
+
+import sys
+import subprocess
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .entity_config import EntityConfiguration, FieldType
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "db"))
+from table import index_covers
+
+TENANT_COLUMNS = ['OrganizationId', 'Active']
+# 1700 bytes por clave nonclustered: NVARCHAR(450) = 900 bytes deja margen para el resto
+MAX_KEY_STRING_SIZE = 450
+MAX_FILTER_INDEXES = 3
+DEFAULT_PRIMARY_FIELD = 'Nombre'
+
+
+@dataclass
+class IndexSuggestion:
+    """Índice nonclustered sugerido (mismo formato que los índices de table.py)"""
+    table: str
+    name: str
+    columns: List[str]
+    include: List[str] = field(default_factory=list)
+    reason: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class IndexAdvisor:
+    """Sugerencias de índices para una entidad a partir de su EntityConfiguration"""
+
+    def __init__(self, catalog: Optional[Dict[str, List[Dict]]] = None):
+        # {tabla: [{'table', 'name', 'columns', 'include'}]} de los índices existentes en la BD
+        self.catalog = {table.lower(): indexes for table, indexes in (catalog or {}).items()}
+
+    def _column_types(self, config: EntityConfiguration) -> Dict[str, object]:
+        return {regular.name.lower(): regular for regular in config.regular_fields}
+
+    def _is_key_column(self, column: str, columns: Dict) -> bool:
+        """Columnas que pueden ser clave: sin NVARCHAR(MAX) ni strings largos"""
+        regular = columns.get(column.lower())
+        if regular is None:
+            return True  # FK, campos base o columna no declarada en --fields
+        if regular.field_type == FieldType.TEXT:
+            return False
+        if regular.field_type == FieldType.STRING:
+            size = regular.size if regular.size and regular.size.isdigit() else '255'
+            return int(size) <= MAX_KEY_STRING_SIZE
+        return True
+
+    def _is_include_column(self, column: str, columns: Dict) -> bool:
+        regular = columns.get(column.lower())
+        return regular is None or regular.field_type != FieldType.TEXT
+
+    def primary_field(self, config: EntityConfiguration) -> Optional[str]:
+        """Columna del OrderBy por defecto, con la misma regla que ViewManagerGenerator.generate_from_config"""
+        if config.grid_fields:
+            first_name, first = next(iter(config.grid_fields.items()))
+            if not first.display_field:
+                return first_name
+        elif config.regular_fields:
+            return config.regular_fields[0].name
+
+        declared = {regular.name.lower(): regular.name for regular in config.regular_fields}
+        return declared.get(DEFAULT_PRIMARY_FIELD.lower())
+
+    def advise(self, config: EntityConfiguration, table_name: str, planned: Optional[List[Dict]] = None) -> List[IndexSuggestion]:
+        """Sugerencias deduplicadas contra el catálogo; planned son los índices que table.py ya va a crear"""
+        columns = self._column_types(config)
+        # Columnas que lee la grilla: campos directos y la FK de los campos con display_field
+        include_columns = [column for column in config.grid_fields if self._is_include_column(column, columns)]
+        suggestions = []
+
+        primary = self.primary_field(config)
+        if primary and self._is_key_column(primary, columns):
+            suggestions.append(IndexSuggestion(
+                table=table_name,
+                name=f"IX_{table_name}_OrganizationId_Active_{primary}",
+                columns=TENANT_COLUMNS + [primary],
+                include=[column for column in include_columns if column.lower() != primary.lower()],
+                reason=f"Vista por defecto: WHERE tenant/Active ORDER BY {primary} y COUNT del paginador"
+            ))
+
+        filter_columns = [
+            name for name, grid_field in config.grid_fields.items()
+            if (grid_field.sortable or grid_field.filterable)
+            and (not primary or name.lower() != primary.lower())
+            and self._is_key_column(name, columns)
+        ]
+        for column in filter_columns[:MAX_FILTER_INDEXES]:
+            suggestions.append(IndexSuggestion(
+                table=table_name,
+                name=f"IX_{table_name}_OrganizationId_Active_{column}",
+                columns=TENANT_COLUMNS + [column],
+                reason=f"Grilla: orden/filtro por {column}"
+            ))
+
+        for lookup in config.lookups.values():
+            target = lookup.target_table.lower()
+            suggestions.append(IndexSuggestion(
+                table=target,
+                name=f"IX_{target}_OrganizationId_Active_{lookup.display_field}",
+                columns=TENANT_COLUMNS + [lookup.display_field],
+                include=['Id'],
+                reason=f"Lookup {lookup.field}: orden y búsqueda por {target}.{lookup.display_field}"
+            ))
+
+        return self._deduplicate(suggestions, planned or [])
+
+    def _deduplicate(self, suggestions: List[IndexSuggestion], planned: List[Dict]) -> List[IndexSuggestion]:
+        result = []
+        absorbed = set()
+        for suggestion in suggestions:
+            candidate = suggestion.to_dict()
+            existing = self.catalog.get(suggestion.table.lower(), [])
+            if any(index_covers(index, candidate) for index in existing + [s.to_dict() for s in result]):
+                continue
+
+            # Absorber los INCLUDE de los índices planificados que esta sugerencia extiende
+            for index in planned:
+                if index['name'] not in absorbed and index_covers({**candidate, 'include': []}, {**index, 'include': []}):
+                    absorbed.add(index['name'])
+                    for column in index.get('include', []):
+                        if column.lower() not in {c.lower() for c in suggestion.columns + suggestion.include}:
+                            suggestion.include.append(column)
+            result.append(suggestion)
+        return result
+
+
+def load_catalog_indexes(settings, tables: List[str]) -> Dict[str, List[Dict]]:
+    """Índices existentes (clustered y nonclustered) de las tablas indicadas; {} si no hay conexión"""
+    if not settings or not tables:
+        return {}
+
+    names = ", ".join(f"'{table.lower()}'" for table in sorted(set(tables)))
+    query = f"""SET NOCOUNT ON;
+SELECT LOWER(t.name), i.name, c.name, ic.is_included_column
+FROM sys.indexes i
+JOIN sys.tables t ON t.object_id = i.object_id
+JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+WHERE LOWER(t.name) IN ({names}) AND i.type IN (1, 2)
+ORDER BY t.name, i.name, ic.is_included_column, ic.key_ordinal, c.name"""
+
+    try:
+        result = subprocess.run([
+            'sqlcmd', *settings.sqlcmd_args(),
+            '-Q', query, '-h', '-1', '-W', '-s', '|'
+        ], capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return {}
+    if result.returncode != 0:
+        return {}
+
+    catalog = {}
+    indexes = {}
+    for line in result.stdout.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) != 4:
+            continue
+        table, name, column, included = parts
+        index = indexes.get((table, name))
+        if index is None:
+            index = indexes[(table, name)] = {'table': table, 'name': name, 'columns': [], 'include': []}
+            catalog.setdefault(table, []).append(index)
+        (index['include'] if included == '1' else index['columns']).append(column)
+    return catalog
@@ -9,9 +9,13 @@ import re
 from pathlib import Path
 
 class LookupResolver:
-    def __init__(self, root_path, fk_config=None):
+    def __init__(self, root_path, fk_config=None, model_index=None):
         self.root_path = Path(root_path)
         
+        # Índice de modelos (compartido con los demás generadores si se entrega)
+        from shared.model_index import ModelIndex
+        self.model_index = model_index or ModelIndex(self.root_path)
+        
         # Patrones para detectar FK
         self.fk_patterns = [
             r'(.+)Id$',      # CategoriaId -> Categoria  
@@ -140,8 +144,7 @@ class LookupResolver:
     
     def entity_exists(self, entity_name):
         """Verificar si existe la entidad en Shared.Models"""
-        entity_file = self.root_path / "Shared.Models" / "Entities" / f"{entity_name}.cs"
-        return entity_file.exists()
+        return self.model_index.entity_exists(entity_name)
     
     def resolve_lookup_config(self, field_name):
         """Resolver configuración completa de lookup"""
@@ -177,12 +180,13 @@ class LookupResolver:
             'service_injection': f"[Inject] private {fk_info['service_name']} {fk_info['service_name']} {{ get; set; }} = null!;"
         }
     
-    def generate_lookup_input(self, lookup_config, templates_engine=None):
-        """Generar input de lookup usando template"""
-        if not lookup_config:
-            return "<!-- No lookup config -->"
-        
-        variables = {
+    def search_property(self, entity_name, display_property=None):
+        """Propiedad de búsqueda del lookup (la columna normalizada si existe)"""
+        return self.model_index.search_property(entity_name, display_property or 'Nombre')
+    
+    def lookup_input_variables(self, lookup_config):
+        """Variables del template de input de lookup"""
+        return {
             'FIELD_NAME': lookup_config['field_name'],
             'FIELD_DISPLAY': self._get_display_name(lookup_config['field_name']),
             'LOOKUP_ENTITY': lookup_config['entity_name'],
@@ -193,9 +197,16 @@ class LookupResolver:
             'LOOKUP_SEARCH_FIELDS': f'SearchableFields="@{lookup_config["entity_name"].lower()}SearchFields"',
             'LOOKUP_CACHE_CONFIG': 'EnableCache="true"' if lookup_config['cache_enabled'] else ''
         }
+    
+    def generate_lookup_input(self, lookup_config, templates_engine=None):
+        """Generar input de lookup usando template"""
+        if not lookup_config:
+            return "<!-- No lookup config -->"
+        
+        variables = self.lookup_input_variables(lookup_config)
         
         if templates_engine:
-            return templates_engine.render_template("frontend/inputs/lookup_input.template", variables)
+            return templates_engine.render_partial("frontend/inputs/lookup_input.template", variables)
         else:
             # Fallback manual
             return f'''<ValidatedInput FieldName="{variables['FIELD_NAME']}" Value="@entity.{variables['FIELD_NAME']}">
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ Model Index
+Índice de los modelos de Shared.Models/Entities compartido entre generadores
+
+Ubica cada entidad una sola vez (un rglob por índice, también para las que no
+existen: solo refresh() vuelve a escanear) y parsea su archivo con el parser de
+declaraciones C# la primera vez que se pide, reutilizando el resultado mientras
+el archivo no cambie.
+"""
+
+from pathlib import Path
+
+from shared.csharp_parser import parse_file
+
+# Propiedades heredadas / de sistema que no se muestran como campos de la entidad
+BASE_PROPERTIES = (
+    'Id', 'OrganizationId', 'FechaCreacion', 'FechaModificacion',
+    'CreadorId', 'ModificadorId', 'Active'
+)
+
+# Columna calculada de table.py ({campo}_busqueda -> {Campo}Busqueda en el modelo)
+NORMALIZED_SEARCH_SUFFIX = "Busqueda"
+
+
+class ModelIndex:
+    def __init__(self, root_path):
+        self.root_path = Path(root_path)
+        self.entities_path = self.root_path / "Shared.Models" / "Entities"
+        self._files = None          # nombre de entidad -> Path
+        self._parsed = {}           # Path -> (mtime_ns, CSharpFile)
+
+    def _scan(self):
+        """Ubicar todos los modelos (excluye .Metadata.cs); la raíz tiene prioridad sobre subcarpetas"""
+        files = {}
+        if self.entities_path.exists():
+            for cs_file in sorted(self.entities_path.rglob("*.cs"), key=lambda p: (len(p.parts), str(p))):
+                if cs_file.name.endswith(".Metadata.cs"):
+                    continue
+                files.setdefault(cs_file.stem, cs_file)
+        self._files = files
+
+    def refresh(self):
+        """Volver a escanear el árbol: llamarlo tras generar o mover modelos"""
+        self._files = None
+        self._parsed.clear()
+
+    def entity_file(self, entity_name):
+        """Ruta del modelo de una entidad, o None (los ausentes también quedan cacheados hasta refresh())"""
+        if self._files is None:
+            self._scan()
+        entity_file = self._files.get(entity_name)
+        if entity_file is not None and not entity_file.exists():
+            return None
+        return entity_file
+
+    def entity_names(self):
+        if self._files is None:
+            self._scan()
+        return sorted(self._files)
+
+    def entity_exists(self, entity_name):
+        return self.entity_file(entity_name) is not None
+
+    def parse(self, cs_file):
+        """Parsear un archivo (cacheado por mtime)"""
+        cs_file = Path(cs_file)
+        mtime = cs_file.stat().st_mtime_ns
+        cached = self._parsed.get(cs_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        parsed = parse_file(cs_file)
+        self._parsed[cs_file] = (mtime, parsed)
+        return parsed
+
+    def get_entity(self, entity_name):
+        """Clase parseada de la entidad, o None si no existe"""
+        entity_file = self.entity_file(entity_name)
+        if entity_file is None:
+            return None
+        parsed = self.parse(entity_file)
+        return parsed.get_class(entity_name) or (parsed.classes[0] if parsed.classes else None)
+
+    def get_fields(self, entity_name, include_base=False):
+        """Campos escalares públicos de la entidad en el formato de los generadores"""
+        entity = self.get_entity(entity_name)
+        if entity is None:
+            return None
+        fields = []
+        names = {prop.name for prop in entity.properties}
+        for prop in entity.properties:
+            # Solo propiedades públicas editables (get + set/init)
+            if prop.is_field or prop.is_static or not prop.is_public:
+                continue
+            if 'get' not in prop.accessors or not ('set' in prop.accessors or 'init' in prop.accessors):
+                continue
+            if not include_base and prop.name in BASE_PROPERTIES:
+                continue
+            # Columna de búsqueda normalizada: solo lectura para la UI, se busca pero no se edita
+            if prop.name.endswith(NORMALIZED_SEARCH_SUFFIX) and prop.name[:-len(NORMALIZED_SEARCH_SUFFIX)] in names:
+                continue
+            fields.append({
+                'name': prop.name,
+                'type': prop.type_name,
+                'is_nullable': prop.nullable
+            })
+        return fields
+
+    def search_property(self, entity_name, property_name):
+        """Propiedad sobre la que buscar: {Propiedad}Busqueda si la entidad la tiene (searchable_normalized)"""
+        entity = self.get_entity(entity_name)
+        normalized = f"{property_name}{NORMALIZED_SEARCH_SUFFIX}"
+        if entity is not None and any(prop.name == normalized for prop in entity.properties):
+            return normalized
+        return property_name
+
+    def get_navigations(self, entity_name, include_collections=False):
+        """Propiedades de navegación de la entidad"""
+        entity = self.get_entity(entity_name)
+        if entity is None:
+            return []
+        return [nav for nav in entity.navigations if include_collections or not nav.is_collection]
@@ -2,41 +2,539 @@
 # -*- coding: utf-8 -*-
 """
 📝 Template Engine
-Motor de templates simple para generar código
+Motor de templates para generar código
+
+Sintaxis soportada:
+    {{VARIABLE}} / {{field.name}}        Sustitución (rutas con punto para dicts/objetos)
+    {% for item in ITEMS %}...{% endfor %}   Bucles (expone loop.index, loop.first, loop.last...)
+    {% if expr %}...{% elif expr %}...{% else %}...{% endif %}
+    {% include "ruta/partial.template" %}    Partial estático
+    {% include field.template with field.variables %}   Partial dinámico con variables extra
+
+Cada template se compila una sola vez a un code object de Python; los partials
+incluidos se cachean cuando se renderizan con las mismas entradas.
+
+`iter_render()` entrega el resultado por chunks y `render_to_file()` lo escribe
+directo al archivo destino, solo si el hash del contenido cambió.
+
+Los code objects se persisten en `templates/__pycache__/` (uno por template,
+validados con el hash del contenido), así un proceso nuevo no recompila nada.
 """
 
+from collections import ChainMap
 from pathlib import Path
+import hashlib
+import importlib.util
+import marshal
+import os
 import re
 
+# Tags del lenguaje: {{VAR}} / {{a.b}} y bloques {% ... %}
+_TAG_RE = re.compile(r'\{\{\s*([A-Za-z_][\w.]*)\s*\}\}|\{%\s*(.*?)\s*%\}', re.S)
+
+# Tokens de expresiones en {% if %} / {% for %} / {% include %}
+_EXPR_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>==|!=|<=|>=|<|>|\(|\))
+      | (?P<name>[A-Za-z_][\w.]*)
+    )''', re.X)
+
+_KEYWORDS = {'and': 'and', 'or': 'or', 'not': 'not', 'in': 'in', 'is': 'is',
+             'true': 'True', 'false': 'False', 'none': 'None',
+             'True': 'True', 'False': 'False', 'None': 'None'}
+
+# Tags de control que desaparecen junto con su línea si están solos en ella
+_CONTROL_TAGS = ('for', 'endfor', 'if', 'elif', 'else', 'endif')
+
+_MISSING = object()
+
+# Cabecera de los archivos de caché: cambia si cambia la versión de Python
+# (formato de bytecode) o el formato del compilador de templates
+_CACHE_MAGIC = importlib.util.MAGIC_NUMBER + b'TPL2'
+_CACHE_SUFFIX = '.tplc'
+
+# Tamaño del buffer al escribir/leer archivos por chunks
+_CHUNK_SIZE = 64 * 1024
+
+
+class TemplateSyntaxError(Exception):
+    """Error de sintaxis en un template"""
+    pass
+
+
+class LoopState:
+    """Información del bucle actual disponible como `loop` dentro de {% for %}"""
+    __slots__ = ('index0', 'length')
+
+    def __init__(self, length):
+        self.index0 = 0
+        self.length = length
+
+    @property
+    def index(self):
+        return self.index0 + 1
+
+    @property
+    def first(self):
+        return self.index0 == 0
+
+    @property
+    def last(self):
+        return self.index0 == self.length - 1
+
+
+def _lookup(scope, path):
+    """Resolver `a.b.c` contra el scope (dicts por clave, objetos por atributo)"""
+    parts = path.split('.')
+    value = scope.get(parts[0], _MISSING)
+    for part in parts[1:]:
+        if value is _MISSING or value is None:
+            return _MISSING
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        else:
+            value = getattr(value, part, _MISSING)
+    return value
+
+
+def _value(scope, path):
+    """Valor para expresiones: variables inexistentes se evalúan como None"""
+    value = _lookup(scope, path)
+    return None if value is _MISSING else value
+
+
+def _text(scope, path):
+    """Valor para {{VAR}}: si no existe se deja el placeholder intacto"""
+    value = _lookup(scope, path)
+    if value is _MISSING:
+        return '{{' + path + '}}'
+    return str(value)
+
+
+def _loop(items):
+    """Iterar una colección entregando (item, loop)"""
+    if items is None:
+        return
+    if isinstance(items, dict):
+        items = list(items.values())
+    elif not isinstance(items, (list, tuple)):
+        items = list(items)
+    state = LoopState(len(items))
+    for index, item in enumerate(items):
+        state.index0 = index
+        yield item, state
+
+
+def _freeze(value):
+    """Convertir un valor en clave hashable para el caché de partials"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if value is _MISSING:
+        return _MISSING
+    raise TypeError(f"Valor no cacheable: {type(value).__name__}")
+
+
+# Funciones auxiliares visibles desde el código generado
+_RUNTIME = {'_text': _text, '_value': _value, '_loop': _loop}
+
+
+class CompiledTemplate:
+    """Template compilado a un code object de Python"""
+    __slots__ = ('name', 'code', 'names', 'static_includes', 'dynamic_includes', '_render')
+
+    def __init__(self, name, code, names, static_includes, dynamic_includes):
+        self.name = name
+        self.code = code
+        self.names = names
+        self.static_includes = static_includes
+        self.dynamic_includes = dynamic_includes
+        namespace = dict(_RUNTIME)
+        exec(code, namespace)
+        self._render = namespace['_render']
+
+    def iter_render(self, scope, engine):
+        """Generar el resultado por chunks (sin armar el string completo)"""
+        return self._render(scope, engine)
+
+    def render(self, scope, engine):
+        return ''.join(self._render(scope, engine))
+
+
+class _Compiler:
+    """Traduce el texto de un template a código Python"""
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.lines = ['def _render(_s0, _engine):']
+        self.depth = 0          # profundidad de scopes (bucles anidados)
+        self.indent = 1
+        self.stack = []         # bloques abiertos: ('for'|'if', línea)
+        self.names = set()
+        self.static_includes = set()
+        self.dynamic_includes = False
+
+    # -- utilidades ---------------------------------------------------------
+
+    def _line_of(self, pos):
+        return self.source.count('\n', 0, pos) + 1
+
+    def _error(self, message, pos):
+        return TemplateSyntaxError(f"{self.name}:{self._line_of(pos)}: {message}")
+
+    def _write(self, code):
+        self.lines.append('    ' * self.indent + code)
+
+    def _scope(self):
+        return f'_s{self.depth}'
+
+    def _expr(self, text, pos):
+        """Compilar una expresión restringida a código Python"""
+        out = []
+        index = 0
+        text = text.strip()
+        while index < len(text):
+            match = _EXPR_TOKEN_RE.match(text, index)
+            if not match or match.end() == index:
+                raise self._error(f"Expresión inválida: {text!r}", pos)
+            index = match.end()
+            if match.group('string') is not None or match.group('number') is not None:
+                out.append(match.group('string') or match.group('number'))
+            elif match.group('op') is not None:
+                out.append(match.group('op'))
+            else:
+                name = match.group('name')
+                if name in _KEYWORDS:
+                    out.append(_KEYWORDS[name])
+                else:
+                    self.names.add(name.split('.')[0])
+                    out.append(f'_value({self._scope()}, {name!r})')
+        if not out:
+            raise self._error("Expresión vacía", pos)
+        return ' '.join(out)
+
+    # -- compilación --------------------------------------------------------
+
+    def compile(self):
+        pos = 0
+        pending_text = []
+        for match in _TAG_RE.finditer(self.source):
+            start, end = match.start(), match.end()
+            text = self.source[pos:start]
+            tag = match.group(2)
+            keyword = tag.split(None, 1)[0] if tag else None
+
+            if keyword in _CONTROL_TAGS:
+                # Si el tag está solo en su línea, eliminar la línea completa
+                line_start = text.rfind('\n') + 1
+                newline = self.source.find('\n', end)
+                line_end = len(self.source) if newline == -1 else newline
+                if not text[line_start:].strip() and not self.source[end:line_end].strip() \
+                        and (line_start > 0 or pos == 0 or self.source[pos - 1] == '\n'):
+                    text = text[:line_start]
+                    end = line_end + 1 if newline != -1 else line_end
+
+            pending_text.append(text)
+            self._flush_text(pending_text)
+
+            if tag is None:
+                path = match.group(1)
+                self.names.add(path.split('.')[0])
+                self._write(f'yield _text({self._scope()}, {path!r})')
+            else:
+                self._compile_tag(tag, keyword, start)
+            pos = end
+
+        pending_text.append(self.source[pos:])
+        self._flush_text(pending_text)
+
+        if self.stack:
+            block, block_pos = self.stack[-1]
+            raise self._error(f"Bloque '{block}' sin cerrar", block_pos)
+        if not any(line.lstrip().startswith('yield') for line in self.lines[1:]):
+            self._write("yield ''")
+        return '\n'.join(self.lines) + '\n'
+
+    def _flush_text(self, pending_text):
+        text = ''.join(pending_text)
+        pending_text.clear()
+        if text:
+            self._write(f'yield {text!r}')
+
+    def _compile_tag(self, tag, keyword, pos):
+        rest = tag[len(keyword):].strip()
+
+        if keyword == 'for':
+            match = re.match(r'([A-Za-z_]\w*)\s+in\s+(.+)$', rest, re.S)
+            if not match:
+                raise self._error(f"Sintaxis de for inválida: {tag!r}", pos)
+            var_name, iterable = match.groups()
+            iterable_code = self._expr(iterable, pos)
+            parent = self._scope()
+            self.depth += 1
+            self._write(f'for _item{self.depth}, _loop{self.depth} in _loop({iterable_code}):')
+            self.indent += 1
+            self._write(f"{self._scope()} = {parent}.new_child({{{var_name!r}: _item{self.depth}, 'loop': _loop{self.depth}}})")
+            self.stack.append(('for', pos))
+
+        elif keyword == 'endfor':
+            self._close('for', pos)
+            self.indent -= 1
+            self.depth -= 1
+
+        elif keyword == 'if':
+            self._write(f'if {self._expr(rest, pos)}:')
+            self.indent += 1
+            self._write('pass')
+            self.stack.append(('if', pos))
+
+        elif keyword in ('elif', 'else'):
+            if not self.stack or self.stack[-1][0] != 'if':
+                raise self._error(f"'{keyword}' fuera de un bloque if", pos)
+            self.indent -= 1
+            if keyword == 'elif':
+                self._write(f'elif {self._expr(rest, pos)}:')
+            else:
+                self._write('else:')
+            self.indent += 1
+            self._write('pass')
+
+        elif keyword == 'endif':
+            self._close('if', pos)
+            self.indent -= 1
+
+        elif keyword == 'include':
+            match = re.match(r'(.+?)(?:\s+with\s+(.+))?$', rest, re.S)
+            target, extra = match.groups()
+            target = target.strip()
+            if target[:1] in ('"', "'") and target[-1:] == target[:1]:
+                self.static_includes.add(target[1:-1])
+                name_code = repr(target[1:-1])
+            else:
+                self.dynamic_includes = True
+                name_code = self._expr(target, pos)
+            scope = self._scope()
+            if extra:
+                scope = f'{scope}.new_child({self._expr(extra, pos)} or {{}})'
+            self._write(f'yield _engine.render_partial({name_code}, {scope})')
+
+        else:
+            raise self._error(f"Tag desconocido: {keyword!r}", pos)
+
+    def _close(self, block, pos):
+        if not self.stack or self.stack[-1][0] != block:
+            raise self._error(f"'end{block}' sin '{block}' correspondiente", pos)
+        self.stack.pop()
+
+
+def compile_template(name, source):
+    """Compilar el texto de un template a un CompiledTemplate"""
+    compiler = _Compiler(name, source)
+    python_source = compiler.compile()
+    code = compile(python_source, f'<template {name}>', 'exec')
+    return CompiledTemplate(name, code, frozenset(compiler.names),
+                            frozenset(compiler.static_includes), compiler.dynamic_includes)
+
+
 class TemplateEngine:
-    def __init__(self, templates_path):
+    def __init__(self, templates_path, cache_dir=None):
         self.templates_path = Path(templates_path)
-    
+        # cache_dir=False desactiva el caché en disco
+        if cache_dir is None:
+            cache_dir = self.templates_path / "__pycache__"
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._compiled = {}
+        self._partial_cache = {}
+
+    def get_template(self, template_name):
+        """Obtener el template compilado (compila una sola vez por instancia)"""
+        compiled = self._compiled.get(template_name)
+        if compiled is None:
+            template_file = self.templates_path / template_name
+
+            if not template_file.exists():
+                raise FileNotFoundError(f"Template no encontrado: {template_file}")
+
+            source_bytes = template_file.read_bytes()
+            content_hash = hashlib.sha256(source_bytes).digest()
+
+            compiled = self._load_cached(template_name, content_hash)
+            if compiled is None:
+                # Mismo resultado que read_text(): saltos de línea universales
+                source = source_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                compiled = compile_template(template_name, source)
+                self._store_cached(compiled, content_hash)
+            self._compiled[template_name] = compiled
+        return compiled
+
+    def _cache_file(self, template_name):
+        """Archivo de caché para un template (nombre derivado de su ruta)"""
+        path_hash = hashlib.sha1(template_name.replace('\\', '/').encode('utf-8')).hexdigest()[:16]
+        stem = Path(template_name).name.replace('.template', '')
+        return self.cache_dir / f"{stem}.{path_hash}{_CACHE_SUFFIX}"
+
+    def _load_cached(self, template_name, content_hash):
+        """Cargar el code object persistido si corresponde al contenido actual"""
+        if not self.cache_dir:
+            return None
+        try:
+            data = self._cache_file(template_name).read_bytes()
+        except OSError:
+            return None
+
+        header = _CACHE_MAGIC + content_hash
+        if not data.startswith(header):
+            return None
+        try:
+            name, code, names, static_includes, dynamic_includes = marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        if name != template_name:
+            return None
+        return CompiledTemplate(name, code, frozenset(names), frozenset(static_includes), dynamic_includes)
+
+    def _store_cached(self, compiled, content_hash):
+        """Persistir el code object (escritura atómica; los errores no son fatales)"""
+        if not self.cache_dir:
+            return
+        payload = marshal.dumps((compiled.name, compiled.code, tuple(sorted(compiled.names)),
+                                 tuple(sorted(compiled.static_includes)), compiled.dynamic_includes))
+        cache_file = self._cache_file(compiled.name)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_bytes(_CACHE_MAGIC + content_hash + payload)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+
     def render_template(self, template_name, variables):
         """Renderizar un template con las variables especificadas"""
-        template_file = self.templates_path / template_name
-        
-        if not template_file.exists():
-            raise FileNotFoundError(f"Template no encontrado: {template_file}")
-        
-        # Leer template
-        template_content = template_file.read_text(encoding='utf-8')
-        
-        # Reemplazar variables {{VARIABLE}}
-        for var_name, var_value in variables.items():
-            placeholder = f"{{{{{var_name}}}}}"
-            template_content = template_content.replace(placeholder, str(var_value))
-        
-        return template_content
-    
+        compiled = self.get_template(template_name)
+        return compiled.render(self._make_scope(variables), self)
+
+    def iter_render(self, template_name, variables):
+        """Renderizar un template entregando chunks de texto"""
+        compiled = self.get_template(template_name)
+        return compiled.iter_render(self._make_scope(variables), self)
+
+    def render_to_file(self, template_name, variables, output_file, encoding='utf-8'):
+        """
+        Renderizar un template directo a un archivo, por chunks.
+
+        El contenido se hashea mientras se escribe a un archivo temporal; si el
+        hash coincide con el del archivo existente no se toca. Retorna True si
+        el archivo se escribió.
+        """
+        output_file = Path(output_file)
+        tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+        hasher = hashlib.sha256()
+        buffer = []
+        buffered = 0
+
+        try:
+            with open(tmp_file, 'w', encoding=encoding) as writer:
+                for chunk in self.iter_render(template_name, variables):
+                    buffer.append(chunk)
+                    buffered += len(chunk)
+                    if buffered >= _CHUNK_SIZE:
+                        self._flush_chunks(buffer, writer, hasher, encoding)
+                        buffered = 0
+                self._flush_chunks(buffer, writer, hasher, encoding)
+
+            if output_file.exists() and self._file_digest(output_file, encoding) == hasher.digest():
+                tmp_file.unlink()
+                return False
+
+            os.replace(tmp_file, output_file)
+            return True
+        except BaseException:
+            if tmp_file.exists():
+                tmp_file.unlink()
+            raise
+
+    def _flush_chunks(self, buffer, writer, hasher, encoding):
+        if buffer:
+            data = ''.join(buffer)
+            buffer.clear()
+            writer.write(data)
+            hasher.update(data.encode(encoding))
+
+    def _file_digest(self, file_path, encoding):
+        """Hash incremental del contenido (texto) de un archivo existente"""
+        hasher = hashlib.sha256()
+        try:
+            with open(file_path, 'r', encoding=encoding) as reader:
+                for data in iter(lambda: reader.read(_CHUNK_SIZE), ''):
+                    hasher.update(data.encode(encoding))
+        except (OSError, UnicodeDecodeError):
+            return None
+        return hasher.digest()
+
+    def render_partial(self, template_name, variables):
+        """Renderizar un partial, reutilizando el resultado si las entradas son idénticas"""
+        compiled = self.get_template(template_name)
+        scope = variables if isinstance(variables, ChainMap) else self._make_scope(variables)
+
+        key = self._partial_key(compiled, scope)
+        if key is None:
+            return compiled.render(scope, self)
+
+        cached = self._partial_cache.get(key)
+        if cached is None:
+            cached = compiled.render(scope, self)
+            self._partial_cache[key] = cached
+        return cached
+
+    def clear_cache(self, disk=False):
+        """Descartar templates compilados y partials cacheados (y opcionalmente el caché en disco)"""
+        self._compiled.clear()
+        self._partial_cache.clear()
+        if disk and self.cache_dir and self.cache_dir.exists():
+            for cache_file in self.cache_dir.glob(f"*{_CACHE_SUFFIX}"):
+                cache_file.unlink()
+
+    def _make_scope(self, variables):
+        return ChainMap(dict(variables or {}))
+
+    def _referenced_names(self, compiled, seen=None):
+        """Nombres raíz que usa un template, incluyendo sus partials estáticos"""
+        seen = seen if seen is not None else set()
+        if compiled.name in seen:
+            return set()
+        seen.add(compiled.name)
+        names = set(compiled.names)
+        for include in compiled.static_includes:
+            names |= self._referenced_names(self.get_template(include), seen)
+        return names
+
+    def _partial_key(self, compiled, scope):
+        """Clave de caché: template + valores de las variables que realmente usa"""
+        if compiled.dynamic_includes:
+            return None
+        try:
+            names = sorted(self._referenced_names(compiled))
+            return (compiled.name,) + tuple(_freeze(scope.get(name, _MISSING)) for name in names)
+        except TypeError:
+            return None
+
     def prepare_entity_variables(self, entity_name, module):
         """Preparar variables estándar para entidades"""
         # Convertir módulo a ruta de API (Inventario.Core -> inventario/core)
         module_route = module.replace('.', '/').lower()
-        
+
         # Generar plural de la entidad
         entity_plural = f"{entity_name}s" if not entity_name.endswith('s') else entity_name
-        
+
         return {
             'ENTITY_NAME': entity_name,
             'ENTITY_NAME_LOWER': entity_name.lower(),
@@ -52,4 +550,4 @@ class TemplateEngine:
             'MODULE_WITH_ENTITY': f"{module}.{entity_plural}",  # Solo la parte del módulo con entidad
             'NAMESPACE': f"Backend.Modules.{module}.{entity_plural}",  # Para compatibilidad
             'MODEL_NAMESPACE': "Shared.Models.Entities"  # Namespace por defecto del modelo
-        }
\ No newline at end of file
+        }
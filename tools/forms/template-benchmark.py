@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Template Benchmark - Latencia de arranque del motor de templates
+Mide, en procesos nuevos, el tiempo hasta el primer render de todos los
+templates de tools/forms/templates con y sin el caché compilado en disco.
+
+Usage:
+    python tools/forms/template-benchmark.py
+    python tools/forms/template-benchmark.py --runs 20
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Configurar encoding UTF-8 para Windows
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer)
+
+FORMS_PATH = Path(__file__).resolve().parent
+TEMPLATES_PATH = FORMS_PATH / "templates"
+
+# Código que corre en cada proceso nuevo: importar motor + primer render de todo
+CHILD_CODE = r'''
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from pathlib import Path
+from shared.template_engine import TemplateEngine
+templates = Path(sys.argv[2])
+engine = TemplateEngine(templates, cache_dir=sys.argv[3] if sys.argv[3] != '-' else False)
+variables = engine.prepare_entity_variables('Producto', 'Inventario.Core')
+for template_file in sorted(templates.rglob('*.template')):
+    engine.render_template(template_file.relative_to(templates).as_posix(), variables)
+print(f"{(time.perf_counter() - start) * 1000:.3f}")
+'''
+
+
+def run_child(cache_dir):
+    """Lanzar un proceso nuevo y devolver la latencia de primer render en ms"""
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_CODE, str(FORMS_PATH), str(TEMPLATES_PATH), cache_dir or '-'],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure(runs, cache_dir):
+    return [run_child(cache_dir) for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de arranque del motor de templates')
+    parser.add_argument('--runs', type=int, default=10, help='Procesos a lanzar por escenario (default: 10)')
+    args = parser.parse_args()
+
+    template_count = len(list(TEMPLATES_PATH.rglob('*.template')))
+    print(f"⏱️ Primer render de {template_count} templates, {args.runs} procesos por escenario")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        without_cache = measure(args.runs, None)
+        run_child(cache_dir)  # Poblar el caché
+        with_cache = measure(args.runs, cache_dir)
+
+    for label, samples in (("Sin caché", without_cache), ("Con caché", with_cache)):
+        print(f"   {label}: mediana {statistics.median(samples):.2f} ms "
+              f"(min {min(samples):.2f} / max {max(samples):.2f})")
+
+    speedup = statistics.median(without_cache) / statistics.median(with_cache)
+    print(f"🚀 Aceleración con caché: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
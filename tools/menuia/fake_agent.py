@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+🧪 Fake Agent
+Cliente local con la misma interfaz que ClaudeSDKClient para probar el
+procesamiento por módulos sin red ni IA.
+
+Cada query espera 'latency' segundos (simula la sesión del agente) y luego
+ejecuta el callback on_query(prompt) si se pasó uno, por ejemplo para generar
+el módulo con el emisor local. Sirve para medir el throughput del scheduler:
+
+    python tools/menuia/generate_menu_batch.py entities-urls.json --ai --fake-agent 2 --concurrency 8
+"""
+
+import asyncio
+
+
+class FakeTextBlock:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeMessage:
+    def __init__(self, text):
+        self.content = [FakeTextBlock(text)]
+
+
+class FakeAgentClient:
+    """Reemplazo offline de ClaudeSDKClient (async with, query, receive_response)"""
+
+    def __init__(self, options=None, latency=0.5, on_query=None):
+        self.options = options
+        self.latency = latency
+        self.on_query = on_query
+        self.prompts = []
+        self._pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    async def query(self, prompt):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.latency)
+        if self.on_query:
+            self.on_query(prompt)
+        self._pending.append(FakeMessage("Listo: cambios aplicados (fake agent)."))
+
+    async def receive_response(self):
+        while self._pending:
+            yield self._pending.pop(0)
+
@@ -3,7 +3,14 @@ import sys
 import os
 import re
 from pathlib import Path
-from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
+
+try:
+    from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
+    CLAUDE_SDK_AVAILABLE = True
+except ImportError:
+    # Solo las rutas con IA lo necesitan; el emisor local funciona sin SDK
+    ClaudeSDKClient = ClaudeCodeOptions = None
+    CLAUDE_SDK_AVAILABLE = False
 
 # Configurar encoding para Windows
 if sys.platform == "win32":
@@ -120,11 +127,11 @@ public static class {modulo_capitalized}MenuConfig
     }}
 }}"""
 
-def generate_menu_item(modulo, submodulo_path, entidad):
-    """Genera el MenuItem listo para insertar"""
-    entidad_capitalized = entidad.capitalize()
+def generate_menu_item(modulo, submodulo_path, entidad, icon=None, text=None):
+    """Genera el MenuItem listo para insertar (icono y texto opcionales)"""
+    entidad_capitalized = text or entidad.capitalize()
     entidad_upper = entidad.upper()
-    icon = get_icon_for_entity(entidad)
+    icon = icon or get_icon_for_entity(entidad)
     
     # Generar path jerárquico
     if submodulo_path:
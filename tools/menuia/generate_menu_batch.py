@@ -3,8 +3,9 @@ import sys
 import os
 import re
 import json
+import time
+import argparse
 from pathlib import Path
-from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
 
 # Configurar encoding para Windows
 if sys.platform == "win32":
@@ -16,8 +17,15 @@ if sys.platform == "win32":
 from generate_menu import (
     parse_input, get_config_path, get_config_filename, 
     generate_config_content, generate_menu_item, 
-    get_icon_for_entity, check_module_in_unificado
+    get_icon_for_entity, check_module_in_unificado,
+    ClaudeSDKClient, ClaudeCodeOptions, CLAUDE_SDK_AVAILABLE
 )
+from menu_emitter import emit_menus, register_modules_locally
+from menu_sync import sync_menus
+from menu_cache import DecisionCache, DEFAULT_TTL, extract_menu_items
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 300
 
 async def auto_confirm(client):
     """Auto-confirma permisos"""
@@ -67,6 +75,7 @@ def parse_json_file(json_path):
                 'submodulo': submodulo,
                 'entidad': entidad.lower(),
                 'entidad_original': entidad,
+                'modulo_original': modulo_json,
                 'permiso': f"{entidad.upper()}.VIEWMENU"
             })
             
@@ -99,7 +108,7 @@ def group_entities_by_module(entities):
     
     return modules
 
-async def process_module_batch(modulo, module_data):
+async def process_module_batch(modulo, module_data, client_factory=None, cache=None):
     """Procesa todas las entidades de un módulo de una vez"""
     config_path = module_data['config_path']
     entities = module_data['entities']
@@ -128,12 +137,18 @@ async def process_module_batch(modulo, module_data):
     
     # 3. Agregar todas las entidades usando IA inteligente
     if entity_data:
-        await add_multiple_menu_items(config_path, entity_data)
+        await add_multiple_menu_items(config_path, entity_data, client_factory, cache, modulo)
     
     return module_data
 
-async def add_multiple_menu_items(config_path, menu_items):
-    """Agrega múltiples MenuItems usando IA inteligente con contexto completo"""
+async def add_multiple_menu_items(config_path, menu_items, client_factory=None, cache=None, modulo=None):
+    """
+    Agrega múltiples MenuItems usando IA inteligente con contexto completo.
+    client_factory reemplaza a ClaudeSDKClient (ej: FakeAgentClient para pruebas offline).
+    Con cache (DecisionCache) una repetición con el mismo contexto, módulo y
+    entidades aplica la estructura guardada sin contactar al agente.
+    """
+    client_factory = client_factory or ClaudeSDKClient
     
     # Preparar contexto completo para la IA
     entities_context = []
@@ -154,12 +169,20 @@ async def add_multiple_menu_items(config_path, menu_items):
         with open(context_path, 'r', encoding='utf-8') as f:
             context = f.read()
     
-    async with ClaudeSDKClient(
-        options=ClaudeCodeOptions(
-            max_turns=5,
-            allowed_tools=["Read", "Edit", "MultiEdit"]
-        )
-    ) as client:
+    modulo = modulo or config_path.stem.replace('MenuConfig', '').lower()
+    # La IA edita el MenuItems actual: replay solo vale mientras el archivo no cambie
+    source_items = extract_menu_items(config_path.read_text(encoding='utf-8')) if cache else None
+    cache_key = cache.key(context, modulo, entities_context) if cache else None
+    if cache and cache.replay(cache_key, config_path):
+        print(f"   💾 {config_path.name}: estructura aplicada desde caché (sin IA)")
+        return
+    
+    options = ClaudeCodeOptions(
+        max_turns=5,
+        allowed_tools=["Read", "Edit", "MultiEdit"]
+    ) if ClaudeCodeOptions else None
+    
+    async with client_factory(options=options) as client:
         
         # Agrupar entidades por submódulo para jerarquía
         submodule_groups = {}
@@ -252,6 +275,9 @@ MenuItems = new List<MenuItem>
         
         await client.query(prompt)
         await auto_confirm(client)
+    
+    if cache and cache.store(cache_key, modulo, entities_context, config_path, source_items):
+        print(f"   💾 {config_path.name}: decisión guardada en caché")
 
 async def register_modules_in_unificado(modules_to_register):
     """Registra múltiples módulos nuevos en MenuUnificado.razor"""
@@ -288,26 +314,153 @@ Mantén el formato y estructura existente del archivo. Los nuevos módulos deben
         await client.query(prompt)
         await auto_confirm(client)
 
-async def main():
+async def suggest_icons_with_ai(entities):
+    """
+    Una sola consulta a la IA para sugerir iconos Material de todas las entidades.
+    Retorna {entidad_en_minúsculas: icono}; vacío si la IA no está disponible o falla.
+    """
+    if not CLAUDE_SDK_AVAILABLE:
+        print("⚠️  claude_code_sdk no está instalado, se usan los iconos locales")
+        return {}
+
+    entity_lines = "\n".join(
+        f"- {entity['entidad']} ({entity['input']})" for entity in entities
+    )
+    prompt = f"""
+Sugiere un icono de Material Icons para cada entidad del menú.
+
+Entidades:
+{entity_lines}
+
+Responde SOLO con un objeto JSON {{"entidad": "icono"}} usando los nombres de entidad tal cual, sin texto adicional.
+"""
+
+    response = []
+    try:
+        async with ClaudeSDKClient(
+            options=ClaudeCodeOptions(max_turns=1, allowed_tools=[])
+        ) as client:
+            await client.query(prompt)
+            async for message in client.receive_response():
+                for block in getattr(message, 'content', None) or []:
+                    if hasattr(block, 'text'):
+                        response.append(block.text)
+    except Exception as e:
+        print(f"⚠️  Error consultando iconos a la IA: {e}")
+        return {}
+
+    text = "".join(response)
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    try:
+        icons = json.loads(match.group(0)) if match else {}
+    except json.JSONDecodeError:
+        icons = {}
+
+    valid = {
+        str(entidad).lower(): icon for entidad, icon in icons.items()
+        if isinstance(icon, str) and re.fullmatch(r'[a-z0-9_]+', icon)
+    }
+    if not valid:
+        print("⚠️  La IA no devolvió iconos válidos, se usan los iconos locales")
+    return valid
+
+async def run_module_jobs(jobs, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    Ejecuta {nombre: función async sin argumentos} con a lo sumo 'concurrency'
+    trabajos simultáneos y 'timeout' segundos por trabajo.
+    Retorna {nombre: (estado, resultado|error)} en el orden de entrada,
+    con estado 'ok', 'timeout' o 'error'. Un trabajo fallido no detiene al resto.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(name, job):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(job(), timeout)
+                status = ('ok', result)
+            except asyncio.TimeoutError:
+                status = ('timeout', f"sin respuesta en {timeout}s")
+            except Exception as e:
+                status = ('error', e)
+            print(f"   {'✅' if status[0] == 'ok' else '❌'} {name}: {status[0]} ({time.perf_counter() - start:.2f}s)")
+            return status
+
+    names = list(jobs)
+    results = await asyncio.gather(*(run(name, jobs[name]) for name in names))
+    return dict(zip(names, results))
+
+def make_fake_client_factory(latency):
+    """Fábrica de FakeAgentClient que genera cada módulo con el emisor local tras la latencia simulada"""
+    from fake_agent import FakeAgentClient
+
+    def factory(module_entities):
+        def client(options=None):
+            return FakeAgentClient(
+                options, latency=latency,
+                on_query=lambda prompt: emit_menus(module_entities, register=False)
+            )
+        return client
+    return factory
+
+async def run_ai_batch(modules, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, fake_latency=None,
+                       cache=None):
+    """
+    Ruta con IA: una sesión por módulo, con hasta 'concurrency' módulos en paralelo
+    (cada uno escribe su propio *MenuConfig.cs). El registro en MenuUnificado.razor
+    se acumula y se aplica una sola vez al final.
+    """
+    fake_factory = make_fake_client_factory(fake_latency) if fake_latency is not None else None
+
+    def module_job(modulo, module_data):
+        client_factory = fake_factory(module_data['entities']) if fake_factory else None
+        return lambda: process_module_batch(modulo, module_data, client_factory, cache)
+
+    jobs = {modulo: module_job(modulo, module_data) for modulo, module_data in modules.items()}
+
+    print(f"\n⚙️  Ejecutando {len(jobs)} módulos (concurrencia {concurrency}, timeout {timeout}s)")
+    start = time.perf_counter()
+    results = await run_module_jobs(jobs, concurrency, timeout)
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        print(f"   📈 {len(jobs)} módulos en {elapsed:.2f}s ({len(jobs) / elapsed:.2f} módulos/s)")
+
+    if cache and (cache.hits or cache.misses):
+        print(f"   💾 Caché de decisiones: {cache.hits} aciertos, {cache.misses} consultas a la IA")
+
+    # Registrar todos los módulos creados, aunque su edición con IA haya fallado
+    modules_to_register = [modulo for modulo, module_data in modules.items()
+                           if module_data['needs_registration']]
+
+    # El registro en MenuUnificado es determinista también en esta ruta
+    if modules_to_register:
+        print(f"\n🔗 Registrando {len(modules_to_register)} módulos nuevos en MenuUnificado.razor...")
+        if register_modules_locally(modules_to_register) is not None:
+            print("✅ Módulos registrados en MenuUnificado.razor")
+
+    statuses = {modulo: ('updated' if status == 'ok' else 'error')
+                for modulo, (status, _) in results.items()}
+    return statuses, modules_to_register
+
+async def main(args):
     print("🚀 GenerateMenu BATCH - Procesador masivo de menús desde JSON")
     print("=" * 60)
     
-    # Verificar argumentos
-    if len(sys.argv) != 2:
-        print("❌ Error: Se requiere la ruta del archivo JSON")
-        print("\nUso: python generate_menu_batch.py <ruta_entities_urls.json>")
-        print("\nEjemplo:")
-        print("  python generate_menu_batch.py ./entities-urls.json")
-        print("  python generate_menu_batch.py ../datos/entities-urls.json")
-        return
-    
-    json_file = sys.argv[1]
+    json_file = args.json_file
     
     # Verificar que existe el archivo
     if not os.path.exists(json_file):
         print(f"❌ Error: El archivo '{json_file}' no existe")
         return
     
+    if args.ai and args.sync:
+        print("❌ Error: --sync y --ai no se pueden combinar")
+        return
+    
+    if args.ai and not CLAUDE_SDK_AVAILABLE and args.fake_agent is None:
+        print("❌ Error: --ai requiere claude_code_sdk instalado")
+        return
+    
     print(f"📄 Leyendo archivo JSON: {json_file}")
     
     # 1. Leer y parsear entidades desde JSON
@@ -320,18 +473,10 @@ async def main():
     print(f"✅ Se encontraron {len(entities)} entidades válidas")
     
     # Mostrar resumen
-    print("\n📋 Resumen de entidades:")
-    for entity in entities:
-        path_parts = [entity['modulo']]
-        if entity['submodulo']:
-            path_parts.append(entity['submodulo'])
-        path_parts.extend([entity['entidad'], 'list'])
-        path = '/' + '/'.join(path_parts)
-        
-        print(f"  🔹 {entity['entidad'].capitalize()} → {path} (IA elegirá icono)")
-    
-    # Confirmar procesamiento (auto-confirmar en modo batch)
-    print(f"\n✅ Procesando {len(entities)} entidades desde JSON automáticamente...")
+    if args.verbose:
+        print("\n📋 Resumen de entidades:")
+        for entity in entities:
+            print(f"  🔹 {entity['entidad_original']} → /{entity['input']}/list")
     
     # 2. Agrupar por módulos
     modules = group_entities_by_module(entities)
@@ -341,34 +486,56 @@ async def main():
         status = "nuevo" if not data['config_path'].exists() else "existente"
         print(f"  📁 {modulo.capitalize()} ({status}) - {len(data['entities'])} entidades")
     
-    # 3. Procesar cada módulo
-    modules_to_register = []
+    # 3. Generar menús
+    start = time.perf_counter()
     
-    for modulo, module_data in modules.items():
-        result = await process_module_batch(modulo, module_data)
+    if args.ai:
+        agent = f"agente simulado ({args.fake_agent}s)" if args.fake_agent is not None else "una sesión por módulo"
+        print(f"\n🤖 Modo IA: {agent}")
+        cache = None if args.no_cache else DecisionCache(args.cache_dir, args.cache_ttl)
+        statuses, modules_registered = await run_ai_batch(
+            modules, args.concurrency, args.timeout, args.fake_agent, cache
+        )
+    else:
+        icons = {}
+        if args.ai_icons:
+            print("\n🤖 Consultando iconos sugeridos a la IA (una sola consulta)...")
+            icons = await suggest_icons_with_ai(entities)
+            print(f"   ✅ {len(icons)} iconos sugeridos")
         
-        if result['needs_registration']:
-            modules_to_register.append(modulo)
+        if args.sync:
+            print("\n🔄 Sincronizando con los *MenuConfig.cs existentes...")
+            result = sync_menus(entities, icons=icons, dry_run=args.dry_run, patch_dir=args.patch_dir)
+            for patch in result['patches'].values():
+                print(patch)
+            for modulo, (added, removed, moved) in result['changes'].items():
+                if added or removed or moved:
+                    print(f"   📁 {modulo}: +{added} -{removed} ~{moved}")
+        else:
+            print("\n🧩 Generando menús localmente...")
+            result = emit_menus(entities, icons=icons)
+        statuses = result['modules']
+        modules_registered = result['registered']
     
-    # 4. Registrar módulos nuevos en MenuUnificado
-    if modules_to_register:
-        print(f"\n🔗 Registrando {len(modules_to_register)} módulos nuevos en MenuUnificado.razor...")
-        await register_modules_in_unificado(modules_to_register)
-        print("✅ Módulos registrados en MenuUnificado.razor")
+    elapsed = time.perf_counter() - start
     
-    # 5. Resumen final
+    # 4. Resumen final
     print("\n" + "=" * 60)
     print("🎉 PROCESAMIENTO MASIVO COMPLETADO!")
-    print(f"✅ {len(entities)} entidades procesadas")
-    print(f"✅ {len(modules)} módulos actualizados")
-    if modules_to_register:
-        print(f"✅ {len(modules_to_register)} módulos nuevos registrados")
-    
-    print("\n📊 Módulos actualizados:")
+    print(f"✅ {len(entities)} entidades procesadas en {elapsed:.2f}s")
+    print(f"✅ {len(modules)} módulos procesados")
+    if modules_registered:
+        print(f"✅ {len(modules_registered)} módulos nuevos registrados en MenuUnificado.razor")
+    
+    status_icons = {'created': '🆕', 'updated': '✏️ ', 'unchanged': '⏭️ ', 'error': '❌'}
+    if args.dry_run:
+        print("🧪 Dry run: no se escribió ningún archivo")
+    print("\n📊 Módulos:")
     for modulo, module_data in modules.items():
+        status = statuses.get(modulo, 'error')
         config_file = module_data['config_path'].name
         entity_count = len(module_data['entities'])
-        print(f"  📁 {config_file} - {entity_count} entidades agregadas")
+        print(f"  {status_icons[status]} {config_file} - {entity_count} entidades ({status})")
     
     print("\n🔍 Revisa los archivos generados y prueba el menú en la aplicación!")
 
@@ -421,7 +588,21 @@ def show_help():
     print("=" * 60)
     print()
     print("Uso:")
-    print("  python generate_menu_batch.py <ruta_entities_urls.json>")
+    print("  python generate_menu_batch.py <ruta_entities_urls.json> [--ai-icons] [--ai] [-v]")
+    print()
+    print("Opciones:")
+    print("  --ai-icons   Pide a la IA los iconos en una sola consulta (el menú se genera local)")
+    print("  --ai         Ruta anterior: una sesión de IA por módulo")
+    print("  --sync       Solo toca los módulos con entidades nuevas, eliminadas o movidas")
+    print("  --dry-run    Con --sync, muestra los parches sin escribir")
+    print("  --patch-dir D  Con --sync, guarda un .patch por archivo en D")
+    print("  --concurrency N   Módulos en paralelo con --ai (default: 4)")
+    print("  --timeout S       Segundos máximos por módulo con --ai (default: 300)")
+    print("  --fake-agent [L]  Con --ai, agente local simulado con latencia L (mide throughput offline)")
+    print("  --no-cache        Con --ai, ignorar el caché de decisiones")
+    print("  --cache-ttl S     Vigencia de las decisiones en caché (default: 7 días)")
+    print("  --clear-cache [M] Invalidar el caché (todo o solo el módulo M)")
+    print("  -v           Lista cada entidad procesada")
     print()
     print("Ejemplos:")
     print("  python generate_menu_batch.py ./entities-urls.json")
@@ -443,25 +624,57 @@ def show_help():
     print("  ✅ Crea módulos automáticamente si no existen")
     print("  ✅ Registra módulos nuevos en MenuUnificado.razor")
     print("  ✅ Genera MenuItems con iconos inteligentes")
+    print("  ✅ Submódulos como MenuItems padre con SubItems, en orden alfabético")
     print()
     print("Ventajas del procesamiento desde JSON:")
-    print("  ⚡ Procesa todas las entidades del JSON")
-    print("  🎯 Agrupa por módulos para eficiencia")
-    print("  🔄 Una sola operación de IA por módulo")
+    print("  ⚡ Generación local sin IA: cientos de entidades en menos de un segundo")
+    print("  🎯 Resultado determinista: misma entrada, mismo archivo")
+    print("  💾 Solo reescribe los archivos que cambian")
     print("  📊 Permisos consistentes automáticamente")
 
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="GenerateMenu BATCH - Procesador masivo de menús desde JSON",
+        add_help=False
+    )
+    parser.add_argument('json_file', nargs='?', help='Ruta del archivo entities-urls.json')
+    parser.add_argument('--ai-icons', action='store_true',
+                        help='Pedir a la IA los iconos (una sola consulta); el menú se genera localmente')
+    parser.add_argument('--ai', action='store_true',
+                        help='Usar la ruta anterior: una sesión de IA por módulo')
+    parser.add_argument('--sync', action='store_true',
+                        help='Sincronización incremental: solo toca los módulos con cambios y muestra un parche por archivo')
+    parser.add_argument('--dry-run', action='store_true', help='Con --sync, mostrar los parches sin escribir')
+    parser.add_argument('--patch-dir', help='Con --sync, guardar un .patch por archivo en este directorio')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Módulos procesados en paralelo con --ai (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Segundos máximos por módulo con --ai (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--fake-agent', type=float, nargs='?', const=0.5, default=None, metavar='LATENCIA',
+                        help='Con --ai, usar un agente local simulado (sin red) con la latencia indicada')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Con --ai, no usar ni guardar decisiones en caché')
+    parser.add_argument('--cache-dir', help='Directorio del caché de decisiones (default: tools/menuia/.menu-cache)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help='Segundos de vigencia de una decisión en caché (0 = sin vencimiento)')
+    parser.add_argument('--clear-cache', nargs='?', const='', default=None, metavar='MODULO',
+                        help='Invalidar el caché de decisiones (todo o solo un módulo)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Listar cada entidad')
+    parser.add_argument('-h', '--help', action='store_true', help='Mostrar ayuda')
+    return parser
+
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    args = build_parser().parse_args()
+    if args.help or args.json_file == "help":
+        show_help()
+    elif args.clear_cache is not None:
+        removed = DecisionCache(args.cache_dir).invalidate(args.clear_cache or None)
+        print(f"🗑️  {removed} decisiones eliminadas del caché")
+        if args.json_file:
+            asyncio.run(main(args))
+    elif not args.json_file:
         print("❌ Error: Se requiere la ruta del archivo JSON")
-        print("Uso: python generate_menu_batch.py <ruta_entities_urls.json>")
+        print("Uso: python generate_menu_batch.py <ruta_entities_urls.json> [--ai-icons]")
         print("Para ayuda: python generate_menu_batch.py --help")
-    elif len(sys.argv) == 2:
-        if sys.argv[1] in ["-h", "--help", "help"]:
-            show_help()
-        else:
-            # Archivo JSON especificado, ejecutar
-            asyncio.run(main())
     else:
-        print("❌ Demasiados argumentos.")
-        print("Uso: python generate_menu_batch.py <ruta_entities_urls.json>")
-        print("Para ayuda: python generate_menu_batch.py --help")
\ No newline at end of file
+        asyncio.run(main(args))
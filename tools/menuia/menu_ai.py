@@ -2,7 +2,15 @@ import asyncio
 import sys
 import os
 from pathlib import Path
-from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
+
+try:
+    from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
+    CLAUDE_SDK_AVAILABLE = True
+except ImportError:
+    ClaudeSDKClient = ClaudeCodeOptions = None
+    CLAUDE_SDK_AVAILABLE = False
+
+from menu_cache import DecisionCache, extract_menu_items
 
 async def auto_confirm(client):
     """Auto-confirma permisos y retorna respuestas"""
@@ -44,16 +52,20 @@ def validate_inputs(path_archivo, nueva_entidad, permiso):
     return True
 
 async def main():
+    # --no-cache: siempre consultar a la IA
+    use_cache = "--no-cache" not in sys.argv
+    argv = [arg for arg in sys.argv if arg != "--no-cache"]
+    
     # Verificar argumentos
-    if len(sys.argv) != 4:
+    if len(argv) != 4:
         print("❌ Error: Número incorrecto de argumentos")
         print("Uso: python menu_ai.py <path_archivo> <nueva_entidad> <permiso>")
         print("Ejemplo: python menu_ai.py Frontend/Layout/Menu/Modules/PrincipalMenuConfig.cs Productos PRODUCTOS.*")
         return
     
-    path_archivo = sys.argv[1]
-    nueva_entidad = sys.argv[2]
-    permiso = sys.argv[3]
+    path_archivo = argv[1]
+    nueva_entidad = argv[2]
+    permiso = argv[3]
     
     # Validar inputs
     if not validate_inputs(path_archivo, nueva_entidad, permiso):
@@ -68,6 +80,23 @@ async def main():
     # Cargar contexto
     context = load_context()
     
+    # La decisión depende también del menú actual del archivo
+    cache = DecisionCache() if use_cache else None
+    if cache:
+        with open(path_archivo, 'r', encoding='utf-8') as f:
+            current_items = extract_menu_items(f.read())
+        modulo = Path(path_archivo).stem.replace('MenuConfig', '').lower()
+        entities = [{'entidad': nueva_entidad, 'permiso': permiso}]
+        cache_key = cache.key(context, modulo, entities, current_items or "")
+        if cache.replay(cache_key, path_archivo):
+            print("💾 Estructura aplicada desde caché (sin IA)")
+            print("   Usa --no-cache para consultar de nuevo a la IA")
+            return
+    
+    if not CLAUDE_SDK_AVAILABLE:
+        print("❌ Error: claude_code_sdk no está instalado")
+        return
+    
     async with ClaudeSDKClient(
         options=ClaudeCodeOptions(
             max_turns=3,
@@ -101,6 +130,9 @@ Sigue todas las reglas de decisión inteligente del contexto para elegir el icon
         await client.query(prompt)
         responses = await auto_confirm(client)
         
+        if cache and cache.store(cache_key, modulo, entities, path_archivo, current_items):
+            print("💾 Decisión guardada en caché")
+        
         print("\n" + "="*60)
         print("✅ MenuIA completado!")
         print("🔍 Revisa los cambios realizados en el archivo")
@@ -129,7 +161,7 @@ def show_help():
     print("🤖 MenuIA - Herramienta inteligente para agregar entidades al menú")
     print()
     print("Uso:")
-    print("  python menu_ai.py <path_archivo> <nueva_entidad> <permiso>")
+    print("  python menu_ai.py <path_archivo> <nueva_entidad> <permiso> [--no-cache]")
     print()
     print("Ejemplos:")
     print("  python menu_ai.py Frontend/Layout/Menu/Modules/PrincipalMenuConfig.cs Productos PRODUCTOS.*")
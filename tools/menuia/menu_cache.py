@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+💾 Menu Cache
+Caché local de las decisiones de la IA sobre la ubicación de los MenuItems
+
+La clave es un hash del context.md, del módulo y de la lista de entidades
+(más el menú actual del archivo cuando la edición depende de él, como en
+menu_ai.py). El valor es la estructura de MenuItems resultante: el bloque C#
+tal como quedó y su árbol (texto, icono, ruta, hijos) para inspección.
+
+En una repetición con la misma clave el bloque se aplica directamente al
+*MenuConfig.cs sin contactar al agente, solo si el bloque actual del archivo
+es el mismo sobre el que decidió la IA (o ya es el resultado): si se editó a
+mano desde entonces la entrada no se aplica y se consulta de nuevo. Las entradas vencen tras 'ttl'
+segundos y se pueden invalidar de forma explícita (todas o por módulo).
+
+Usage:
+    cache = DecisionCache()
+    key = cache.key(context, "rrhh", entities)
+    if not cache.replay(key, config_path):
+        ...                                  # llamar a la IA
+        cache.store(key, "rrhh", entities, config_path, source_items)
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from menu_emitter import _find_closing_brace, _MENU_ITEMS_PATTERN
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".menu-cache"
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def menu_items_span(content):
+    """(inicio, fin) del contenido de MenuItems = new List<MenuItem> { ... }; None si no existe"""
+    match = _MENU_ITEMS_PATTERN.search(content)
+    if not match:
+        return None
+    open_index = match.end() - 1
+    close_index = _find_closing_brace(content, open_index)
+    if close_index == -1:
+        return None
+    return open_index + 1, close_index
+
+
+def extract_menu_items(content):
+    span = menu_items_span(content)
+    return content[span[0]:span[1]] if span else None
+
+
+def _tree(node):
+    """MenuNode -> dict serializable"""
+    item = {'text': node.text, 'icon': node.icon}
+    if node.leaf:
+        modulo, submodulo_path, entidad = node.leaf
+        item['path'] = '/' + '/'.join(part for part in (modulo, submodulo_path, entidad, 'list') if part)
+    if node.children:
+        item['children'] = [_tree(child) for child in node.children.values()]
+    return item
+
+
+class DecisionCache:
+    """Decisiones de la IA en disco: un JSON por clave"""
+
+    def __init__(self, cache_dir=None, ttl=DEFAULT_TTL):
+        cache_dir = cache_dir or os.environ.get('MENUIA_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, context, modulo, entities, current_items=None):
+        """Hash de context.md + módulo + entidades (+ menú actual si la decisión depende de él)"""
+        payload = {
+            'version': CACHE_VERSION,
+            'context': _sha256(context or ""),
+            'module': modulo.lower(),
+            'entities': sorted(json.dumps(entity, sort_keys=True, ensure_ascii=False) for entity in entities),
+        }
+        if current_items is not None:
+            payload['current'] = _sha256(current_items.strip())
+        return _sha256(json.dumps(payload, sort_keys=True))
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Entrada vigente o None (las vencidas se eliminan)"""
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get('version') != CACHE_VERSION or self._expired(entry):
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _expired(self, entry):
+        return bool(self.ttl and self.ttl > 0 and time.time() - entry.get('created', 0) > self.ttl)
+
+    def put(self, key, modulo, entities, items, tree=None, source_items=None):
+        entry = {
+            'version': CACHE_VERSION,
+            'module': modulo.lower(),
+            'created': time.time(),
+            'entities': entities,
+            'items': items,
+            'tree': tree or [],
+            # Bloque MenuItems sobre el que decidió la IA: replay solo lo reemplaza a él
+            'source': _sha256(source_items.strip()) if source_items is not None else None,
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def replay(self, key, config_path):
+        """Aplicar la estructura en caché al archivo sin llamar a la IA; False si no hay entrada vigente"""
+        entry = self.get(key)
+        config_path = Path(config_path)
+        if entry is None or not config_path.exists():
+            self.misses += 1
+            return False
+
+        original = config_path.read_text(encoding='utf-8')
+        span = menu_items_span(original)
+        if span is None:
+            self.misses += 1
+            return False
+
+        # Solo sobre el bloque de origen (o si ya es el resultado): no pisar ediciones posteriores
+        current = original[span[0]:span[1]].strip()
+        if current != entry['items'].strip() and _sha256(current) != entry.get('source'):
+            self.misses += 1
+            return False
+
+        content = original[:span[0]] + entry['items'] + original[span[1]:]
+        if content != original:
+            config_path.write_text(content, encoding='utf-8')
+        self.hits += 1
+        return True
+
+    def store(self, key, modulo, entities, config_path, source_items=None):
+        """
+        Guardar el bloque MenuItems que dejó la IA en el archivo; False si no se pudo leer.
+        source_items: bloque MenuItems antes de la IA (replay solo reemplaza ese bloque).
+        """
+        from menu_sync import parse_menu_config
+
+        content = Path(config_path).read_text(encoding='utf-8')
+        items = extract_menu_items(content)
+        if items is None or not items.strip():
+            return False
+        root = parse_menu_config(content, modulo)
+        tree = [_tree(child) for child in root.children.values()] if root else []
+        self.put(key, modulo, entities, items, tree, source_items)
+        return True
+
+    def invalidate(self, modulo=None):
+        """Eliminar todas las entradas o solo las de un módulo; retorna cuántas se eliminaron"""
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            if modulo:
+                try:
+                    entry_module = json.loads(path.read_text(encoding='utf-8')).get('module')
+                except (OSError, json.JSONDecodeError):
+                    entry_module = None
+                if entry_module != modulo.lower():
+                    continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
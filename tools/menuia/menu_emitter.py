@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+🧩 Menu Emitter
+Generación local y determinista de *MenuConfig.cs y del registro en MenuUnificado.razor
+
+Construye el árbol MenuItem/SubItems de cada módulo a partir de las entidades
+(formato modulo/sub1/.../entidad) y escribe cada archivo en una sola pasada:
+    - Submódulos -> MenuItems padre (Path vacío, sin permisos) con SubItems
+    - Entidades  -> MenuItems hoja generados con generate_menu_item
+    - Orden alfabético por Text en cada nivel
+
+Es aditivo: en un *MenuConfig.cs existente solo se insertan las entidades que
+aún no tiene, y los MenuItems que ya estaban (incluidas las ediciones a mano de
+texto, iconos o permisos) se conservan tal cual. Para quitar o mover entradas
+está menu_sync (--sync).
+
+Misma entrada produce siempre la misma salida, y un archivo solo se escribe si
+su contenido cambia. No usa IA: los iconos salen de get_icon_for_entity salvo
+que se pase un mapa de iconos (ej: sugerido por IA con --ai-icons).
+
+Usage:
+    from menu_emitter import emit_menus
+
+    result = emit_menus(entities)   # entities de parse_json_file
+"""
+
+import re
+from pathlib import Path
+
+from generate_menu import (
+    parse_input, get_config_path, generate_config_content,
+    generate_menu_item, get_icon_for_entity, ICON_MAPPING
+)
+
+UNIFICADO_PATH = Path("Frontend/Layout/Menu/MenuUnificado.razor")
+MODULES_USING = "@using Frontend.Layout.Menu.Modules"
+ITEM_INDENT = "    "
+
+_MENU_ITEMS_PATTERN = re.compile(r'MenuItems\s*=\s*new\s+List<MenuItem>\s*(?:\(\s*\))?\s*\{')
+_SUBITEMS_PATTERN = re.compile(r'SubItems\s*=\s*new\s+List<MenuItem>\s*(?:\(\s*\))?\s*\{')
+_MODULES_ASSIGN_PATTERN = re.compile(r'^([ \t]*)allModules\s*=\s*modulesToAdd\s*;', re.MULTILINE)
+
+
+def humanize(name):
+    """'EstadoHorasExtras' -> 'Estado Horas Extras', 'asistencia_tiempo' -> 'Asistencia Tiempo'"""
+    if any(char.isupper() for char in name[1:]):
+        spaced = re.sub(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])', ' ', name)
+        return spaced.replace('_', ' ').strip()
+    return name.replace('_', ' ').title()
+
+
+def _find_closing_brace(text, open_index):
+    """Índice de la llave que cierra text[open_index] (ignora strings y comentarios)"""
+    depth = 0
+    i, length = open_index, len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            i += 1
+            while i < length and text[i] != '"':
+                i += 2 if text[i] == '\\' else 1
+        elif text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = length if newline == -1 else newline
+            continue
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def replace_list_body(content, open_index, render_items):
+    """
+    Reemplazar el contenido de la lista que abre en content[open_index] con
+    render_items(indentación de los elementos); None si la lista no cierra
+    """
+    close_index = _find_closing_brace(content, open_index)
+    if close_index == -1:
+        return None
+
+    line_start = content.rfind('\n', 0, close_index) + 1
+    closing_indent = content[line_start:close_index]
+    if closing_indent.strip():
+        closing_indent = ""
+
+    items = render_items(closing_indent + ITEM_INDENT)
+    body = f"\n{items}\n{closing_indent}" if items else f"\n{closing_indent}"
+    return content[:open_index + 1] + body + content[close_index:]
+
+
+def reindent(block, old_indent, indent):
+    """Mover un bloque de old_indent a indent conservando la indentación relativa de sus líneas"""
+    lines = block.split('\n')
+    moved = [indent + lines[0]]
+    for line in lines[1:]:
+        moved.append(indent + line[len(old_indent):] if line.startswith(old_indent) else line)
+    return '\n'.join(moved)
+
+
+class MenuNode:
+    """
+    Nodo del menú: submódulo (con hijos) o entidad (hoja).
+
+    Los nodos leídos de un *MenuConfig.cs existente (menu_sync) guardan su texto
+    original en 'raw' y conservan el orden del archivo; mientras no se marquen
+    'dirty' se vuelven a escribir tal cual. Un submódulo existente marcado 'dirty'
+    solo reescribe su lista SubItems: sus propiedades quedan como en el archivo.
+    """
+
+    __slots__ = ('text', 'icon', 'children', 'leaf', 'raw', 'raw_indent', 'dirty', 'ordered')
+
+    def __init__(self, text, icon, leaf=None, raw=None, raw_indent="", ordered=False):
+        self.text = text
+        self.icon = icon
+        self.children = {}      # clave de segmento -> MenuNode
+        self.leaf = leaf        # (modulo, submodulo_path, entidad) en hojas
+        self.raw = raw
+        self.raw_indent = raw_indent
+        self.dirty = raw is None
+        self.ordered = ordered  # True: hijos en el orden del archivo
+
+    @staticmethod
+    def _sort_key(node):
+        return (node.text.lower(), node.text)
+
+    def sorted_children(self):
+        if self.ordered:
+            return list(self.children.values())
+        return sorted(self.children.values(), key=self._sort_key)
+
+    def insert_child(self, key, node):
+        """Agregar un hijo; en nodos con orden del archivo se inserta en su posición alfabética"""
+        if not self.ordered or key in self.children:
+            self.children[key] = node
+            return
+        items = list(self.children.items())
+        position = next((index for index, (_, child) in enumerate(items)
+                         if self._sort_key(child) > self._sort_key(node)), len(items))
+        items.insert(position, (key, node))
+        self.children = dict(items)
+
+    def render_children(self, indent):
+        return ",\n".join(child.render(indent) for child in self.sorted_children())
+
+    def render(self, indent=""):
+        """C# del nodo con la indentación indicada (sin coma final)"""
+        if self.raw is not None and not self.dirty:
+            return reindent(self.raw, self.raw_indent, indent)
+
+        if self.raw is not None and not self.leaf:
+            sub_match = _SUBITEMS_PATTERN.search(self.raw)
+            raw = replace_list_body(self.raw, sub_match.end() - 1, self.render_children) if sub_match else None
+            if raw is not None:
+                return reindent(raw, self.raw_indent, indent)
+
+        if self.leaf:
+            modulo, submodulo_path, entidad = self.leaf
+            block = generate_menu_item(modulo, submodulo_path, entidad, icon=self.icon, text=self.text)
+            return '\n'.join(indent + line for line in block.split('\n'))
+
+        sub_items = self.render_children(indent + ITEM_INDENT * 2)
+        return (
+            f"{indent}new MenuItem\n"
+            f"{indent}{{\n"
+            f"{indent}{ITEM_INDENT}Text = \"{self.text}\",\n"
+            f"{indent}{ITEM_INDENT}Icon = \"{self.icon}\",\n"
+            f"{indent}{ITEM_INDENT}Path = \"\",\n"
+            f"{indent}{ITEM_INDENT}Permissions = new List<string>(),\n"
+            f"{indent}{ITEM_INDENT}SubItems = new List<MenuItem>\n"
+            f"{indent}{ITEM_INDENT}{{\n"
+            f"{sub_items}\n"
+            f"{indent}{ITEM_INDENT}}}\n"
+            f"{indent}}}"
+        )
+
+
+def add_entity(root, entity, icons=None):
+    """
+    Agregar una entidad ('input' modulo/sub1/.../entidad) al árbol de su módulo,
+    creando los submódulos que falten. Marca como modificados los nodos recorridos.
+    """
+    modulo, submodulo_path, entidad = parse_input(entity['input'])
+    original = entity.get('entidad_original', entidad)
+
+    # Los nombres originales del JSON (RRHH.AsistenciaYTiempo) dan mejores textos
+    segments = submodulo_path.split('/') if submodulo_path else []
+    original_segments = entity.get('modulo_original', '').split('.')[1:]
+    if [segment.lower() for segment in original_segments] != [segment.lower() for segment in segments]:
+        original_segments = segments
+
+    node = root
+    for segment, original_segment in zip(segments, original_segments):
+        key = segment.lower()
+        if key not in node.children:
+            node.insert_child(key, MenuNode(humanize(original_segment), ICON_MAPPING.get(key, 'folder')))
+        node = node.children[key]
+        node.dirty = True
+
+    icon = (icons or {}).get(entidad.lower()) or get_icon_for_entity(entidad)
+    node.insert_child(entidad.lower(), MenuNode(
+        humanize(original), icon, leaf=(modulo, submodulo_path, entidad)
+    ))
+
+
+def build_module_trees(entities, icons=None):
+    """
+    Árbol por módulo a partir de las entidades de parse_json_file
+    (o de dicts con 'input' en formato modulo/sub1/.../entidad).
+    icons: {entidad_en_minúsculas: icono} opcional que tiene prioridad sobre ICON_MAPPING.
+    """
+    modules = {}
+
+    for entity in entities:
+        modulo = parse_input(entity['input'])[0]
+        root = modules.setdefault(modulo, MenuNode(modulo.title(), 'folder'))
+        add_entity(root, entity, icons)
+
+    return modules
+
+
+def render_menu_items(root, indent):
+    """Contenido de MenuItems = new List<MenuItem> { ... } para un módulo"""
+    return root.render_children(indent)
+
+
+def render_module_config(modulo, root, existing=None):
+    """
+    Contenido completo del *MenuConfig.cs: reemplaza el bloque MenuItems del
+    archivo existente (o de la plantilla de generate_config_content) y conserva el resto.
+    """
+    content = existing if existing is not None else generate_config_content(modulo)
+    match = _MENU_ITEMS_PATTERN.search(content)
+    if not match:
+        return None
+    return replace_list_body(content, match.end() - 1, root.render_children)
+
+
+def _write_if_changed(path, content, original):
+    if content == original:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    return True
+
+
+def register_modules_locally(modulos, unificado_path=UNIFICADO_PATH):
+    """
+    Registra los módulos en MenuUnificado.razor (una lectura, una escritura):
+    agrega el using de Modules y modulesToAdd.Add(XMenuConfig.GetMenuModule())
+    antes de 'allModules = modulesToAdd;'. Devuelve la lista de módulos agregados o None si falla.
+    """
+    unificado_path = Path(unificado_path)
+    if not unificado_path.exists():
+        print(f"❌ No se encontró {unificado_path}")
+        return None
+
+    original = unificado_path.read_text(encoding='utf-8')
+    content = original
+
+    pending = [modulo for modulo in sorted(set(modulos))
+               if f"{modulo.capitalize()}MenuConfig.GetMenuModule()" not in content]
+    if not pending:
+        return []
+
+    anchor = _MODULES_ASSIGN_PATTERN.search(content)
+    if not anchor:
+        print(f"❌ No se encontró 'allModules = modulesToAdd;' en {unificado_path.name}")
+        return None
+
+    indent = anchor.group(1)
+    lines = ''.join(f"{indent}modulesToAdd.Add({modulo.capitalize()}MenuConfig.GetMenuModule());\n"
+                    for modulo in pending)
+    content = content[:anchor.start()] + lines + content[anchor.start():]
+
+    if MODULES_USING not in content:
+        usings = list(re.finditer(r'^@using[^\n]*\n', content, re.MULTILINE))
+        position = usings[-1].end() if usings else 0
+        content = content[:position] + MODULES_USING + "\n" + content[position:]
+
+    _write_if_changed(unificado_path, content, original)
+    return pending
+
+
+def merge_into_existing(modulo, original, module_entities, icons=None):
+    """
+    Árbol del *MenuConfig.cs existente con las entidades que le faltan insertadas;
+    None si el archivo no tiene bloque MenuItems. El segundo valor indica si se agregó algo.
+    """
+    from menu_sync import parse_menu_config, collect_leaves
+
+    root = parse_menu_config(original, modulo)
+    if root is None:
+        return None, False
+    existing = collect_leaves(root)
+    added = False
+    for entity in module_entities:
+        entidad = parse_input(entity['input'])[2].lower()
+        if entidad not in existing:
+            add_entity(root, entity, icons)
+            existing[entidad] = None
+            added = True
+    return root, added
+
+
+def emit_menus(entities, icons=None, register=True):
+    """
+    Genera todos los *MenuConfig.cs de las entidades en una pasada; en los que
+    ya existen solo agrega las entidades faltantes (ver merge_into_existing).
+    Retorna {'modules': {modulo: 'created'|'updated'|'unchanged'|'error'}, 'registered': [...]}.
+    """
+    grouped = {}
+    for entity in entities:
+        grouped.setdefault(parse_input(entity['input'])[0], []).append(entity)
+    statuses = {}
+
+    for modulo in sorted(grouped):
+        config_path = get_config_path(modulo)
+        original = config_path.read_text(encoding='utf-8') if config_path.exists() else None
+        if original is None:
+            content = render_module_config(modulo, build_module_trees(grouped[modulo], icons)[modulo])
+        else:
+            root, added = merge_into_existing(modulo, original, grouped[modulo], icons)
+            if root is not None and not added:
+                statuses[modulo] = 'unchanged'
+                continue
+            content = render_module_config(modulo, root, original) if root is not None else None
+
+        if content is None:
+            print(f"   ❌ {config_path.name}: no se encontró el bloque MenuItems")
+            statuses[modulo] = 'error'
+        elif original is None:
+            _write_if_changed(config_path, content, original)
+            statuses[modulo] = 'created'
+        else:
+            statuses[modulo] = 'updated' if _write_if_changed(config_path, content, original) else 'unchanged'
+
+    registered = []
+    if register:
+        ok_modules = [modulo for modulo, status in statuses.items() if status != 'error']
+        registered = register_modules_locally(ok_modules) or []
+
+    return {'modules': statuses, 'registered': registered}
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+🔄 Menu Sync
+Sincronización incremental de *MenuConfig.cs contra entities-urls.json
+
+Lee los Frontend/Layout/Menu/Modules/*MenuConfig.cs existentes como árbol de
+MenuItems, lo compara con las entidades del JSON y solo toca los módulos con
+cambios:
+    - Entidades nuevas            -> se insertan en su submódulo (orden alfabético)
+    - Entidades que ya no están   -> se eliminan (y los submódulos que queden vacíos)
+    - Entidades con otra ruta     -> se mueven a la ruta del JSON
+
+Los MenuItems sin cambios se reescriben tal cual (texto, icono y formato
+originales), así que cada archivo recibe un parche pequeño que se muestra en
+formato unified diff y opcionalmente se guarda en un directorio.
+
+Usage:
+    from menu_sync import sync_menus
+
+    result = sync_menus(entities, dry_run=True, patch_dir="patches")
+"""
+
+import re
+import difflib
+from pathlib import Path
+
+from generate_menu import parse_input, get_config_path
+from menu_emitter import (
+    MenuNode, add_entity, build_module_trees, render_module_config,
+    register_modules_locally, _find_closing_brace, _MENU_ITEMS_PATTERN, _SUBITEMS_PATTERN
+)
+
+_ITEM_PATTERN = re.compile(r'new\s+MenuItem\b\s*(?:\(\s*\))?\s*\{')
+_TEXT_PATTERN = re.compile(r'\bText\s*=\s*"((?:[^"\\]|\\.)*)"')
+_ICON_PATTERN = re.compile(r'\bIcon\s*=\s*"((?:[^"\\]|\\.)*)"')
+_PATH_PATTERN = re.compile(r'\bPath\s*=\s*"((?:[^"\\]|\\.)*)"')
+
+
+def path_to_leaf(path):
+    """'/rrhh/asistencia/turno/list' -> ('rrhh', 'asistencia', 'turno'); None si no es una ruta de entidad"""
+    segments = [segment for segment in path.strip().strip('/').split('/') if segment]
+    if segments and segments[-1].lower() == 'list':
+        segments = segments[:-1]
+    if len(segments) < 2:
+        return None
+    submodulo_path = '/'.join(segments[1:-1]) or None
+    return segments[0], submodulo_path, segments[-1]
+
+
+def _normalize(text):
+    return re.sub(r'[^0-9a-z]', '', text.lower())
+
+
+def _first_leaf(node):
+    if node.leaf:
+        return node
+    for child in node.children.values():
+        leaf = _first_leaf(child)
+        if leaf:
+            return leaf
+    return None
+
+
+def _node_key(node, depth):
+    """Clave del nodo en su padre: la entidad en hojas, el segmento de ruta en submódulos"""
+    if node.leaf:
+        return node.leaf[2].lower()
+    leaf = _first_leaf(node)
+    if leaf and leaf.leaf[1]:
+        segments = leaf.leaf[1].split('/')
+        if len(segments) > depth:
+            return segments[depth].lower()
+    return _normalize(node.text)
+
+
+def _parse_items(content, start, end, depth):
+    """MenuItems entre content[start:end] -> {clave: MenuNode} en el orden del archivo"""
+    children = {}
+    position = start
+    while True:
+        match = _ITEM_PATTERN.search(content, position, end)
+        if not match:
+            break
+        open_index = match.end() - 1
+        close_index = _find_closing_brace(content, open_index)
+        if close_index == -1 or close_index > end:
+            break
+
+        node = _parse_item(content, match.start(), open_index, close_index, depth)
+        key = _node_key(node, depth)
+        if key not in children:
+            children[key] = node
+        position = close_index + 1
+    return children
+
+
+def _parse_item(content, item_start, open_index, close_index, depth):
+    line_start = content.rfind('\n', 0, item_start) + 1
+    raw_indent = re.match(r'[ \t]*', content[line_start:item_start]).group(0)
+
+    # Propiedades propias: todo el objeto menos el bloque SubItems
+    own = content[open_index:close_index]
+    children = {}
+    sub_match = _SUBITEMS_PATTERN.search(content, open_index, close_index)
+    if sub_match:
+        sub_open = sub_match.end() - 1
+        sub_close = _find_closing_brace(content, sub_open)
+        if sub_close != -1:
+            children = _parse_items(content, sub_open + 1, sub_close, depth + 1)
+            own = content[open_index:sub_match.start()] + content[sub_close + 1:close_index]
+
+    text = _TEXT_PATTERN.search(own)
+    icon = _ICON_PATTERN.search(own)
+    path = _PATH_PATTERN.search(own)
+    leaf = path_to_leaf(path.group(1)) if path and path.group(1) and not children else None
+
+    node = MenuNode(
+        text.group(1) if text else "", icon.group(1) if icon else "folder",
+        leaf=leaf, raw=content[item_start:close_index + 1], raw_indent=raw_indent, ordered=True
+    )
+    node.children = children
+    return node
+
+
+def parse_menu_config(content, modulo):
+    """Árbol de un *MenuConfig.cs (raíz del módulo con sus MenuItems); None si no tiene bloque MenuItems"""
+    match = _MENU_ITEMS_PATTERN.search(content)
+    if not match:
+        return None
+    open_index = match.end() - 1
+    close_index = _find_closing_brace(content, open_index)
+    if close_index == -1:
+        return None
+
+    root = MenuNode(modulo.title(), 'folder', ordered=True)
+    root.children = _parse_items(content, open_index + 1, close_index, 0)
+    return root
+
+
+def collect_leaves(root):
+    """{entidad: (ruta, [(padre, clave), ...])} con la cadena de nodos desde la raíz"""
+    leaves = {}
+
+    def walk(node, chain):
+        for key, child in node.children.items():
+            if child.leaf:
+                modulo, submodulo_path, entidad = child.leaf
+                path = '/'.join(part for part in (modulo, submodulo_path, entidad) if part)
+                leaves.setdefault(entidad.lower(), (f"/{path}/list".lower(), chain + [(node, key)]))
+            else:
+                walk(child, chain + [(node, key)])
+
+    walk(root, [])
+    return leaves
+
+
+def remove_leaf(chain):
+    """Quitar la hoja y los submódulos que queden vacíos; marca los ancestros como modificados"""
+    for parent, _ in chain[1:]:
+        parent.dirty = True
+    parent, key = chain[-1]
+    del parent.children[key]
+    for parent, key in reversed(chain[:-1]):
+        child = parent.children.get(key)
+        if child is not None and not child.children and not child.leaf:
+            del parent.children[key]
+        else:
+            break
+
+
+def diff_module(root, module_entities):
+    """Comparar el árbol existente con las entidades del JSON -> (agregadas, eliminadas, movidas)"""
+    existing = collect_leaves(root)
+    desired = {}
+    for entity in module_entities:
+        entidad = parse_input(entity['input'])[2].lower()
+        desired.setdefault(entidad, (f"/{entity['input']}/list".lower(), entity))
+
+    added = [desired[key][1] for key in desired if key not in existing]
+    removed = [key for key in existing if key not in desired]
+    moved = [desired[key][1] for key in desired if key in existing and existing[key][0] != desired[key][0]]
+    return existing, added, removed, moved
+
+
+def unified_patch(path, original, content):
+    return ''.join(difflib.unified_diff(
+        original.splitlines(keepends=True), content.splitlines(keepends=True),
+        fromfile=f"a/{Path(path).as_posix()}", tofile=f"b/{Path(path).as_posix()}"
+    ))
+
+
+def sync_menus(entities, icons=None, dry_run=False, patch_dir=None, register=True):
+    """
+    Sincronizar los *MenuConfig.cs con las entidades del JSON tocando solo los módulos con cambios.
+    Retorna {'modules': {modulo: estado}, 'changes': {modulo: (agregadas, eliminadas, movidas)},
+             'patches': {ruta: parche}, 'registered': [...]}.
+    """
+    grouped = {}
+    for entity in entities:
+        grouped.setdefault(parse_input(entity['input'])[0], []).append(entity)
+
+    statuses, changes, patches = {}, {}, {}
+
+    for modulo in sorted(grouped):
+        module_entities = grouped[modulo]
+        config_path = get_config_path(modulo)
+        original = config_path.read_text(encoding='utf-8') if config_path.exists() else None
+
+        if original is None:
+            root = build_module_trees(module_entities, icons)[modulo]
+            content = render_module_config(modulo, root)
+            changes[modulo] = (len(module_entities), 0, 0)
+            status = 'created'
+        else:
+            root = parse_menu_config(original, modulo)
+            if root is None:
+                print(f"   ❌ {config_path.name}: no se encontró el bloque MenuItems")
+                statuses[modulo] = 'error'
+                continue
+
+            existing, added, removed, moved = diff_module(root, module_entities)
+            changes[modulo] = (len(added), len(removed), len(moved))
+            if not (added or removed or moved):
+                statuses[modulo] = 'unchanged'
+                continue
+
+            for key in removed:
+                remove_leaf(existing[key][1])
+            for entity in moved:
+                remove_leaf(existing[parse_input(entity['input'])[2].lower()][1])
+            for entity in added + moved:
+                add_entity(root, entity, icons)
+
+            content = render_module_config(modulo, root, original)
+            status = 'updated'
+
+        if content is None or content == original:
+            statuses[modulo] = 'error' if content is None else 'unchanged'
+            continue
+
+        patch = unified_patch(config_path, original or "", content)
+        patches[str(config_path)] = patch
+        statuses[modulo] = status
+
+        if patch_dir:
+            patch_path = Path(patch_dir) / f"{config_path.name}.patch"
+            patch_path.parent.mkdir(parents=True, exist_ok=True)
+            patch_path.write_text(patch, encoding='utf-8')
+
+        if not dry_run:
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            config_path.write_text(content, encoding='utf-8')
+
+    registered = []
+    if register and not dry_run:
+        ok_modules = [modulo for modulo, status in statuses.items() if status != 'error']
+        registered = register_modules_locally(ok_modules) or []
+
+    return {'modules': statuses, 'changes': changes, 'patches': patches, 'registered': registered}
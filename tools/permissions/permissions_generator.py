@@ -6,14 +6,15 @@ Genera permisos del sistema para una entidad en la base de datos
 """
 
 import sys
-import os
 import uuid
 import argparse
-import json
 from datetime import datetime
 from pathlib import Path
 import pyodbc
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / "db"))
+from connection_settings import load_connection_settings, read_connection_string
+
 # Configurar encoding UTF-8 para Windows
 if sys.platform == "win32":
     try:
@@ -89,79 +90,19 @@ class PermissionsGenerator:
         self.connection_string = connection_string
     
     def read_connection_string(self):
-        """Lee la connection string desde launchSettings.json - mismo método que table.py"""
-        launch_settings_path = self.project_path / "Properties" / "launchSettings.json"
-        
-        if not launch_settings_path.exists():
-            print(f"❌ ERROR: No se encontró launchSettings.json en {launch_settings_path}")
-            return None
-            
-        try:
-            with open(launch_settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                
-            # Buscar en los profiles la variable SQL
-            for profile_name, profile_data in settings.get("profiles", {}).items():
-                env_vars = profile_data.get("environmentVariables", {})
-                sql_connection = env_vars.get("SQL")
-                
-                if sql_connection:
-                    print(f"✅ Connection string encontrado en profile: {profile_name}")
-                    return sql_connection
-                    
-            print(f"❌ ERROR: No se encontró variable 'SQL' en environmentVariables")
-            return None
-            
-        except Exception as e:
-            print(f"❌ ERROR leyendo launchSettings.json: {e}")
-            return None
-
-    def convert_to_odbc_connection_string(self, ef_connection_string):
-        """Convierte una cadena de conexión de Entity Framework a formato ODBC"""
-        # Parsear la cadena EF
-        parts = {}
-        for part in ef_connection_string.split(';'):
-            if '=' in part and part.strip():
-                key, value = part.split('=', 1)
-                parts[key.strip().lower()] = value.strip()
-        
-        # Extraer componentes
-        server = parts.get('server', 'localhost')
-        database = parts.get('database', parts.get('initial catalog', 'master'))
-        user_id = parts.get('user id', parts.get('uid'))
-        password = parts.get('password', parts.get('pwd'))
-        trusted_connection = parts.get('trusted_connection', 'false').lower() == 'true'
-        
-        # Construir cadena ODBC
-        if user_id and password:
-            return f"Driver={{ODBC Driver 17 for SQL Server}};Server={server};Database={database};UID={user_id};PWD={password};"
-        elif trusted_connection:
-            return f"Driver={{ODBC Driver 17 for SQL Server}};Server={server};Database={database};Trusted_Connection=yes;"
-        else:
-            # Default a autenticación SQL con las credenciales encontradas
-            return f"Driver={{ODBC Driver 17 for SQL Server}};Server={server};Database={database};UID={user_id or 'sa'};PWD={password or ''};"
+        """Lee la connection string desde launchSettings.json - módulo compartido con table.py"""
+        return read_connection_string(self.project_path)
 
     def get_connection_string(self):
-        """Obtener cadena de conexión - mismo patrón que table.py"""
+        """Obtener cadena de conexión ODBC - misma conexión que table.py"""
         if self.connection_string:
             return self.connection_string
         
-        # Prioridad 1: Leer desde launchSettings.json (como table.py)
-        ef_connection_string = self.read_connection_string()
-        if ef_connection_string:
-            return self.convert_to_odbc_connection_string(ef_connection_string)
-            
-        # Prioridad 2: Variables de entorno (fallback)
-        print("⚠️ Usando configuración de variables de entorno como fallback")
-        db_server = os.getenv('DATABASE_SERVER', 'localhost')
-        db_name = os.getenv('DATABASE_NAME', 'NuevoProyectoDB')
-        db_user = os.getenv('DATABASE_USER')
-        db_password = os.getenv('DATABASE_PASSWORD')
-        
-        if db_user and db_password:
-            return f"Driver={{ODBC Driver 17 for SQL Server}};Server={db_server};Database={db_name};UID={db_user};PWD={db_password};"
-        else:
-            return f"Driver={{ODBC Driver 17 for SQL Server}};Server={db_server};Database={db_name};Trusted_Connection=yes;"
+        settings = load_connection_settings(self.project_path)
+        if not settings:
+            print("❌ ERROR: Sin connection string no se pueden gestionar permisos")
+            return None
+        return settings.odbc()
     
     def get_organization_id(self, cursor):
         """Retorna NULL para OrganizationId - los permisos son globales para todas las organizaciones"""
@@ -246,6 +187,8 @@ class PermissionsGenerator:
         try:
             # Conectar a la base de datos
             connection_string = self.get_connection_string()
+            if not connection_string:
+                return False
             print(f"🔌 Conectando a base de datos...")
             
             # Mostrar info de conexión (sin credenciales)  
@@ -471,6 +414,8 @@ VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, '1', ?, ?, ?)"""
         try:
             # Conectar a la base de datos
             connection_string = self.get_connection_string()
+            if not connection_string:
+                return False
             print(f"🔌 Conectando a base de datos...")
             
             # Mostrar info de conexión (sin credenciales)  